@@ -0,0 +1,506 @@
+"""
+Performans Ölçümleri (benchmark.py)
+-----------------------------------
+Bu modül, veri üretim hattının yoğun aşamaları için zaman ölçümlerini
+içerir. Ölçümler giriş dosyasından türetilen sentetik müşteri ve alışveriş
+tabloları üzerinde çalışır ve saniyede işlenen satır sayısını raporlar.
+CLI başlatma süresi (cli_startup) satır sayısından bağımsız olduğundan
+boyutlardan ayrı, başlatma başına saniye olarak ölçülür.
+
+Sonuçlar bir temel ölçüm (baseline) dosyasına kaydedilebilir; sonraki
+çalıştırmalarda bu dosyayla karşılaştırılır ve %10'dan fazla yavaşlayan
+ölçümler işaretlenir. Temel ölçüm aynı makinede alınmalıdır; dosya ölçümün
+alındığı makineyi (machine_info) de kaydeder ve farklı bir makinede
+karşılaştırma yapılırsa uyarı verilir.
+
+Kullanım:
+    python benchmark.py                          # tüm ölçümler (1k, 100k, 1M satır)
+    python benchmark.py --sizes 1000 100000      # belirli boyutlar
+    python benchmark.py --save-baseline          # sonuçları temel ölçüm olarak kaydet
+    python benchmark.py --only apply_covid_effect --sizes 100000
+    python benchmark.py --only cli_startup       # yalnızca CLI başlatma süresi
+    python benchmark.py --startup                # içe aktarma sürelerini (-X importtime) raporla
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from final_generate1 import Constants, CustomerStreams, DateTimeUtils
+from final_generate2 import ProductModel, SeasonModel, CustomerModel
+from final_generate3 import PurchaseGenerator, StatisticalUtils
+from final_generate4 import DerivedFeatures, HolidayAdjuster
+from customer_synthesizer import CustomerSynthesizer
+
+BASELINE_FILE = 'benchmark_baseline.json'
+STARTUP_CASE = 'cli_startup'
+STARTUP_COMMAND = [sys.executable, 'final_generate4.py', '--help']
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+REGRESSION_TOLERANCE = 0.10
+
+
+class SyntheticData:
+    """Ölçümler için sentetik veri üretimi."""
+    
+    @staticmethod
+    def make_purchases(num_rows: int, seed: int = Constants.RANDOM_SEED) -> pd.DataFrame:
+        """2022-2024 aralığında rastgele tarihli (int32 gün sırası) sentetik alışveriş tablosu oluşturur."""
+        rng = np.random.default_rng(seed)
+        start = np.datetime64('2022-01-01')
+        day_offsets = rng.integers(0, 3 * 365 + 1, size=num_rows)
+        return pd.DataFrame({
+            'Customer ID': rng.integers(1, max(num_rows // 25, 1) + 1, size=num_rows),
+            'Purchase Amount (USD)': np.round(rng.uniform(20, 100, size=num_rows), 2),
+            'Purchase Date': DateTimeUtils.ordinal_column(start + day_offsets),
+        })
+    
+    @staticmethod
+    def make_customers(num_customers: int, seed: int = Constants.RANDOM_SEED) -> pd.DataFrame:
+        """Giriş dosyasındaki müşterileri yeniden örnekleyerek benzersiz kimlikli müşteri tablosu oluşturur."""
+        return CustomerSynthesizer.sample(pd.read_csv(Constants.INPUT_FILE), num_customers, np.random.default_rng(seed))
+    
+    @staticmethod
+    def customers_for_rows(num_rows: int, seed: int = Constants.RANDOM_SEED) -> pd.DataFrame:
+        """Geçmiş alışveriş sayılarının toplamı yaklaşık num_rows olan müşteri tablosu oluşturur."""
+        customers = SyntheticData.make_customers(max(num_rows // 20, 1), seed)
+        cumulative = customers['Previous Purchases'].cumsum().to_numpy()
+        while cumulative[-1] < num_rows:
+            customers = SyntheticData.make_customers(len(customers) * 2, seed)
+            cumulative = customers['Previous Purchases'].cumsum().to_numpy()
+        return customers.iloc[:int(np.searchsorted(cumulative, num_rows)) + 1].reset_index(drop=True)
+    
+    @staticmethod
+    def make_generated_purchases(num_rows: int, seed: int = Constants.RANDOM_SEED) -> pd.DataFrame:
+        """Sütun bazlı üretim hattıyla yaklaşık num_rows satırlık gerçekçi alışveriş tablosu üretir."""
+        product_data = ProductModel.get_product_data()
+        customers = SyntheticData.customers_for_rows(num_rows, seed)
+        purchases = PurchaseGenerator.process_past_purchases_columnar(
+            customers, product_data, rng=np.random.default_rng(seed)
+        )
+        return purchases.iloc[:num_rows].reset_index(drop=True)
+
+
+class BenchmarkCase(NamedTuple):
+    """Bir ölçüm tanımı.
+    
+    setup(num_rows) ölçülecek fonksiyonu ve gerçekte işlenen satır sayısını
+    döndürür; hazırlık süresi ölçüme dahil edilmez. max_rows'tan büyük
+    boyutlar (satır bazlı yavaş yollar için) atlanır.
+    """
+    name: str
+    setup: Callable[[int], Tuple[Callable[[], object], int]]
+    max_rows: Optional[int] = None
+
+
+class Benchmark:
+    """Zaman ölçümü yardımcıları ve ölçüm takımı."""
+    
+    @staticmethod
+    def measure(func: Callable[[], object], num_rows: int, repeat: int = 3) -> Dict[str, float]:
+        """Fonksiyonu birkaç kez çalıştırır ve en iyi süreyi döndürür.
+        
+        Ölçülen fonksiyonlar kendi üreteçlerini aldığı için tekrarlar aynı
+        rastgele diziyi kullanır; fonksiyonun yazdırdığı ilerleme mesajları
+        gizlenir.
+        """
+        timings = []
+        for _ in range(repeat):
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+        best = min(timings)
+        return {'seconds': best, 'rows_per_second': num_rows / best if best > 0 else float('inf')}
+    
+    @staticmethod
+    def cases() -> List[BenchmarkCase]:
+        """Ölçülen tüm sıcak yolları tanımlar."""
+        product_data = ProductModel.get_product_data()
+        holidays = []
+        for year in Constants.YEAR_RANGE:
+            holidays.extend(HolidayAdjuster.convert_holidays_to_list(year))
+        purchase_cache: Dict[int, pd.DataFrame] = {}
+        
+        def generated(num_rows: int) -> pd.DataFrame:
+            if num_rows not in purchase_cache:
+                purchase_cache.clear()
+                purchase_cache[num_rows] = SyntheticData.make_generated_purchases(num_rows)
+            return purchase_cache[num_rows]
+        
+        def generate_dates(num_rows: int):
+            purchases_per_customer = 50
+            num_customers = max(num_rows // purchases_per_customer, 1)
+            
+            def run() -> None:
+                rng = np.random.default_rng(Constants.RANDOM_SEED)
+                for customer_id in range(num_customers):
+                    DateTimeUtils.generate_dates(
+                        '', purchases_per_customer, customer_id, product_data['seasons'],
+                        product_data['season_months'], product_data['holidays'],
+                        product_data['day_weight_calendar'], rng
+                    )
+            return run, num_customers * purchases_per_customer
+        
+        def generate_review_rating(num_rows: int):
+            purchases = generated(num_rows)
+            rows = list(zip(purchases['Category'], purchases['Item Purchased'], purchases['Purchase Amount (USD)']))
+            
+            def run() -> None:
+                rng = np.random.default_rng(Constants.RANDOM_SEED)
+                for category, item, amount in rows:
+                    StatisticalUtils.generate_review_rating(category, item, amount, rng)
+            return run, len(rows)
+        
+        def generate_review_ratings(num_rows: int):
+            purchases = generated(num_rows)
+            categories = purchases['Category'].to_numpy(dtype=object)
+            items = purchases['Item Purchased'].to_numpy(dtype=object)
+            amounts = purchases['Purchase Amount (USD)'].to_numpy()
+            return (lambda: StatisticalUtils.generate_review_ratings(
+                        categories, items, amounts, product_data, np.random.default_rng(Constants.RANDOM_SEED)),
+                    len(amounts))
+        
+        def generate_purchase_details(num_rows: int):
+            customers = SyntheticData.make_customers(min(num_rows, 10_000))
+            locations = PurchaseGenerator.assign_customer_locations(customers, product_data)
+            contexts = [
+                (season, gender, CustomerModel.get_age_group(age), locations[customer_id])
+                for season, gender, age, customer_id in zip(
+                    customers['Season'], customers['Gender'], customers['Age'], customers['Customer ID']
+                )
+            ]
+            contexts = (contexts * (num_rows // len(contexts) + 1))[:num_rows]
+            
+            def run() -> None:
+                rng = np.random.default_rng(Constants.RANDOM_SEED)
+                for season, gender, age_group, location in contexts:
+                    PurchaseGenerator.generate_purchase_details_for_season(
+                        season, product_data, gender, age_group, location, rng
+                    )
+            return run, num_rows
+        
+        def generate_purchase_amounts(num_rows: int):
+            seasons = generated(num_rows)['Season'].to_numpy(dtype=object)
+            return (lambda: PurchaseGenerator.generate_purchase_amounts(
+                        seasons, product_data, np.random.default_rng(Constants.RANDOM_SEED)),
+                    len(seasons))
+        
+        def process_past_purchases(num_rows: int):
+            customers = SyntheticData.customers_for_rows(num_rows)
+            return (lambda: PurchaseGenerator.process_past_purchases(
+                        customers, product_data, CustomerStreams(Constants.RANDOM_SEED)),
+                    int(customers['Previous Purchases'].sum()))
+        
+        def process_future_purchases(num_rows: int):
+            customers = SyntheticData.make_customers(num_rows)
+            return (lambda: PurchaseGenerator.process_future_purchases(
+                        customers, product_data, CustomerStreams(Constants.RANDOM_SEED)),
+                    num_rows)
+        
+        def process_past_purchases_columnar(num_rows: int):
+            customers = SyntheticData.customers_for_rows(num_rows)
+            return (lambda: PurchaseGenerator.process_past_purchases_columnar(
+                        customers, product_data, rng=np.random.default_rng(Constants.RANDOM_SEED)),
+                    int(customers['Previous Purchases'].sum()))
+        
+        def process_future_purchases_columnar(num_rows: int):
+            customers = SyntheticData.make_customers(num_rows)
+            return (lambda: PurchaseGenerator.process_future_purchases_columnar(
+                        customers, product_data, rng=np.random.default_rng(Constants.RANDOM_SEED)),
+                    num_rows)
+        
+        def adjust_last_purchase_dates(num_rows: int):
+            # Satır bazlı yol tarihleri metin olarak bekler
+            purchases = generated(num_rows)
+            purchases = purchases.assign(**{'Purchase Date': DateTimeUtils.format_ordinals(purchases['Purchase Date'])})
+            header = purchases.columns.tolist()
+            
+            def run() -> None:
+                PurchaseGenerator.adjust_last_purchase_dates(
+                    purchases.values.tolist(), header.index('Customer ID'), header.index('Purchase Date'),
+                    streams=CustomerStreams(Constants.RANDOM_SEED)
+                )
+            return run, len(purchases)
+        
+        def adjust_last_purchase_dates_columnar(num_rows: int):
+            purchases = generated(num_rows)
+            return (lambda: PurchaseGenerator.adjust_last_purchase_dates_columnar(
+                        purchases, streams=CustomerStreams(Constants.RANDOM_SEED)),
+                    len(purchases))
+        
+        def adjuster(stage: Callable[[pd.DataFrame], pd.DataFrame]):
+            def setup(num_rows: int):
+                purchases = generated(num_rows).copy()
+                return lambda: stage(purchases), len(purchases)
+            return setup
+        
+        def seeded(stage: Callable[[pd.DataFrame, CustomerStreams], pd.DataFrame]):
+            return lambda df: stage(df, CustomerStreams(Constants.RANDOM_SEED))
+        
+        return [
+            BenchmarkCase('generate_dates', generate_dates),
+            BenchmarkCase('generate_review_rating', generate_review_rating),
+            BenchmarkCase('generate_review_ratings', generate_review_ratings),
+            BenchmarkCase('generate_purchase_details_for_season', generate_purchase_details),
+            BenchmarkCase('generate_purchase_amounts', generate_purchase_amounts),
+            BenchmarkCase('process_past_purchases', process_past_purchases, max_rows=100_000),
+            BenchmarkCase('process_future_purchases', process_future_purchases, max_rows=100_000),
+            BenchmarkCase('process_past_purchases_columnar', process_past_purchases_columnar),
+            BenchmarkCase('process_future_purchases_columnar', process_future_purchases_columnar),
+            BenchmarkCase('adjust_last_purchase_dates', adjust_last_purchase_dates),
+            BenchmarkCase('adjust_last_purchase_dates_columnar', adjust_last_purchase_dates_columnar),
+            BenchmarkCase('apply_holiday_effect', adjuster(seeded(lambda df, streams: HolidayAdjuster.apply_holiday_effect(df, holidays, streams=streams)))),
+            BenchmarkCase('apply_covid_effect', adjuster(seeded(lambda df, streams: HolidayAdjuster.apply_covid_effect(df, streams=streams)))),
+            BenchmarkCase('redistribute_sales_by_target', adjuster(seeded(HolidayAdjuster.redistribute_sales_by_target))),
+            BenchmarkCase('apply_promo_codes', adjuster(seeded(lambda df, streams: HolidayAdjuster.apply_promo_codes(df, streams=streams)))),
+            BenchmarkCase('add_weekday_columns', adjuster(lambda df: HolidayAdjuster.add_weekday_columns(df.copy()))),
+            BenchmarkCase('add_derived_columns', adjuster(lambda df: DerivedFeatures.apply(df, holidays))),
+        ]
+    
+    @staticmethod
+    def run_suite(sizes: List[int], only: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+        """Ölçüm takımını çalıştırır.
+        
+        Returns:
+            Ölçüm adı -> {boyut: saniyede satır}
+        """
+        results: Dict[str, Dict[str, float]] = {}
+        for case in Benchmark.cases():
+            if only and case.name not in only:
+                continue
+            for size in sizes:
+                if case.max_rows is not None and size > case.max_rows:
+                    print(f"{case.name:<38} {size:>9} satır: atlandı (en fazla {case.max_rows} satır)")
+                    continue
+                with contextlib.redirect_stdout(io.StringIO()):
+                    func, num_rows = case.setup(size)
+                result = Benchmark.measure(func, num_rows, repeat=3 if size <= 10_000 else 1)
+                results.setdefault(case.name, {})[str(size)] = result['rows_per_second']
+                print(f"{case.name:<38} {size:>9} satır: {result['seconds']:8.3f} sn "
+                      f"({result['rows_per_second']:>12,.0f} satır/sn)", flush=True)
+        return results
+    
+    @staticmethod
+    def compare(
+        results: Dict[str, Dict[str, float]],
+        baseline: Dict[str, Dict[str, float]],
+        tolerance: float = REGRESSION_TOLERANCE
+    ) -> List[str]:
+        """Sonuçları temel ölçümle karşılaştırır ve tolerans üzerinde yavaşlayan ölçümleri döndürür."""
+        regressions = []
+        print(f"\nTemel ölçümle karşılaştırma (tolerans %{tolerance * 100:.0f}):")
+        for name, sizes in results.items():
+            for size, rows_per_second in sizes.items():
+                reference = baseline.get(name, {}).get(size)
+                if not reference:
+                    continue
+                change = rows_per_second / reference - 1
+                flag = ''
+                if change < -tolerance:
+                    flag = '  <-- YAVAŞLAMA'
+                    regressions.append(f"{name}@{size}: {change * 100:+.1f}%")
+                print(f"{name:<38} {size:>9} satır: {change * 100:+7.1f}%{flag}")
+        return regressions
+    
+    @staticmethod
+    def compare_startup(
+        seconds: float,
+        reference: Optional[float],
+        tolerance: float = REGRESSION_TOLERANCE
+    ) -> List[str]:
+        """Başlatma süresini temel ölçümle karşılaştırır; tolerans üzerinde uzadıysa işaretler."""
+        if not reference:
+            return []
+        change = seconds / reference - 1
+        flag = ''
+        regressions = []
+        if change > tolerance:
+            flag = '  <-- YAVAŞLAMA'
+            regressions.append(f"{STARTUP_CASE}: {change * 100:+.1f}% süre")
+        print(f"{STARTUP_CASE:<38} {seconds:8.3f} sn / {reference:.3f} sn: {change * 100:+7.1f}% süre{flag}")
+        return regressions
+    
+    @staticmethod
+    def machine_info() -> Dict[str, Any]:
+        """Ölçümün alındığı makine ve yazılım sürümleri."""
+        return {
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+        }
+    
+    @staticmethod
+    def load_baseline(path: str = BASELINE_FILE) -> Optional[Dict[str, Any]]:
+        """Temel ölçüm dosyasını okur; yoksa None döndürür.
+        
+        Returns:
+            {'results': ölçüm adı -> {boyut: saniyede satır}, 'startup_seconds': başlatma süresi,
+             'machine': machine_info}
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    
+    @staticmethod
+    def save_baseline(
+        results: Dict[str, Dict[str, float]],
+        startup_seconds: Optional[float] = None,
+        path: str = BASELINE_FILE
+    ) -> None:
+        """Sonuçları mevcut temel ölçümle birleştirip dosyaya yazar."""
+        baseline = Benchmark.load_baseline(path) or {}
+        merged = baseline.get('results', {})
+        for name, sizes in results.items():
+            merged.setdefault(name, {}).update(sizes)
+        if startup_seconds is None:
+            startup_seconds = baseline.get('startup_seconds')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'unit': 'rows_per_second',
+                'machine': Benchmark.machine_info(),
+                'results': merged,
+                'startup_seconds': startup_seconds,
+            }, f, indent=2, sort_keys=True)
+        print(f"Temel ölçüm {path} dosyasına kaydedildi.")
+    
+    @staticmethod
+    def measure_allocations(func: Callable[[], object], num_calls: int) -> float:
+        """Fonksiyonun çağrı başına ortalama geçici bellek tahsisini (bayt) tracemalloc ile ölçer."""
+        tracemalloc.start()
+        total_peak = 0
+        for _ in range(num_calls):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            total_peak += peak - current
+        tracemalloc.stop()
+        return total_peak / num_calls
+    
+    @staticmethod
+    def run_startup() -> None:
+        """CLI'yi yeni bir süreçte --help ile başlatır (içe aktarma + argüman ayrıştırma)."""
+        subprocess.run(STARTUP_COMMAND, check=True, stdout=subprocess.DEVNULL)
+    
+    @staticmethod
+    def measure_startup(repeat: int = 5) -> float:
+        """CLI başlatma süresini (saniye, en iyi tekrar) ölçer; satır sayısından bağımsızdır."""
+        seconds = Benchmark.measure(Benchmark.run_startup, 1, repeat)['seconds']
+        print(f"{STARTUP_CASE:<38} {seconds:8.3f} sn / başlatma", flush=True)
+        return seconds
+    
+    @staticmethod
+    def import_times(top: int = 10) -> List[Tuple[str, int]]:
+        """`python -X importtime` çıktısından en pahalı içe aktarmaları raporlar.
+        
+        Returns:
+            (modül, kümülatif mikrosaniye) listesi, pahalıdan ucuza
+        """
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import final_generate4'],
+            check=True, capture_output=True, text=True
+        )
+        timings = []
+        for line in completed.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, module = line[len('import time:'):].split('|')
+            timings.append((module.strip(), int(cumulative)))
+        timings.sort(key=lambda item: item[1], reverse=True)
+        print("\nİçe aktarma süreleri (import final_generate4, kümülatif):")
+        for module, microseconds in timings[:top]:
+            print(f"{module:<38} {microseconds / 1000:8.1f} ms")
+        return timings[:top]
+    
+    @staticmethod
+    def purchase_details_allocations(num_rows: int = 2_000) -> None:
+        """generate_purchase_details_for_season için satır başına bellek tahsisini raporlar.
+        
+        Karşılaştırma için, önbellek öncesinde her satırda yeniden oluşturulan
+        model tablolarının tek başına tahsis ettiği bellek de ölçülür.
+        """
+        product_data = ProductModel.get_product_data()
+        
+        def rebuild_tables() -> None:
+            SeasonModel.define_category_season_weights()
+            ProductModel.define_item_stats()
+            SeasonModel.define_season_color_preferences()
+        
+        def generate_row() -> None:
+            PurchaseGenerator.generate_purchase_details_for_season(
+                'Winter', product_data, 'Female', '27-35', 'New York'
+            )
+        
+        table_bytes = Benchmark.measure_allocations(rebuild_tables, num_rows)
+        row_bytes = Benchmark.measure_allocations(generate_row, num_rows)
+        print(f"Satır başına tablo yeniden oluşturma (önbelleksiz): {table_bytes:,.0f} bayt")
+        print(f"Satır başına generate_purchase_details_for_season: {row_bytes:,.0f} bayt")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Komut satırı argümanlarını ayrıştırır."""
+    parser = argparse.ArgumentParser(description="Veri üretim hattı performans ölçümleri.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Ölçülecek satır sayıları (varsayılan: 1000 100000 1000000)")
+    parser.add_argument('--only', nargs='+', help="Yalnızca belirtilen ölçümleri çalıştır")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help=f"Temel ölçüm dosyası (varsayılan: {BASELINE_FILE})")
+    parser.add_argument('--save-baseline', action='store_true', help="Sonuçları temel ölçüm olarak kaydet")
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE,
+                        help="Yavaşlama olarak işaretlenecek oran (varsayılan: 0.10)")
+    parser.add_argument('--allocations', action='store_true', help="Satır başına bellek tahsisini de ölç")
+    parser.add_argument('--startup', action='store_true', help="İçe aktarma sürelerini (-X importtime) de raporla")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ölçümleri çalıştırır; temel ölçüme göre yavaşlama varsa 1 döndürür."""
+    args = parse_args(argv)
+    results = Benchmark.run_suite(args.sizes, args.only)
+    startup_seconds = None
+    if not args.only or STARTUP_CASE in args.only:
+        startup_seconds = Benchmark.measure_startup()
+    if args.allocations:
+        Benchmark.purchase_details_allocations()
+    if args.startup:
+        Benchmark.import_times()
+    
+    if args.save_baseline:
+        Benchmark.save_baseline(results, startup_seconds, args.baseline)
+        return 0
+    
+    baseline = Benchmark.load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\nTemel ölçüm dosyası ({args.baseline}) bulunamadı; kaydetmek için --save-baseline kullanın.")
+        return 0
+    
+    if baseline.get('machine') != Benchmark.machine_info():
+        print(f"\nUyarı: temel ölçüm farklı bir makinede alınmış ({baseline.get('machine')}); "
+              f"karşılaştırmadan önce bu makinede --save-baseline ile yeniden kaydedin.")
+    regressions = Benchmark.compare(results, baseline.get('results', {}), args.tolerance)
+    if startup_seconds is not None:
+        regressions += Benchmark.compare_startup(startup_seconds, baseline.get('startup_seconds'), args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} ölçümde %{args.tolerance * 100:.0f}'dan fazla yavaşlama:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("\nYavaşlama yok.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
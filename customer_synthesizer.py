@@ -0,0 +1,121 @@
+"""
+Müşteri Tablosu Çoğaltıcı (customer_synthesizer.py)
+---------------------------------------------------
+Bu modül, shopping_behavior.csv gibi küçük bir müşteri dosyasından
+istenen sayıda müşteri içeren bir giriş dosyası üretir. Müşteri satırları
+kaynak dosyadan yerine koyarak (bootstrap) örneklenir ve her yeni
+müşteriye benzersiz bir 'Customer ID' verilir.
+
+Satırın tamamı birlikte örneklendiği için Age, Gender, Previous Purchases,
+Frequency of Purchases, Subscription Status ve Discount Applied sütunlarının
+ortak dağılımı korunur. Çıktı parçalar halinde diske yazılır; bellekte
+aynı anda yalnızca bir parça tutulur.
+
+Kullanım:
+    python customer_synthesizer.py --customers 10000000 --output customers_10m.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import List, Optional
+
+from final_generate1 import Constants, Utils, lazy_import
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+
+class CustomerSynthesizer:
+    """Kaynak müşteri tablosundan yeniden örnekleme ile büyük müşteri tabloları üretir."""
+    
+    # Ortak dağılımı korunan sütunlar
+    JOINT_COLUMNS = [
+        'Age', 'Gender', 'Previous Purchases', 'Frequency of Purchases', 'Subscription Status', 'Discount Applied'
+    ]
+    
+    @staticmethod
+    def check_source(source: pd.DataFrame) -> None:
+        """Kaynak tabloda ortak dağılımı korunacak sütunların bulunduğunu doğrular."""
+        missing = [column for column in CustomerSynthesizer.JOINT_COLUMNS if column not in source.columns]
+        if missing or source.empty:
+            raise ValueError(f"Kaynak müşteri tablosu boş veya eksik sütunlar içeriyor: {missing}")
+    
+    @staticmethod
+    def sample(
+        source: pd.DataFrame,
+        num_customers: int,
+        rng: Optional[np.random.Generator] = None,
+        start_id: int = 1
+    ) -> pd.DataFrame:
+        """Kaynak tablodan num_customers müşteri örnekler.
+        
+        Args:
+            source: Kaynak müşteri tablosu
+            num_customers: Üretilecek müşteri sayısı
+            rng: Rastgele sayı üreteci (verilmezse Utils.default_rng() kullanılır)
+            start_id: İlk müşterinin kimliği; kimlikler ardışık verilir
+        
+        Returns:
+            Benzersiz 'Customer ID' sütunlu müşteri tablosu
+        """
+        CustomerSynthesizer.check_source(source)
+        rng = rng if rng is not None else Utils.default_rng()
+        customers = source.iloc[rng.integers(0, len(source), size=num_customers)].reset_index(drop=True)
+        customers['Customer ID'] = np.arange(start_id, start_id + num_customers)
+        return customers
+    
+    @staticmethod
+    def write(
+        source_file: str,
+        output_file: str,
+        num_customers: int,
+        chunk_size: int = 1_000_000,
+        seed: int = Constants.RANDOM_SEED
+    ) -> int:
+        """num_customers müşterilik tabloyu parçalar halinde CSV dosyasına yazar.
+        
+        Kaynak satırlar ('Customer ID' hariç) bir kez CSV metnine çevrilir; her
+        parçada yalnızca örneklenen satır indeksleri ve yeni kimlikler üretilip
+        hazır metinlerle birleştirilir.
+        
+        Returns:
+            Yazılan müşteri sayısı
+        """
+        source = pd.read_csv(source_file)
+        CustomerSynthesizer.check_source(source)
+        value_columns = [column for column in source.columns if column != 'Customer ID']
+        encoded_rows = np.array(
+            source[value_columns].to_csv(header=False, index=False, lineterminator='\n').splitlines(),
+            dtype=object
+        )
+        rng = np.random.default_rng(seed)
+        
+        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            f.write(','.join(['Customer ID'] + value_columns) + '\n')
+            for chunk_start in range(0, num_customers, chunk_size):
+                count = min(chunk_size, num_customers - chunk_start)
+                rows = encoded_rows[rng.integers(0, len(source), size=count)]
+                ids = range(chunk_start + 1, chunk_start + count + 1)
+                f.write(''.join([f"{customer_id},{row}\n" for customer_id, row in zip(ids, rows)]))
+                print(f"  {chunk_start + count}/{num_customers} müşteri yazıldı", flush=True)
+        
+        print(f"{num_customers} müşteri {output_file} dosyasına yazıldı.")
+        return num_customers
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Komut satırı argümanlarını ayrıştırır."""
+    parser = argparse.ArgumentParser(description="Kaynak müşteri dosyasını istenen müşteri sayısına çoğaltır.")
+    parser.add_argument('--customers', type=int, required=True, help="Üretilecek müşteri sayısı")
+    parser.add_argument('--output', required=True, help="Çıktı CSV dosyası")
+    parser.add_argument('--source', default=Constants.INPUT_FILE,
+                        help=f"Kaynak müşteri dosyası (varsayılan: {Constants.INPUT_FILE})")
+    parser.add_argument('--chunk-size', type=int, default=1_000_000, help="Bir seferde yazılan müşteri sayısı")
+    parser.add_argument('--seed', type=int, default=Constants.RANDOM_SEED, help="Rastgele başlangıç değeri")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    CustomerSynthesizer.write(args.source, args.output, args.customers, args.chunk_size, args.seed)
@@ -8,14 +8,47 @@ ve tarih/zaman işlemleri için yardımcı fonksiyonları içerir.
 - Constants: Sabit değerler ve yapılandırma parametreleri
 - DataTypes: Veri yapıları ve yardımcı sınıflar
 - DateTimeUtils: Tarih ve zaman ile ilgili yardımcı fonksiyonlar
+- CustomerStreams: (seed, müşteri kimliği) ile türetilen müşteri bazlı rastgele akışlar
+- StageProfiler: Aşama bazında süre, bellek ve satır sayısı ölçümü
+- lazy_import: pandas/numpy gibi ağır modülleri ilk kullanımda yükleyen tembel içe aktarma
 """
 
-import pandas as pd
-import numpy as np
-import random
+from __future__ import annotations
+
+import importlib.util
+import sys
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
 import calendar
-from typing import Dict, List, Tuple, Any, Union, Optional, NamedTuple, TypeVar
+from typing import Dict, List, Tuple, Any, Union, Optional, NamedTuple, TypeVar, Mapping
+
+
+def lazy_import(name: str):
+    """Modülü ilk öznitelik erişiminde yükleyen tembel içe aktarma.
+    
+    pandas ve numpy'nin yüklenmesi kısa işlerde (--help, küçük yeniden
+    üretimler) çalışma süresinin görünür bir kısmıdır; modüller bu yüzden
+    gerçekten kullanılana kadar yüklenmez. Modül zaten yüklüyse doğrudan döner.
+    Başlangıç süresi `python -X importtime final_generate4.py --help` ile ölçülür.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
 
 
 class Constants:
@@ -26,6 +59,19 @@ class Constants:
     DATE_FORMAT = '%Y-%m-%d'
     YEAR_RANGE = [2022, 2023, 2024]
     
+    # Paralel üretimde bir parçadaki müşteri sayısı (işçi sayısından bağımsızdır)
+    SHARD_SIZE = 250
+    
+    # Akış halinde yazımda bir seferde işlenen müşteri sayısı (SHARD_SIZE'ın katına yuvarlanır)
+    CHUNK_SIZE = 2000
+    
+    # Çıktı biçimleri ve Parquet satır grubu büyüklüğü
+    OUTPUT_FORMATS = {'csv': '.csv', 'parquet': '.parquet', 'feather': '.feather'}
+    ROW_GROUP_SIZE = 100_000
+    
+    # Aşama ölçüm raporunun yazıldığı dosya
+    REPORT_FILE = 'pipeline_report.json'
+    
     # Yaş grupları sınırları
     AGE_GROUPS = {
         (18, 26): '18-26',
@@ -55,6 +101,12 @@ class Constants:
     # Tüm beden seçenekleri
     SIZES = ['S', 'M', 'L', 'XL']
     
+    # Üretilen satırlarda pd.Categorical olarak taşınan müşteri düzeyindeki sütunlar
+    CUSTOMER_CATEGORICAL_COLUMNS = ['Gender', 'Location', 'Subscription Status']
+    
+    # Giriş dosyasında aktif üyeliği belirten 'Subscription Status' değeri (diğer değer 'No')
+    SUBSCRIBED_STATUS = 'Yes'
+    
     # Haftanın günlerine göre alışveriş olasılık ağırlıkları 
     # Talep edilen dağılım:
     # Pazartesi: 8.4%, Salı: 9.5%, Çarşamba: 11.6%, Perşembe: 13.7%
@@ -83,6 +135,10 @@ class Constants:
         1.0: 0.15   # 1 yıldız - Belirgin ikinci zirve (memnuniyetsiz müşteriler aktif yorum yapar)
     }
     
+    # Değerlendirme puanında ürün sınıfları (bkz. StatisticalUtils.review_rating_weights)
+    REVIEW_CRITICAL_ITEMS = ['Suit', 'Dress', 'Heels', 'Boots']  # Yüksek beklentiyle alınan ürünler
+    REVIEW_SIMPLE_ITEMS = ['Socks', 'T-Shirt', 'Gloves']  # Basit ürünler
+    
     # Popüler alışveriş günleri ve özel dönemler - gerçek takvim etkisi
     SHOPPING_SEASONS = {
         # Tatil sezonu
@@ -95,26 +151,31 @@ class Constants:
         (3, 1, 5, 31): 'Spring Season',      # 1 Mart - 31 Mayıs
     }
     
-    # Özel günler ve önemi - alışveriş davranışlarında artış faktörü
-    # Satış verilerinden hesaplanan ağırlıkları içe aktar
-    from sales_data import SPECIAL_DAY_WEIGHTS
-    
-    SPECIAL_DAYS = {
+    # Özel dönemler - alışveriş davranışlarında artış faktörü sales_data.SPECIAL_DAY_WEIGHTS'ten
+    # alınır; ağırlıklar içe aktarma sırasında değil, ilk special_days() çağrısında hesaplanır
+    SPECIAL_DAY_PERIODS = {
         # Black Friday ve çevresi (Kasım ayının son haftası)
-        (11, 20, 11, 30): SPECIAL_DAY_WEIGHTS['black_friday'],
+        (11, 20, 11, 30): 'black_friday',
         # Yılbaşı alışverişleri (Aralık ayının son haftası)
-        (12, 20, 12, 31): SPECIAL_DAY_WEIGHTS['christmas'],
+        (12, 20, 12, 31): 'christmas',
         # Sevgililer Günü sezonu (1-14 Şubat)
-        (2, 1, 2, 14): SPECIAL_DAY_WEIGHTS['valentines'],
+        (2, 1, 2, 14): 'valentines',
         # Anneler Günü sezonu (Mayıs başı)
-        (5, 1, 5, 15): SPECIAL_DAY_WEIGHTS['mothers_day'],
+        (5, 1, 5, 15): 'mothers_day',
         # Okulların açılış dönemi (Ağustos sonu - Eylül başı)
-        (8, 20, 9, 10): SPECIAL_DAY_WEIGHTS['back_to_school']
+        (8, 20, 9, 10): 'back_to_school'
     }
     
     # Gelecek tarih aralığı - daha dengeli bir dağılım için tüm yılı kapsayacak şekilde değiştirildi
     FUTURE_DATE_START = datetime(2024, 1, 1)
     FUTURE_DATE_END = datetime(2024, 12, 31)
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def special_days() -> Dict[Tuple[int, int, int, int], float]:
+        """Özel dönem aralıklarını satış verilerinden hesaplanan ağırlıklarla eşler (önbellekli)."""
+        from sales_data import SPECIAL_DAY_WEIGHTS
+        return {period: SPECIAL_DAY_WEIGHTS[name] for period, name in Constants.SPECIAL_DAY_PERIODS.items()}
 
 
 class DataTypes:
@@ -130,6 +191,78 @@ class DataTypes:
         review_rating: float
         shipping_type: str
         payment_method: str
+    
+    class HolidayTable(NamedTuple):
+        """Gün sırası (epoch'tan bu yana gün) bazında tatil etkisi tablosu."""
+        start_ordinal: int
+        nearest_distance: np.ndarray
+        uplift_probability: np.ndarray
+    
+    class DateParts(NamedTuple):
+        """'Purchase Date' gün sıralarından bir kez hesaplanan tarih bileşenleri.
+        
+        Tüm diziler satır sayısı uzunluğundadır. weekdays 0 = Pazartesi,
+        6 = Pazar; holiday_distances en yakın tatile olan gün sayısıdır.
+        """
+        ordinals: np.ndarray
+        years: np.ndarray
+        months: np.ndarray
+        days: np.ndarray
+        weekdays: np.ndarray
+        holiday_distances: np.ndarray
+    
+    class DayWeightCalendar(NamedTuple):
+        """Yıl bazında önceden hesaplanmış gün ağırlıkları takvimi.
+        
+        day_weights ve cumulative_weights (yıl sayısı x 366) boyutundadır; yılın
+        günleri 0'dan başlayan indekslerle tutulur. cumulative_weights her ayın
+        ilk gününde sıfırdan yeniden başlayan ay içi kümülatif toplamları içerir.
+        month_starts (yıl sayısı x 13) her ayın yıl içindeki başlangıç indeksidir.
+        """
+        years: Tuple[int, ...]
+        day_weights: np.ndarray
+        cumulative_weights: np.ndarray
+        month_starts: np.ndarray
+    
+    class ReviewRatingFactors(NamedTuple):
+        """Değerlendirme puanı dağılımını belirleyen faktör kodları.
+        
+        price_bucket: 0 = bilgi yok (temel dağılım), 1 = düşük (<30$), 2 = orta, 3 = yüksek (>80$)
+        category_class: 0 = diğer, 1 = Accessories, 2 = Footwear
+        item_class: 0 = diğer, 1 = yüksek beklentili ürünler, 2 = basit ürünler
+        """
+        price_bucket: int
+        category_class: int
+        item_class: int
+    
+    class ConditionalDistribution(NamedTuple):
+        """Bir (mevsim, cinsiyet, yaş grubu, iklim) bağlamı için örneklemeye hazır dağılımlar."""
+        category_sampler: Any
+        item_samplers: Dict[str, Any]
+    
+    class OutputManifest(NamedTuple):
+        """Akış halinde yazılmış bir çıktının artımlı güncelleme için özeti.
+        
+        fingerprints, customer_ids ile aynı sıradaki giriş satırı özetleridir.
+        month_counts yeniden dağıtım öncesi 2024 aylık satış sayılarıdır
+        (indeks ay, uzunluk 13). candidate_* dizileri her ay için yeniden
+        dağıtım anahtarı o ayın candidate_thresholds değerinden küçük olan tüm
+        2024 satırlarını, moved_* dizileri ise taşınan satırları ve özgün
+        tarihlerini tutar. Satırlar
+        (müşteri kimliği, müşteri içi satır sırası) çiftiyle tanımlanır.
+        """
+        config: str
+        total_rows: int
+        customer_ids: np.ndarray
+        fingerprints: np.ndarray
+        month_counts: np.ndarray
+        candidate_ids: np.ndarray
+        candidate_counters: np.ndarray
+        candidate_months: np.ndarray
+        candidate_thresholds: np.ndarray
+        moved_ids: np.ndarray
+        moved_counters: np.ndarray
+        moved_dates: np.ndarray
 
 
 class Utils:
@@ -144,11 +277,77 @@ class Utils:
         else:
             # Eğer tüm ağırlıklar sıfırsa, eşit dağılım kullan
             return {k: 1.0/len(weights) for k in weights}
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def default_rng() -> np.random.Generator:
+        """rng verilmeyen çekimlerin paylaştığı üreteç (önbellekli).
+        
+        Süreç başına Constants.RANDOM_SEED ile bir kez kurulur; ardışık
+        çağrılar aynı üretecin durumunu ilerletir, böylece tekrarlanan
+        çekimler farklı değerler verirken çalıştırmanın tamamı yeniden
+        üretilebilir kalır.
+        """
+        return np.random.default_rng(Constants.RANDOM_SEED)
+    
+    @staticmethod
+    def freeze(value: Any) -> Any:
+        """İç içe bir yapıyı salt-okunur hale getirir.
+        
+        Sözlükler MappingProxyType'a, listeler demetlere, kümeler frozenset'e
+        çevrilir; NamedTuple alanları da dondurulur ve NumPy dizileri yazılamaz
+        görünümlerle değiştirilir. Diğer nesneler olduğu gibi bırakılır.
+        """
+        if isinstance(value, Mapping):
+            return MappingProxyType({key: Utils.freeze(item) for key, item in value.items()})
+        if isinstance(value, tuple) and hasattr(value, '_fields'):
+            return type(value)(*(Utils.freeze(item) for item in value))
+        if isinstance(value, (list, tuple)):
+            return tuple(Utils.freeze(item) for item in value)
+        if isinstance(value, (set, frozenset)):
+            return frozenset(value)
+        if isinstance(value, np.ndarray):
+            view = value.view()
+            view.flags.writeable = False
+            return view
+        return value
 
 
 class DateTimeUtils:
     """Tarih ve zaman ile ilgili yardımcı fonksiyonlar."""
     
+    @staticmethod
+    def date_ordinals(values: Any) -> np.ndarray:
+        """Tarihleri int64 gün sıralarına (1970-01-01'den bu yana gün) çevirir.
+        
+        Gün sıraları olduğu gibi döndürülür; datetime64 değerler dönüştürülür,
+        'YYYY-MM-DD' metinleri (ör. CSV'den okunan parçalar) bir kez ayrıştırılır.
+        """
+        values = np.asarray(values)
+        if np.issubdtype(values.dtype, np.integer):
+            return values.astype(np.int64)
+        return values.astype('datetime64[D]').astype(np.int64)
+    
+    @staticmethod
+    def ordinal_column(dates: np.ndarray) -> np.ndarray:
+        """datetime64 tarihleri veya gün sıralarını 'Purchase Date' sütununun int32 gün sıralarına çevirir."""
+        return DateTimeUtils.date_ordinals(dates).astype(np.int32)
+    
+    @staticmethod
+    def ordinal_parts(ordinals: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Gün sıralarından (yıl, ay, gün) dizilerini metin ayrıştırmadan hesaplar."""
+        dates = np.asarray(ordinals).astype('datetime64[D]')
+        month_starts = dates.astype('datetime64[M]')
+        years = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+        months = month_starts.astype(np.int64) % 12 + 1
+        days = (dates - month_starts.astype('datetime64[D]')).astype(np.int64) + 1
+        return years, months, days
+    
+    @staticmethod
+    def format_ordinals(ordinals: np.ndarray) -> np.ndarray:
+        """Gün sıralarını çıktı için Constants.DATE_FORMAT ('YYYY-MM-DD') metinlerine çevirir."""
+        return np.datetime_as_string(np.asarray(ordinals).astype('datetime64[D]'), unit='D')
+    
     @staticmethod
     def get_last_day_of_month(month: int, year: int) -> int:
         """Belirtilen ay ve yıl için ayın son gününü döndürür."""
@@ -171,7 +370,7 @@ class DateTimeUtils:
             return holidays[month_day]['weight']
         
         # Özel dönemlerin kontrolü (tarih aralıkları - örn. tatil sezonu)
-        for (start_month, start_day, end_month, end_day), weight in Constants.SPECIAL_DAYS.items():
+        for (start_month, start_day, end_month, end_day), weight in Constants.special_days().items():
             # Başlangıç ve bitiş tarihlerini oluştur
             start_date = datetime(date.year, start_month, start_day)
             # Yılı aşma durumu (örn. Kasım-Ocak)
@@ -192,20 +391,116 @@ class DateTimeUtils:
         weekday = date.weekday()  # 0: Pazartesi, 1: Salı, ..., 6: Pazar
         return Constants.WEEKDAY_WEIGHTS.get(weekday, 1.0)
     
+    @staticmethod
+    def build_day_weight_calendar(
+        holidays: Dict[Tuple[int, int], Dict[str, Any]],
+        years: Optional[List[int]] = None
+    ) -> DataTypes.DayWeightCalendar:
+        """Her yıl için gün ağırlıkları takvimini bir kez hesaplar.
+        
+        Bir günün ağırlığı, generate_dates'in kullandığı birleşik ağırlıktır:
+        haftanın günü ağırlığı x get_holiday_weight (tatil / özel dönem / gün).
+        """
+        years = tuple(years if years is not None else Constants.YEAR_RANGE)
+        day_weights = np.zeros((len(years), 366))
+        cumulative_weights = np.zeros((len(years), 366))
+        month_starts = np.zeros((len(years), 13), dtype=np.int64)
+        
+        for year_idx, year in enumerate(years):
+            day_of_year = 0
+            for month in range(1, 13):
+                month_starts[year_idx, month - 1] = day_of_year
+                last_day = DateTimeUtils.get_last_day_of_month(month, year)
+                for day in range(1, last_day + 1):
+                    date = datetime(year, month, day)
+                    weight = Constants.WEEKDAY_WEIGHTS.get(date.weekday(), 1.0)
+                    weight *= DateTimeUtils.get_holiday_weight(date, holidays)
+                    day_weights[year_idx, day_of_year + day - 1] = weight
+                
+                # Ay içi kümülatif ağırlıklar (O(log 31) gün seçimi için)
+                month_slice = slice(day_of_year, day_of_year + last_day)
+                cumulative_weights[year_idx, month_slice] = np.cumsum(day_weights[year_idx, month_slice])
+                day_of_year += last_day
+            month_starts[year_idx, 12] = day_of_year
+        
+        return DataTypes.DayWeightCalendar(
+            years=years,
+            day_weights=day_weights,
+            cumulative_weights=cumulative_weights,
+            month_starts=month_starts
+        )
+    
+    @staticmethod
+    def draw_calendar_day(calendar: DataTypes.DayWeightCalendar, year: int, month: int, u: float) -> int:
+        """[0, 1) aralığındaki u değerini takvim ağırlıklarına göre ayın bir gününe çevirir."""
+        year_idx = calendar.years.index(year)
+        start = calendar.month_starts[year_idx, month - 1]
+        end = calendar.month_starts[year_idx, month]
+        month_cumulative = calendar.cumulative_weights[year_idx, start:end]
+        
+        if month_cumulative[-1] <= 0:
+            # Tüm günlerin ağırlığı sıfırsa eşit olasılıkla seç
+            return int(u * (end - start)) + 1
+        
+        day_idx = np.searchsorted(month_cumulative, u * month_cumulative[-1], side='right')
+        return int(min(day_idx, end - start - 1)) + 1
+    
+    @staticmethod
+    def draw_calendar_days(
+        calendar: DataTypes.DayWeightCalendar,
+        year_indices: np.ndarray,
+        months: np.ndarray,
+        uniforms: np.ndarray
+    ) -> np.ndarray:
+        """draw_calendar_day'in dizi sürümü; her satır için bir tarih (datetime64[D]) döndürür.
+        
+        Args:
+            calendar: Gün ağırlıkları takvimi
+            year_indices: calendar.years içindeki yıl indeksleri
+            months: Ay numaraları (1-12)
+            uniforms: [0, 1) aralığında rastgele sayılar
+        """
+        # Tüm yılların günleri üzerinden tek bir kümülatif toplam
+        global_cumulative = np.concatenate(([0.0], np.cumsum(calendar.day_weights.ravel())))
+        row_offsets = year_indices * calendar.day_weights.shape[1]
+        lo_idx = row_offsets + calendar.month_starts[year_indices, months - 1]
+        hi_idx = row_offsets + calendar.month_starts[year_indices, months]
+        lo = global_cumulative[lo_idx]
+        hi = global_cumulative[hi_idx]
+        
+        positions = np.searchsorted(global_cumulative, lo + uniforms * (hi - lo), side='right') - 1
+        positions = np.clip(positions, lo_idx, hi_idx - 1)
+        
+        # Tüm günlerin ağırlığı sıfırsa eşit olasılıkla seç
+        empty = hi <= lo
+        if empty.any():
+            positions[empty] = lo_idx[empty] + (uniforms[empty] * (hi_idx - lo_idx)[empty]).astype(np.int64)
+        
+        year_starts = np.array([np.datetime64(f'{year}-01-01', 'D') for year in calendar.years])
+        return year_starts[year_indices] + (positions - row_offsets)
+    
     @staticmethod
     def generate_date_for_season(
         season: str, 
         year: int, 
         customer_id: int, 
         season_months: Dict[str, List[int]], 
-        holidays: Dict[Tuple[int, int], Dict[str, Any]]
+        holidays: Dict[Tuple[int, int], Dict[str, Any]],
+        rng: Optional[np.random.Generator] = None
     ) -> datetime:
-        """Belirli bir mevsim için uygun tarih oluşturur."""
-        # Tutarlı rastgele sayı üretimi için
-        random.seed(customer_id + hash(season) + year)
+        """Belirli bir mevsim için uygun tarih oluşturur.
+        
+        rng verilmezse akış (RANDOM_SEED, müşteri, yıl, mevsim) değerlerinden
+        türetilir; aynı girdiler her süreçte aynı tarihi verir.
+        """
+        # Tutarlı rastgele sayı üretimi için (hash() PYTHONHASHSEED'e bağlı olduğundan kullanılmaz)
+        if rng is None:
+            rng = np.random.default_rng(
+                [Constants.RANDOM_SEED, int(customer_id), year, list(season_months).index(season)]
+            )
             
         # Mevsim için uygun ay seçimi
-        month = random.choice(season_months[season])
+        month = season_months[season][int(rng.integers(len(season_months[season])))]
             
         # Ay için son gün hesaplama
         last_day = DateTimeUtils.get_last_day_of_month(month, year)
@@ -222,9 +517,9 @@ class DateTimeUtils:
             
         # Ağırlıklı olarak gün seçimi
         if sum(day_weights) > 0:  # Eğer en az bir geçerli gün varsa
-            day = random.choices(range(1, last_day + 1), weights=day_weights, k=1)[0]
+            day = int(rng.choice(np.arange(1, last_day + 1), p=np.array(day_weights) / sum(day_weights)))
         else:
-            day = random.randint(1, last_day)  # Tüm günler geçersizse rastgele seç
+            day = int(rng.integers(1, last_day + 1))  # Tüm günler geçersizse rastgele seç
             
         # Tarihi oluşturma ve doğrulama
         try:
@@ -232,13 +527,14 @@ class DateTimeUtils:
             return date
         except ValueError:
             # Geçersiz tarih durumunda başka bir gün seç
-            day = random.randint(1, last_day - 1)
+            day = int(rng.integers(1, last_day))
             date = datetime(year, month, day)
             return date
     
     @staticmethod
-    def generate_random_future_date() -> str:
+    def generate_random_future_date(rng: Optional[np.random.Generator] = None) -> str:
         """1 Ocak 2024 ile 31 Aralık 2024 arasında rastgele bir tarih üretir."""
+        rng = rng if rng is not None else Utils.default_rng()
         date_range = (Constants.FUTURE_DATE_END - Constants.FUTURE_DATE_START).days
         
         # Hafta içi günlere daha yüksek ağırlık verme
@@ -251,7 +547,7 @@ class DateTimeUtils:
             current_date += timedelta(days=1)
         
         # Ağırlıklı rastgele gün seçimi
-        day_offset = random.choices(range(date_range + 1), weights=weights, k=1)[0]
+        day_offset = int(rng.choice(date_range + 1, p=np.array(weights) / sum(weights)))
         
         # Tarih döndürme
         return (Constants.FUTURE_DATE_START + timedelta(days=day_offset)).strftime(Constants.DATE_FORMAT)
@@ -262,99 +558,60 @@ class DateTimeUtils:
         num_purchases: int, 
         customer_id: int, 
         seasons_list: List[str], 
-        season_months: Dict[str, List[int]], 
-        holidays: Dict[Tuple[int, int], Dict[str, Any]]
+        season_months: Dict[str, List[int]],
+        holidays: Dict[Tuple[int, int], Dict[str, Any]],
+        day_weight_calendar: Optional[DataTypes.DayWeightCalendar] = None,
+        rng: Optional[np.random.Generator] = None
     ) -> List[str]:
-        """Müşteri alışveriş frekansına ve sayısına göre tarih dizisi üretir."""
+        """Müşteri alışveriş frekansına ve sayısına göre tarih dizisi üretir.
+        
+        Gün seçimi, önceden hesaplanmış gün ağırlıkları takvimi üzerinden
+        yapılır. Takvim verilmezse bu çağrı için yeniden oluşturulur; toplu
+        üretimde product_data['day_weight_calendar'] kullanılmalıdır.
+        """
+        rng = rng if rng is not None else Utils.default_rng()
         dates = []
         
         # Satış verilerini içe aktar
         from sales_data import YEAR_WEIGHTS, MONTH_WEIGHTS
         
+        if day_weight_calendar is None:
+            day_weight_calendar = DateTimeUtils.build_day_weight_calendar(holidays)
+        
         # Yıl ağırlıkları - gerçek satış verilerine göre
         year_weights = YEAR_WEIGHTS
         years = list(year_weights.keys())
-            
+        year_weight_list = [year_weights[y] for y in years]
+        
         # Mevsim listesi - her satırdaki mevsim değeri
         season_list = seasons_list * (num_purchases // len(seasons_list) + 1)
         season_list = season_list[:num_purchases]
-            
-        # Her alışveriş için tarih üretme
+        
+        # Mevsim ayları için ağırlıkları bir kez hesapla
+        season_month_weights = {
+            season: [MONTH_WEIGHTS[m] for m in season_months[season]]
+            for season in set(season_list)
+        }
+        
+        # Yıl ve ay seçimleri için kümülatif ağırlıklar
+        year_cumulative = np.cumsum(year_weight_list)
+        season_month_cumulative = {season: np.cumsum(weights) for season, weights in season_month_weights.items()}
+        
+        # Her alışveriş için tarih üretme (yıl, ay ve gün için satır başına üç düzgün sayı)
+        uniforms = rng.random((num_purchases, 3))
         for i in range(num_purchases):
             season = season_list[i]
-                    
-            # Ağırlıklı yıl seçimi
-            year = random.choices(years, weights=[year_weights[y] for y in years], k=1)[0]
-            
-            # Ay ağırlıklarına göre ay seçimi
-            # Önce mevsime uygun ayları belirle
-            season_month_list = season_months[season]
-            # Mevsim ayları için ağırlıkları al
-            month_weights_for_season = {m: MONTH_WEIGHTS[m] for m in season_month_list}
-            # Ağırlıkları normalize et
-            total_weight = sum(month_weights_for_season.values())
-            normalized_weights = {m: w/total_weight for m, w in month_weights_for_season.items()}
-            # Ağırlıklı ay seçimi
-            month = random.choices(
-                list(month_weights_for_season.keys()), 
-                weights=[normalized_weights[m] for m in month_weights_for_season.keys()], 
-                k=1
-            )[0]
-            
-            # Ay için son gün hesaplama
-            last_day = DateTimeUtils.get_last_day_of_month(month, year)
-            
-            # Günler için ağırlıklar hesaplama (tatil günleri daha yüksek olasılıklı)
-            day_weights = []
-            for day in range(1, last_day + 1):
-                try:
-                    date = datetime(year, month, day)
-                    weight = DateTimeUtils.get_holiday_weight(date, holidays)
-                    day_weights.append(weight)
-                except ValueError:
-                    day_weights.append(0)  # Geçersiz tarih
-            
-            # Ağırlıklı olarak gün seçimi
-            if sum(day_weights) > 0:  # Eğer en az bir geçerli gün varsa
-                day = random.choices(range(1, last_day + 1), weights=day_weights, k=1)[0]
-            else:
-                day = random.randint(1, last_day)  # Tüm günler geçersizse rastgele seç
             
-            # Tarihi oluşturma
-            try:
-                date = datetime(year, month, day)
-            except ValueError:
-                # Geçersiz tarih durumunda başka bir gün seç
-                day = random.randint(1, last_day - 1)
-                date = datetime(year, month, day)
-            
-            # Haftanın günü ağırlıklarına göre tarih seçimi
-            # Önce ay içindeki tüm günleri oluştur
-            all_days = []
-            all_weights = []
+            # Ağırlıklı yıl seçimi
+            year = years[int(np.searchsorted(year_cumulative, uniforms[i, 0] * year_cumulative[-1], side='right'))]
             
-            # Ayın ilk gününden başlayarak tüm günleri oluştur
-            current_date = datetime(year, month, 1)
-            while current_date.month == month:
-                # Haftanın günü ağırlığını al
-                weekday = current_date.weekday()
-                weight = Constants.WEEKDAY_WEIGHTS.get(weekday, 1.0)
-                
-                # Tatil günü ağırlığını ekle
-                holiday_weight = DateTimeUtils.get_holiday_weight(current_date, holidays)
-                weight *= holiday_weight
-                
-                all_days.append(current_date)
-                all_weights.append(weight)
-                
-                current_date += timedelta(days=1)
+            # Ay ağırlıklarına göre ay seçimi (mevsime uygun aylar arasından)
+            month_cumulative = season_month_cumulative[season]
+            month = season_months[season][int(np.searchsorted(month_cumulative, uniforms[i, 1] * month_cumulative[-1], side='right'))]
             
-            # Ağırlıklı olarak gün seçimi
-            if sum(all_weights) > 0:  # Eğer en az bir geçerli gün varsa
-                date = random.choices(all_days, weights=all_weights, k=1)[0]
-            else:
-                # Tüm günler geçersizse rastgele seç
-                date = random.choice(all_days)
+            # Haftanın günü ve tatil ağırlıklarına göre takvimden gün seçimi
+            day = DateTimeUtils.draw_calendar_day(day_weight_calendar, year, month, uniforms[i, 2])
+            date = datetime(year, month, day)
             
             # 2022-2024 aralığında kalmasını sağlama
             if date.year < 2022:
@@ -413,3 +670,205 @@ class DateTimeUtils:
             result = last_day_of_week + timedelta(days=7 * (week_number + 1))
         
         return result
+
+
+class CustomerStreams:
+    """(seed, müşteri kimliği) ile türetilen müşteri bazlı rastgele akışlar.
+    
+    Bir müşterinin tüm rastgele çekimleri yalnızca seed'e, müşteri kimliğine,
+    akış etiketine ve müşteri içindeki sayaca (örneğin kaçıncı alışveriş
+    olduğu) bağlıdır. Bu nedenle herhangi bir müşteri alt kümesi, hangi
+    parçada veya kaç işçiyle üretilirse üretilsin aynı sonucu verir.
+    
+    uniforms() sayaç tabanlı bir karıştırma fonksiyonuyla (SplitMix64)
+    milyonlarca satır için düzgün sayıları tek dizi işlemiyle üretir;
+    generator() ise satır bazlı yollar için müşteriye özel bir
+    numpy.random.Generator döndürür.
+    
+    Örnek:
+        streams = CustomerStreams(seed=42)
+        u = streams.uniforms(customer_ids, purchase_indices, CustomerStreams.PAST, num_draws=4)
+        rng = streams.generator(customer_id, CustomerStreams.PAST)
+    """
+    
+    # Akış etiketleri: farklı amaçlı çekimler birbirinden bağımsızdır
+    LOCATION = 0
+    SEASON_PROFILE = 1
+    PAST = 2
+    FUTURE = 3
+    FUTURE_MONTH = 4
+    LAST_PURCHASE = 5
+    HOLIDAY = 6
+    COVID = 7
+    PROMO = 8
+    REDISTRIBUTE = 9
+    
+    # SplitMix64 sabitleri
+    _GOLDEN = 0x9E3779B97F4A7C15
+    _MIX_1 = 0xBF58476D1CE4E5B9
+    _MIX_2 = 0x94D049BB133111EB
+    
+    def __init__(self, seed: int = Constants.RANDOM_SEED):
+        """
+        Args:
+            seed: Tüm akışların türetildiği başlangıç değeri (negatif olmayan tam sayı)
+        """
+        self.seed = seed
+        self.key = np.random.SeedSequence(seed).generate_state(1, np.uint64)[0]
+    
+    @staticmethod
+    def _mix(values: np.ndarray) -> np.ndarray:
+        """SplitMix64 karıştırma fonksiyonu (uint64 dizileri üzerinde, taşmalar modüler)."""
+        values = values ^ (values >> np.uint64(30))
+        values = values * np.uint64(CustomerStreams._MIX_1)
+        values = values ^ (values >> np.uint64(27))
+        values = values * np.uint64(CustomerStreams._MIX_2)
+        return values ^ (values >> np.uint64(31))
+    
+    def uniforms(self, customer_ids: Any, counters: Any, stream: int, num_draws: int = 1) -> np.ndarray:
+        """Her (müşteri, sayaç) çifti için [0, 1) aralığında num_draws düzgün sayı üretir.
+        
+        Args:
+            customer_ids: Satır başına müşteri kimlikleri
+            counters: Satır başına müşteri içi sayaç (tek değer de verilebilir)
+            stream: Akış etiketi (örneğin CustomerStreams.PAST)
+            num_draws: Satır başına çekim sayısı
+        
+        Returns:
+            (satır sayısı, num_draws) boyutunda dizi
+        """
+        customer_ids = np.asarray(customer_ids).astype(np.uint64)
+        counters = np.broadcast_to(np.asarray(counters).astype(np.uint64), customer_ids.shape)
+        customer_keys = self._mix(
+            self.key ^ self._mix(customer_ids * np.uint64(self._GOLDEN) + np.uint64(stream + 1))
+        )
+        row_keys = self._mix(customer_keys ^ ((counters + np.uint64(1)) * np.uint64(self._MIX_2)))
+        draws = self._mix(
+            row_keys[:, None] + np.arange(1, num_draws + 1, dtype=np.uint64)[None, :] * np.uint64(self._GOLDEN)
+        )
+        return (draws >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+    
+    def row_uniforms(self, customer_ids: Any, stream: int, num_draws: int = 1) -> np.ndarray:
+        """Satırlar için düzgün sayılar üretir; sayaç, satırın müşteri içindeki sırasıdır.
+        
+        Bir müşterinin satırlarının sırası (geçmiş alışverişler, ardından
+        gelecek alışveriş) tüm üretim yollarında aynı olduğundan, aynı satır
+        her zaman aynı sayıları alır.
+        """
+        customer_ids = np.asarray(customer_ids)
+        counters = pd.Series(customer_ids).groupby(customer_ids, sort=False).cumcount().to_numpy()
+        return self.uniforms(customer_ids, counters, stream, num_draws)
+    
+    def generator(self, customer_id: int, stream: int = LOCATION) -> np.random.Generator:
+        """Bir müşteri ve akış için bağımsız numpy.random.Generator döndürür."""
+        return np.random.default_rng([self.seed, stream, int(customer_id)])
+
+
+class StageProfiler:
+    """Veri üretim hattının aşamaları için süre, bellek ve satır sayısı ölçümleri.
+    
+    Aynı isimli aşama birden fazla çalışırsa (örneğin her parça için) ölçümler
+    toplanır. Ölçümler aşama sırasıyla saklanır ve sonunda JSON raporu olarak
+    yazılır.
+    
+    Örnek:
+        profiler = StageProfiler()
+        with profiler.stage('apply_holiday_effect', rows_in=len(df)) as stage:
+            df = HolidayAdjuster.apply_holiday_effect(df, holidays)
+            stage['rows_out'] = len(df)
+    """
+    
+    def __init__(self, trace_memory: bool = False, progress: bool = False):
+        """
+        Args:
+            trace_memory: True ise her aşamanın tracemalloc bellek farkı ve tepe değeri ölçülür (yavaşlatır)
+            progress: True ise her aşama bittiğinde bir satır yazdırılır
+        """
+        self.trace_memory = trace_memory
+        self.progress = progress
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.started_at = time.perf_counter()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+    
+    @staticmethod
+    def peak_rss_mb() -> Optional[float]:
+        """Sürecin şimdiye kadarki en yüksek bellek kullanımını (MB) döndürür; desteklenmiyorsa None."""
+        try:
+            import resource
+        except ImportError:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux'ta KB, macOS'ta bayt cinsindendir
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None):
+        """Bir aşamayı ölçer. Dönen sözlüğe 'rows_out' yazılabilir."""
+        stage_info = {'rows_out': None}
+        trace_start = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield stage_info
+        finally:
+            measurement = {
+                'wall_seconds': time.perf_counter() - wall_start,
+                'cpu_seconds': time.process_time() - cpu_start,
+                'rows_in': rows_in,
+                'rows_out': stage_info['rows_out'],
+                'peak_rss_mb': StageProfiler.peak_rss_mb(),
+            }
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                measurement['tracemalloc_delta_mb'] = (current - trace_start) / 2**20
+                measurement['tracemalloc_peak_mb'] = (peak - trace_start) / 2**20
+            self.record(name, measurement)
+    
+    def record(self, name: str, measurement: Dict[str, Any]) -> None:
+        """Bir aşama ölçümünü (veya başka bir süreçte toplanmış ölçümleri) ekler."""
+        stats = self.stages.setdefault(name, {'name': name, 'calls': 0})
+        calls = measurement.get('calls', 1)
+        stats['calls'] += calls
+        for key in ('wall_seconds', 'cpu_seconds', 'rows_in', 'rows_out', 'tracemalloc_delta_mb'):
+            if measurement.get(key) is not None:
+                stats[key] = stats.get(key, 0) + measurement[key]
+        for key in ('peak_rss_mb', 'tracemalloc_peak_mb'):
+            if measurement.get(key) is not None:
+                stats[key] = max(stats.get(key, 0), measurement[key])
+        if self.progress:
+            rows = f", {measurement['rows_out']} satır" if measurement.get('rows_out') is not None else ''
+            print(f"[{time.perf_counter() - self.started_at:8.2f} sn] {name}: "
+                  f"{measurement.get('wall_seconds', 0):.3f} sn{rows}", flush=True)
+    
+    def merge(self, stages: List[Dict[str, Any]]) -> None:
+        """report()['stages'] biçimindeki ölçümleri (örneğin işçi süreçlerinden) ekler."""
+        progress, self.progress = self.progress, False
+        for measurement in stages:
+            self.record(measurement['name'], measurement)
+        self.progress = progress
+    
+    def report(self) -> Dict[str, Any]:
+        """Ölçümleri JSON'a dönüştürülebilir bir sözlük olarak döndürür."""
+        return {
+            'wall_seconds': time.perf_counter() - self.started_at,
+            'cpu_seconds': time.process_time(),
+            'peak_rss_mb': StageProfiler.peak_rss_mb(),
+            'stages': [dict(stats) for stats in self.stages.values()],
+        }
+    
+    def write_report(self, output_file: str = Constants.REPORT_FILE) -> Dict[str, Any]:
+        """Raporu JSON dosyasına yazar ve aşama özetini yazdırır."""
+        report = self.report()
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        
+        print(f"\nAşama ölçümleri ({output_file}):")
+        for stats in report['stages']:
+            rows = f"{stats['rows_out']:>10}" if stats.get('rows_out') is not None else f"{'-':>10}"
+            print(f"  {stats['name']:<32} {stats['wall_seconds']:8.3f} sn  CPU {stats['cpu_seconds']:8.3f} sn  "
+                  f"{rows} satır  x{stats['calls']}")
+        print(f"  {'toplam':<32} {report['wall_seconds']:8.3f} sn")
+        return report
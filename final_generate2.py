@@ -11,12 +11,18 @@ ve mevsimsel modelleri içerir.
 - ProductModel: Ürün kategorileri ve özellikleri
 """
 
-import random
+from __future__ import annotations
+
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Tuple, Any, Union, Optional, NamedTuple
+from functools import lru_cache
+from typing import Dict, List, Tuple, Any, Union, Optional, NamedTuple, Mapping
 
 # İlk modüldeki gerekli sınıfları içe aktarma
-from final_generate1 import Constants, DataTypes, DateTimeUtils
+from final_generate1 import Constants, DataTypes, DateTimeUtils, Utils, lazy_import
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
 
 
 class CustomerModel:
@@ -31,22 +37,23 @@ class CustomerModel:
         return '18-26'  # Varsayılan grup
     
     @staticmethod
-    def get_real_age_from_group(age_group: str) -> int:
+    def get_real_age_from_group(age_group: str, rng: Optional[np.random.Generator] = None) -> int:
         """Yaş grubundan rastgele gerçek yaş değeri üretir."""
+        rng = rng if rng is not None else Utils.default_rng()
         if age_group == '18-26':
-            return random.randint(18, 26)
+            return int(rng.integers(18, 27))
         elif age_group == '27-35':
-            return random.randint(27, 35)
+            return int(rng.integers(27, 36))
         elif age_group == '36-44':
-            return random.randint(36, 44)
+            return int(rng.integers(36, 45))
         elif age_group == '45-53':
-            return random.randint(45, 53)
+            return int(rng.integers(45, 54))
         elif age_group == '54-62':
-            return random.randint(54, 62)
+            return int(rng.integers(54, 63))
         elif age_group == '63-70':
-            return random.randint(63, 70)
+            return int(rng.integers(63, 71))
         else:
-            return random.randint(30, 50)  # Varsayılan
+            return int(rng.integers(30, 51))  # Varsayılan
 
 
 class LocationModel:
@@ -171,14 +178,19 @@ class LocationModel:
         }
     
     @staticmethod
-    def get_climate_multipliers(location: str, product_data: Dict[str, Any]) -> Dict[str, float]:
-        """Lokasyon için iklim çarpanlarını döndürür."""
+    def get_climate(location: Optional[str], product_data: Dict[str, Any]) -> str:
+        """Lokasyonun iklim tipini döndürür."""
         if location and location in product_data['location_data']:
-            climate = product_data['location_data'][location]['climate']
-            return product_data['climate_product_multipliers'][climate]
+            return product_data['location_data'][location]['climate']
         else:
             # Varsayılan olarak ılıman iklim
-            return product_data['climate_product_multipliers']['temperate']
+            return 'temperate'
+    
+    @staticmethod
+    def get_climate_multipliers(location: str, product_data: Dict[str, Any]) -> Dict[str, float]:
+        """Lokasyon için iklim çarpanlarını döndürür."""
+        climate = LocationModel.get_climate(location, product_data)
+        return product_data['climate_product_multipliers'][climate]
 
 
 class SeasonModel:
@@ -550,6 +562,61 @@ class ProductModel:
             # ... daha fazla aksesuar öğesi ...
         }
     
+    @staticmethod
+    def define_price_ranges() -> List[Tuple[int, int, float]]:
+        """Fiyat aralıklarını ve seçilme ağırlıklarını tanımlar."""
+        # Belirtilen fiyat dağılımına göre fiyat üretimi
+        # 20-30$ aralığında: %15
+        # 31-50$ aralığında: %40
+        # 51-65$ aralığında: %25
+        # 66-80$ aralığında: %12
+        # 81-100$ aralığında: %8
+        # Ağırlıkları biraz ayarlayarak istenen dağılıma daha yakın sonuçlar elde edelim
+        return [
+            (20, 30, 0.18),  # Biraz artırıldı
+            (31, 50, 0.42),  # Biraz artırıldı
+            (51, 65, 0.25),  # Aynı kaldı
+            (66, 80, 0.10),  # Biraz azaltıldı
+            (81, 100, 0.05)  # Biraz azaltıldı
+        ]
+    
+    @staticmethod
+    def define_season_price_factors() -> Dict[str, float]:
+        """Mevsime göre fiyat çarpanlarını tanımlar; tanımlı olmayan mevsimlerde çarpan 1'dir."""
+        return {
+            'Winter': 1.08,  # Kış ürünleri genelde daha pahalı
+            'Summer': 0.92   # Yaz ürünleri genelde daha ucuz olabilir (yaz indirimleri)
+        }
+    
+    @staticmethod
+    def define_vocabularies(
+        category_items: Dict[str, Dict[str, Dict[str, Any]]],
+        category_weights: Dict[str, Dict[str, Any]],
+        item_stats: Dict[str, Dict[str, float]],
+        colors: List[str],
+        seasons: List[str],
+        shipping_types: List[str],
+        payment_methods: List[str],
+        location_data: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, List[str]]:
+        """Kategorik çıktı sütunlarının sabit değer listelerini (sözlüklerini) tanımlar.
+        
+        Üretilen satırlarda bu sütunlar metin yerine sözlükteki sıra numarasını
+        tutan pd.Categorical olarak taşınır; sözlükler tüm parçalarda aynıdır.
+        """
+        items = [item for items_in_category in category_items.values() for item in items_in_category]
+        return {
+            'Item Purchased': list(dict.fromkeys(items + list(item_stats))),
+            'Category': list(category_items),
+            'Size': list(Constants.SIZES),
+            'Color': list(colors),
+            'Season': list(seasons),
+            'Shipping Type': list(shipping_types),
+            'Payment Method': list(payment_methods),
+            'Location': list(location_data),
+            'Gender': list(category_weights['Gender']),
+        }
+    
     @staticmethod
     def define_product_data() -> Dict[str, Any]:
         """Ürün kategorileri ve ilgili verileri tanımlar."""
@@ -568,8 +635,41 @@ class ProductModel:
         season_months = SeasonModel.define_season_months()
         holidays = SeasonModel.define_holidays()
         
+        # Gün ağırlıkları takvimi - tarih üretiminde her alışveriş için yeniden hesaplanmaz
+        day_weight_calendar = DateTimeUtils.build_day_weight_calendar(holidays)
+        
+        # Satır bazlı üretimde kullanılan sabit tablolar
+        category_season_weights = SeasonModel.define_category_season_weights()
+        season_color_preferences = SeasonModel.define_season_color_preferences()
+        item_stats = ProductModel.define_item_stats()
+        price_ranges = ProductModel.define_price_ranges()
+        season_price_factors = ProductModel.define_season_price_factors()
+        
+        # Kategorik sütunların sözlükleri ve bunlara karşılık gelen pandas tipleri
+        vocabularies = ProductModel.define_vocabularies(
+            category_items, category_weights, item_stats, colors, seasons, shipping_types, payment_methods, location_data
+        )
+        category_dtypes = {column: pd.CategoricalDtype(values) for column, values in vocabularies.items()}
+        
+        # Sabit dağılımlar için örnekleyiciler (bir kez kurulur)
+        from final_generate3 import StatisticalUtils
+        samplers = {
+            'price_range': StatisticalUtils.create_sampler(price_ranges, [r[2] for r in price_ranges]),
+            'shipping': StatisticalUtils.create_sampler(shipping_types, shipping_weights),
+            'payment': StatisticalUtils.create_sampler(payment_methods, payment_weights),
+            'size': {
+                gender: StatisticalUtils.create_sampler(Constants.SIZES, size_weights)
+                for gender, size_weights in Constants.SIZE_DISTRIBUTION.items()
+            },
+            'color': {
+                season: StatisticalUtils.create_sampler(color_preferences)
+                for season, color_preferences in season_color_preferences.items()
+            },
+            'review_rating': StatisticalUtils.build_review_rating_samplers()
+        }
+        
         # Ana veri yapısını oluşturma
-        return {
+        product_data = {
             'category_items': category_items,
             'category_weights': category_weights,
             'colors': colors,
@@ -581,10 +681,44 @@ class ProductModel:
             'payment_weights': payment_weights,
             'season_months': season_months,
             'holidays': holidays,
+            'day_weight_calendar': day_weight_calendar,
             'location_data': location_data,
             'seasonal_items': seasonal_items,
-            'climate_product_multipliers': climate_product_multipliers
+            'climate_product_multipliers': climate_product_multipliers,
+            'category_season_weights': category_season_weights,
+            'season_color_preferences': season_color_preferences,
+            'item_stats': item_stats,
+            'price_ranges': price_ranges,
+            'season_price_factors': season_price_factors,
+            'vocabularies': vocabularies,
+            'category_dtypes': category_dtypes,
+            'samplers': samplers
         }
+        
+        # Koşullu kategori/ürün dağılımları: tüm tanımlı bağlamlar (4 mevsim x 2 cinsiyet
+        # x 6 yaş grubu x 5 iklim) başlangıçta hesaplanır
+        conditional_distributions = ConditionalDistributionCache(product_data)
+        conditional_distributions.precompute()
+        product_data['conditional_distributions'] = conditional_distributions
+        
+        return product_data
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_product_data() -> Mapping[str, Any]:
+        """Model tablolarını bir kez oluşturup iç içe salt-okunur olarak döndürür.
+        
+        define_product_data her çağrıda tüm sözlükleri yeniden oluşturur. Bu
+        fonksiyon sonucu süreç boyunca önbellekte tutar; üreticiler bu nesneyi
+        paylaşır. Tablolar Utils.freeze ile tüm derinlikte dondurulur (sözlükler
+        MappingProxyType, listeler demet, diziler yazılamaz); değiştirilmeye
+        çalışılırsa TypeError/ValueError oluşur. Tek değişken parça,
+        tanımlı olmayan bağlamları ilk kullanımda ekleyen koşullu dağılım
+        önbelleğidir; o da dondurulmuş tabloları okur.
+        """
+        product_data = Utils.freeze(ProductModel.define_product_data())
+        product_data['conditional_distributions'].product_data = product_data
+        return product_data
     
     @staticmethod
     def calculate_category_weights(
@@ -651,3 +785,115 @@ class ProductModel:
         # StatisticalUtils'i kullanarak ağırlıkları normalize et
         from final_generate3 import StatisticalUtils
         return StatisticalUtils.normalize_weights(item_weights)
+
+
+class ConditionalDistributionCache:
+    """(mevsim, cinsiyet, yaş grubu, iklim) bağlamına göre koşullu dağılım önbelleği.
+    
+    calculate_category_weights ve calculate_item_weights yalnızca bağlama
+    bağlıdır; bu sınıf her bağlam için kategori ve ürün örnekleyicilerini bir
+    kez hesaplayıp saklar. Tanımlı olmayan bağlamlar (yeni iklim, yeni yaş
+    grubu) ilk kullanımda hesaplanır ve önbelleğe eklenir. maxsize verilirse
+    en uzun süre kullanılmayan bağlam önbellekten çıkarılır (LRU).
+    """
+    
+    def __init__(self, product_data: Dict[str, Any], maxsize: Optional[int] = None):
+        self.product_data = product_data
+        self.maxsize = maxsize
+        self._cache: 'OrderedDict[Tuple[str, Optional[str], Optional[str], str], DataTypes.ConditionalDistribution]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._cache)
+    
+    def __contains__(self, context: Tuple[str, Optional[str], Optional[str], str]) -> bool:
+        return context in self._cache
+    
+    def get(
+        self,
+        season: str,
+        gender: Optional[str],
+        age_group: Optional[str],
+        climate: str
+    ) -> DataTypes.ConditionalDistribution:
+        """Bağlam için dağılımları döndürür; önbellekte yoksa hesaplar."""
+        context = (season, gender, age_group, climate)
+        distribution = self._cache.get(context)
+        if distribution is not None:
+            self.hits += 1
+            if self.maxsize is not None:
+                self._cache.move_to_end(context)
+            return distribution
+        
+        self.misses += 1
+        distribution = self.compute(season, gender, age_group, climate)
+        self._cache[context] = distribution
+        if self.maxsize is not None and len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return distribution
+    
+    def compute(
+        self,
+        season: str,
+        gender: Optional[str],
+        age_group: Optional[str],
+        climate: str
+    ) -> DataTypes.ConditionalDistribution:
+        """Bağlam için kategori ve ürün dağılımlarını önbelleğe bakmadan hesaplar."""
+        from final_generate3 import StatisticalUtils
+        product_data = self.product_data
+        
+        # Yaş grubu kategori ağırlıklarında tanımlı değilse sadece mevsim ve cinsiyete göre seç
+        category_age = age_group if age_group in product_data['category_weights']['Age'] else None
+        category_weights = ProductModel.calculate_category_weights(
+            season, gender, category_age, product_data['category_season_weights'], product_data['category_weights']
+        )
+        
+        # Tanımlı olmayan iklimler için ılıman iklim çarpanları
+        climate_multipliers = product_data['climate_product_multipliers'].get(
+            climate, product_data['climate_product_multipliers']['temperate']
+        )
+        
+        item_samplers = {}
+        for category in category_weights:
+            items_in_category = list(product_data['category_items'][category].keys())
+            item_weights = ProductModel.calculate_item_weights(
+                items_in_category, category, season, gender, age_group, climate_multipliers, product_data
+            )
+            item_samplers[category] = StatisticalUtils.create_sampler(items_in_category, item_weights)
+        
+        return DataTypes.ConditionalDistribution(
+            category_sampler=StatisticalUtils.create_sampler(category_weights),
+            item_samplers=item_samplers
+        )
+    
+    def precompute(
+        self,
+        seasons: Optional[List[str]] = None,
+        genders: Optional[List[str]] = None,
+        age_groups: Optional[List[str]] = None,
+        climates: Optional[List[str]] = None
+    ) -> None:
+        """Verilen (varsayılan olarak tüm tanımlı) bağlamları önceden hesaplar."""
+        product_data = self.product_data
+        seasons = seasons if seasons is not None else product_data['seasons']
+        genders = genders if genders is not None else list(product_data['category_weights']['Gender'].keys())
+        age_groups = age_groups if age_groups is not None else list(Constants.AGE_GROUPS.values())
+        climates = climates if climates is not None else list(product_data['climate_product_multipliers'].keys())
+        
+        for season in seasons:
+            for gender in genders:
+                for age_group in age_groups:
+                    for climate in climates:
+                        self.get(season, gender, age_group, climate)
+    
+    def clear(self) -> None:
+        """Önbelleği boşaltır."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+    
+    def cache_info(self) -> Dict[str, Optional[int]]:
+        """Önbellek istatistiklerini döndürür."""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache), 'maxsize': self.maxsize}
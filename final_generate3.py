@@ -9,32 +9,141 @@ satın alma verileri üretimi için gerekli sınıfları içerir.
 - PurchaseGenerator: Satın alma verileri oluşturmak için ana sınıf
 """
 
-import pandas as pd
-import numpy as np
-import random
+from __future__ import annotations
+
 from datetime import datetime
-from typing import Dict, List, Tuple, Any, Union, Optional
+from typing import Dict, List, Tuple, Any, Union, Optional, Mapping
 
 # Diğer modüllerden gerekli sınıfları içe aktarma
-from final_generate1 import Constants, DataTypes, DateTimeUtils
+from final_generate1 import Constants, DataTypes, DateTimeUtils, CustomerStreams, lazy_import
 from final_generate2 import CustomerModel, LocationModel, SeasonModel, ProductModel
 
 
 # Utils sınıfını içe aktar
 from final_generate1 import Utils
 
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+
+class WeightedSampler:
+    """Bir kez kurulan, tekrar tekrar kullanılabilen ağırlıklı örnekleyici.
+    
+    Ağırlıklar kurulumda normalize edilip kümülatif toplama çevrilir; her
+    çekim tek bir np.searchsorted çağrısıdır. k adet örnek tek seferde
+    NumPy dizisi olarak çekilebilir. rng verilmeyen çekimler paylaşılan
+    Utils.default_rng() üretecini kullanır.
+    """
+    
+    def __init__(self, choices: Union[List[Any], Dict[Any, float]], weights: Optional[Union[List[float], Dict[Any, float]]] = None):
+        """Seçenekler ve ağırlıklarla örnekleyiciyi kurar.
+        
+        Args:
+            choices: Seçenek listesi veya {seçenek: ağırlık} sözlüğü
+            weights: Ağırlık listesi veya sözlüğü (choices sözlükse gerekmez)
+        """
+        if isinstance(choices, Mapping):
+            weights = list(choices.values())
+            choices = list(choices.keys())
+        elif isinstance(weights, Mapping):
+            choices = list(weights.keys())
+            weights = [weights[c] for c in choices]
+        elif weights is None:
+            weights = [1.0] * len(choices)
+        
+        if len(choices) == 0 or len(choices) != len(weights):
+            raise ValueError("Seçenek ve ağırlık sayıları eşit ve sıfırdan büyük olmalıdır.")
+        
+        self.choices = tuple(choices)
+        
+        # Seçenekleri dizi olarak tut (demet gibi seçenekler için object dizisi)
+        values = np.asarray(self.choices) if not isinstance(self.choices[0], tuple) else None
+        if values is None or values.ndim != 1:
+            values = np.empty(len(self.choices), dtype=object)
+            values[:] = self.choices
+        self.values = values
+        
+        weight_array = np.asarray(weights, dtype=np.float64)
+        total_weight = weight_array.sum()
+        if total_weight > 0:
+            self.probabilities = weight_array / total_weight
+        else:
+            # Eğer tüm ağırlıklar sıfırsa, eşit dağılım kullan
+            self.probabilities = np.full(len(weight_array), 1.0 / len(weight_array))
+        self.cumulative = np.cumsum(self.probabilities)
+        self.cumulative[-1] = 1.0
+        
+        # Örnekleyiciler önbellekteki model nesnesinde paylaşılır; durumları salt okunurdur
+        for array in (self.values, self.probabilities, self.cumulative):
+            array.flags.writeable = False
+    
+    def __len__(self) -> int:
+        return len(self.choices)
+    
+    def pick_indices(self, uniforms: np.ndarray) -> np.ndarray:
+        """[0, 1) aralığındaki hazır düzgün sayıları seçenek indekslerine çevirir."""
+        return np.searchsorted(self.cumulative, uniforms, side='right')
+    
+    def pick(self, uniforms: np.ndarray) -> np.ndarray:
+        """[0, 1) aralığındaki hazır düzgün sayıları seçeneklere çevirir (bkz. CustomerStreams)."""
+        return self.values[self.pick_indices(uniforms)]
+    
+    def pick_codes(self, uniforms: np.ndarray, dtype: pd.CategoricalDtype) -> np.ndarray:
+        """Hazır düzgün sayıları seçeneklerin dtype sözlüğündeki kodlarına çevirir (sözlükte yoksa -1)."""
+        return dtype.categories.get_indexer(self.values)[self.pick_indices(uniforms)]
+    
+    def sample_indices(self, k: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """k adet seçenek indeksi çeker."""
+        rng = rng if rng is not None else Utils.default_rng()
+        return self.pick_indices(rng.random(k))
+    
+    def sample(self, k: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """k adet seçeneği NumPy dizisi olarak çeker."""
+        return self.values[self.sample_indices(k, rng)]
+    
+    def draw(self, rng: Optional[np.random.Generator] = None) -> Any:
+        """Tek bir seçenek çeker."""
+        rng = rng if rng is not None else Utils.default_rng()
+        return self.choices[int(np.searchsorted(self.cumulative, rng.random(), side='right'))]
+
+
 class StatisticalUtils:
     """İstatistiksel fonksiyonlar ve veri üretici araçlar."""
     
     @staticmethod
-    def weighted_choice(choices: List[Any], weights: Union[List[float], Dict[Any, float]]) -> Any:
+    def create_sampler(
+        choices: Union[List[Any], Dict[Any, float]],
+        weights: Optional[Union[List[float], Dict[Any, float]]] = None
+    ) -> WeightedSampler:
+        """Aynı ağırlık dağılımından çok sayıda çekim için yeniden kullanılabilir örnekleyici oluşturur.
+        
+        weighted_choice her çağrıda ağırlık listesini yeniden kurar; sabit
+        dağılımlar için bir kez kurulan örnekleyici ile bütün bir sütun tek
+        çağrıda çekilebilir:
+        
+            sampler = StatisticalUtils.create_sampler(product_data['shipping_weights'])
+            shipping_types = sampler.sample(len(df), np.random.default_rng(seed))
+        
+        rng verilmeyen çekimler paylaşılan Utils.default_rng() üretecinden
+        yapılır; ardışık çekimler farklıdır, çalıştırmanın tamamı ise aynı
+        seed ile yeniden üretilebilir.
+        """
+        return WeightedSampler(choices, weights)
+    
+    @staticmethod
+    def weighted_choice(
+        choices: List[Any],
+        weights: Union[List[float], Dict[Any, float]],
+        rng: Optional[np.random.Generator] = None
+    ) -> Any:
         """Ağırlıklı rastgele seçim yapar."""
-        if isinstance(weights, dict):
-            items = list(weights.keys())
-            weights_list = [weights[item] for item in items]
-            return random.choices(items, weights=weights_list, k=1)[0]
-        else:
-            return random.choices(choices, weights=weights, k=1)[0]
+        rng = rng if rng is not None else Utils.default_rng()
+        if isinstance(weights, Mapping):
+            choices = list(weights.keys())
+            weights = [weights[item] for item in choices]
+        cumulative = np.cumsum(weights)
+        index = int(np.searchsorted(cumulative, rng.random() * cumulative[-1], side='right'))
+        return choices[min(index, len(choices) - 1)]
     
     @staticmethod
     def normalize_weights(weights: Dict[str, float]) -> Dict[str, float]:
@@ -42,49 +151,13 @@ class StatisticalUtils:
         # Utils sınıfındaki normalize_weights metodunu kullan
         return Utils.normalize_weights(weights)
     
-    @staticmethod
-    def generate_skewed_normal(
-        mean: float, 
-        std_dev: float, 
-        min_value: float, 
-        max_value: float, 
-        alpha: float = 5,
-        age: Optional[int] = None, 
-        gender: Optional[str] = None
-    ) -> float:
-        """
-        Sağa çarpık normal dağılım oluşturur.
-        Yaş ve cinsiyet parametreleri ile korelasyon eklenir.
-        """
-        # Temel değeri hesaplama
-        k = (alpha / std_dev) ** 2  # şekil parametresi
-        theta = std_dev ** 2 / alpha  # ölçek parametresi
-        
-        # Gamma dağılımından değer üretme ve kaydırma
-        value = np.random.gamma(k, theta) + (mean - alpha)
-        
-        # Yaş bazlı etki ekleme (yaşa göre artan fiyat eğilimi)
-        if age is not None:
-            # Yaş etkisi: 18-70 yaş aralığında
-            age_factor = (age - 18) / 52  # Normalize edilmiş yaş faktörü (0-1 arası)
-            value += age_factor * 10  # Yaşla birlikte maksimum 10$ artış
-        
-        # Cinsiyet bazlı etki ekleme (erkekler ortalama 10$ daha fazla)
-        if gender == "Male":
-            value += 10.0
-        
-        # Minimum ve maksimum sınırlarını uygulama
-        value = max(min_value, min(value, max_value))
-        
-        # 2 ondalık basamağa yuvarlama
-        return round(value, 2)
-    
     @staticmethod
     def generate_review_rating(
         category: Optional[str] = None, 
         item: Optional[str] = None,
         purchase_amount: Optional[float] = None, 
-        season: Optional[str] = None
+        season: Optional[str] = None,
+        rng: Optional[np.random.Generator] = None
     ) -> float:
         """
         Müşteri değerlendirme puanı üretir (gerçekçi J-curve dağılımı ile).
@@ -97,12 +170,38 @@ class StatisticalUtils:
         Bu fonksiyon ayrıca ürün kategorisi, öğe, fiyat ve sezona dayalı 
         faktörleri de hesaba katar.
         """
+        factors = StatisticalUtils.review_rating_factors(category, item, purchase_amount)
+        rating_weights = StatisticalUtils.review_rating_weights(factors)
+        
+        # Ağırlıkları normalize etme - kendi normalize_weights fonksiyonunu kullan
+        normalized_weights = StatisticalUtils.normalize_weights(rating_weights)
+        
+        # Sonuç değerini döndürme
+        return StatisticalUtils.weighted_choice(list(normalized_weights.keys()), normalized_weights, rng)
+    
+    @staticmethod
+    def review_rating_factors(
+        category: Optional[str] = None,
+        item: Optional[str] = None,
+        purchase_amount: Optional[float] = None
+    ) -> DataTypes.ReviewRatingFactors:
+        """Bir alışverişin değerlendirme puanı dağılımını belirleyen faktör kodlarını döndürür."""
+        if not (category and item and purchase_amount is not None):
+            return DataTypes.ReviewRatingFactors(0, 0, 0)
+        price_bucket = 3 if purchase_amount > 80 else 1 if purchase_amount < 30 else 2
+        category_class = {'Accessories': 1, 'Footwear': 2}.get(category, 0)
+        item_class = 1 if item in Constants.REVIEW_CRITICAL_ITEMS else 2 if item in Constants.REVIEW_SIMPLE_ITEMS else 0
+        return DataTypes.ReviewRatingFactors(price_bucket, category_class, item_class)
+    
+    @staticmethod
+    def review_rating_weights(factors: DataTypes.ReviewRatingFactors) -> Dict[float, float]:
+        """Faktör kodlarına göre (normalize edilmemiş) değerlendirme puanı ağırlıklarını hesaplar."""
         # Temel değerlendirme ağırlıkları
         rating_weights = Constants.REVIEW_BASE_WEIGHTS.copy()
         
-        if category and item and purchase_amount is not None:
+        if factors.price_bucket:
             # Yüksek fiyatlı ürünler için daha polarize değerlendirmeler
-            if purchase_amount > 80:
+            if factors.price_bucket == 3:
                 rating_weights[5.0] *= 1.1  # Yüksek fiyatlı ürünlerde 5 yıldız oranı artar
                 rating_weights[1.0] *= 1.2  # Ancak 1 yıldız oranı daha fazla artar (yüksek beklenti)
                 # Orta değerleri azalt
@@ -110,7 +209,7 @@ class StatisticalUtils:
                     rating_weights[rating] *= 0.9
             
             # Düşük fiyatlı ürünler genelde daha ılımlı değerlendirmelere sahiptir
-            elif purchase_amount < 30:
+            elif factors.price_bucket == 1:
                 # Uç değerleri azalt
                 rating_weights[5.0] *= 0.9
                 rating_weights[1.0] *= 0.85
@@ -119,13 +218,13 @@ class StatisticalUtils:
                     rating_weights[rating] *= 1.15
                     
             # Kategori bazlı ayarlamalar
-            if category == 'Accessories':
+            if factors.category_class == 1:
                 # Aksesuarlar genellikle daha yüksek puanlar alır
                 rating_weights[5.0] *= 1.05
                 rating_weights[4.5] *= 1.05
                 rating_weights[1.0] *= 0.9
             
-            elif category == 'Footwear':
+            elif factors.category_class == 2:
                 # Ayakkabılar daha çok uç değerlendirmeler alır (ya uyar ya uymaz)
                 rating_weights[5.0] *= 1.1
                 rating_weights[1.0] *= 1.15
@@ -134,14 +233,14 @@ class StatisticalUtils:
                     rating_weights[rating] *= 0.85
             
             # Bazı özel ürünler için ayarlamalar
-            if item in ['Suit', 'Dress', 'Heels', 'Boots']:
+            if factors.item_class == 1:
                 # Bu ürünler daha yüksek beklentilerle satın alındığından
                 # daha kritik değerlendirmelere tabi olabilir
                 rating_weights[1.0] *= 1.2
                 rating_weights[1.5] *= 1.1
                 rating_weights[5.0] *= 0.95
             
-            elif item in ['Socks', 'T-Shirt', 'Gloves']:
+            elif factors.item_class == 2:
                 # Basit ürünlerde daha az uç değerlendirme olur
                 rating_weights[1.0] *= 0.85
                 rating_weights[5.0] *= 0.95
@@ -149,59 +248,187 @@ class StatisticalUtils:
                 for rating in [3.0, 3.5, 4.0]:
                     rating_weights[rating] *= 1.1
         
-        # Ağırlıkları normalize etme - kendi normalize_weights fonksiyonunu kullan
-        normalized_weights = StatisticalUtils.normalize_weights(rating_weights)
-        
-        # Sonuç değerini döndürme
-        return StatisticalUtils.weighted_choice(list(normalized_weights.keys()), normalized_weights)
+        return rating_weights
     
     @staticmethod
-    def generate_random_seasons(seasons: List[str], num_purchases: int) -> List[str]:
-        """Alışveriş sayısına göre mevsim listesi oluşturur."""
-        # Mevsim ağırlıkları (toplum için)
-        season_weights = {
-            'Winter': 0.25,  # Kış ve yaz hafif daha yüksek, tatil sezonu ve yaz aktiviteleri nedeniyle
-            'Spring': 0.20,
-            'Summer': 0.30,
-            'Fall': 0.25
+    def build_review_rating_samplers() -> Dict[DataTypes.ReviewRatingFactors, 'WeightedSampler']:
+        """Tüm faktör kombinasyonları için değerlendirme puanı örnekleyicilerini hazırlar (4 x 3 x 3)."""
+        return {
+            factors: StatisticalUtils.create_sampler(
+                StatisticalUtils.normalize_weights(StatisticalUtils.review_rating_weights(factors))
+            )
+            for factors in (
+                DataTypes.ReviewRatingFactors(price_bucket, category_class, item_class)
+                for price_bucket in range(4) for category_class in range(3) for item_class in range(3)
+            )
         }
-            
-        # Müşteri tercihi - bazı müşteriler belirli mevsimlerde daha aktif olabilir
-        preference_factor = random.random()  # 0-1 arası rastgele değer
-            
-        # Müşteri tercihine göre ağırlıkları ayarlama
-        if preference_factor < 0.25:  # Kış alışverişçisi
-            season_weights = {
+    
+    @staticmethod
+    def generate_review_ratings(
+        categories: np.ndarray,
+        items: np.ndarray,
+        purchase_amounts: np.ndarray,
+        product_data: Optional[Dict[str, Any]] = None,
+        rng: Optional[np.random.Generator] = None,
+        uniforms: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """generate_review_rating'in dizi sürümü.
+        
+        Satırlar faktör kodlarına (fiyat aralığı, kategori sınıfı, ürün sınıfı)
+        göre gruplanır ve her grup için önceden hesaplanmış dağılımdan tek
+        seferde örnekleme yapılır. Dağılım satır bazlı fonksiyonla aynıdır.
+        uniforms (satır başına bir düzgün sayı) verilirse rng kullanılmaz.
+        """
+        if uniforms is None:
+            uniforms = (rng if rng is not None else Utils.default_rng()).random(len(purchase_amounts))
+        samplers = (
+            product_data['samplers']['review_rating'] if product_data is not None
+            else StatisticalUtils.build_review_rating_samplers()
+        )
+        
+        # Faktör kodları
+        amounts = np.asarray(purchase_amounts, dtype=np.float64)
+        # pd.Categorical girdiler kodları üzerinden eşlenir, metne çevrilmez
+        categories = pd.Series(categories, dtype=None if isinstance(categories, pd.Categorical) else object)
+        items = pd.Series(items, dtype=None if isinstance(items, pd.Categorical) else object)
+        known = (categories.notna() & categories.ne('') & items.notna() & items.ne('')).to_numpy() & ~np.isnan(amounts)
+        price_buckets = np.where(known, np.where(amounts > 80, 3, np.where(amounts < 30, 1, 2)), 0)
+        category_classes = categories.map({'Accessories': 1, 'Footwear': 2}).astype(np.float64).fillna(0).to_numpy(dtype=np.int64)
+        item_classes = items.map(
+            {**{item: 1 for item in Constants.REVIEW_CRITICAL_ITEMS}, **{item: 2 for item in Constants.REVIEW_SIMPLE_ITEMS}}
+        ).astype(np.float64).fillna(0).to_numpy(dtype=np.int64)
+        category_classes = np.where(known, category_classes, 0)
+        item_classes = np.where(known, item_classes, 0)
+        group_codes = (price_buckets * 3 + category_classes) * 3 + item_classes
+        
+        ratings = np.empty(len(amounts), dtype=np.float64)
+        for group_code in np.unique(group_codes):
+            group_rows = np.flatnonzero(group_codes == group_code)
+            factors = DataTypes.ReviewRatingFactors(group_code // 9, group_code // 3 % 3, group_code % 3)
+            ratings[group_rows] = samplers[factors].pick(uniforms[group_rows])
+        return ratings
+    
+    @staticmethod
+    def define_season_preferences() -> List[Tuple[float, Dict[str, float]]]:
+        """Müşteri mevsim tercih profillerini tanımlar.
+        
+        Her profil (üst eşik, mevsim ağırlıkları) çiftidir; müşterinin 0-1 arası
+        tercih faktörü eşikten küçük olan ilk profil seçilir.
+        """
+        return [
+            # Kış alışverişçisi
+            (0.25, {
                 'Winter': 0.4,
                 'Spring': 0.2,
                 'Summer': 0.15,
                 'Fall': 0.25
-            }
-        elif preference_factor < 0.5:  # Yaz alışverişçisi
-            season_weights = {
+            }),
+            # Yaz alışverişçisi
+            (0.5, {
                 'Winter': 0.15,
                 'Spring': 0.25,
                 'Summer': 0.45,
                 'Fall': 0.15
-            }
-        elif preference_factor < 0.75:  # İlkbahar alışverişçisi
-            season_weights = {
+            }),
+            # İlkbahar alışverişçisi
+            (0.75, {
                 'Winter': 0.15,
                 'Spring': 0.45,
                 'Summer': 0.25,
                 'Fall': 0.15
-            }
-        # Diğer durumda orijinal ağırlıkları kullan
-            
-        # Her alışveriş için ağırlıklara göre mevsim seçimi - kendi weighted_choice fonksiyonunu kullan
-        return [StatisticalUtils.weighted_choice(seasons, season_weights) for _ in range(num_purchases)]
+            }),
+            # Mevsim ağırlıkları (toplum için)
+            (1.0, {
+                'Winter': 0.25,  # Kış ve yaz hafif daha yüksek, tatil sezonu ve yaz aktiviteleri nedeniyle
+                'Spring': 0.20,
+                'Summer': 0.30,
+                'Fall': 0.25
+            })
+        ]
+    
+    @staticmethod
+    def generate_random_seasons(
+        seasons: List[str],
+        num_purchases: int,
+        rng: Optional[np.random.Generator] = None
+    ) -> List[str]:
+        """Alışveriş sayısına göre mevsim listesi oluşturur."""
+        rng = rng if rng is not None else Utils.default_rng()
+        
+        # Müşteri tercihi - bazı müşteriler belirli mevsimlerde daha aktif olabilir
+        preference_factor = rng.random()  # 0-1 arası rastgele değer
+        
+        # Müşteri tercihine göre ağırlıkları ayarlama
+        for threshold, season_weights in StatisticalUtils.define_season_preferences():
+            if preference_factor < threshold:
+                break
+        
+        # Tüm alışverişler için mevsimleri tek seferde çek
+        season_sampler = StatisticalUtils.create_sampler(seasons, season_weights)
+        return season_sampler.sample(num_purchases, rng).tolist()
 
 
 class PurchaseGenerator:
     """Satın alma verisi oluşturma işlemleri."""
     
+    # Sütun bazlı üretimde ürün detayları için satır başına düzgün sayı sayısı:
+    # kategori, ürün, fiyat aralığı, fiyat, renk, beden, değerlendirme, gönderim, ödeme
+    DETAIL_DRAWS = 9
+    
     @staticmethod
-    def adjust_last_purchase_dates(all_purchases: List[List[Any]], customer_id_index: int, date_index: int) -> List[List[Any]]:
+    def assign_last_purchase_years(
+        customer_ids: List[Any],
+        rng: Optional[np.random.Generator] = None,
+        streams: Optional[CustomerStreams] = None
+    ) -> Dict[Any, int]:
+        """Son alışverişi 2022'de (%5) ve 2023'te (%11) olacak müşterileri belirler.
+        
+        streams verilirse her müşterinin yılı kendi akışından bağımsız olarak
+        belirlenir (oranlar beklenen değer olarak tutar); böylece seçim müşteri
+        kümesinin geri kalanına bağlı değildir. Aksi halde müşteriler rng ile
+        karıştırılıp oranlar tam olarak uygulanır.
+        
+        Args:
+            customer_ids: Alışverişi olan müşterilerin kimlikleri
+            rng: Rastgele sayı üreteci (streams verilmezse; o da verilmezse Utils.default_rng() kullanılır)
+            streams: Müşteri bazlı rastgele akışlar
+            
+        Returns:
+            Müşteri kimliği -> son alışveriş yılı eşlemesi (yalnızca seçilen müşteriler)
+        """
+        if streams is not None:
+            customer_ids = np.asarray(list(customer_ids))
+            years = PurchaseGenerator.last_purchase_year_array(customer_ids, streams)
+            selected = np.flatnonzero(years > 0)
+            return dict(zip(customer_ids[selected].tolist(), years[selected].tolist()))
+        
+        # Tüm müşterilerin listesini alalım ve karıştıralım
+        rng = rng if rng is not None else Utils.default_rng()
+        customer_ids = list(customer_ids)
+        customer_ids = [customer_ids[i] for i in rng.permutation(len(customer_ids))]
+        
+        # Son alışverişi 2022'de olacak müşteri sayısı (%5)
+        customers_2022_count = int(len(customer_ids) * 0.05)
+        
+        # Son alışverişi 2023'de olacak müşteri sayısı (%11)
+        customers_2023_count = int(len(customer_ids) * 0.11)
+        
+        last_purchase_years = {customer_id: 2022 for customer_id in customer_ids[:customers_2022_count]}
+        last_purchase_years.update({
+            customer_id: 2023
+            for customer_id in customer_ids[customers_2022_count:customers_2022_count + customers_2023_count]
+        })
+        return last_purchase_years
+    
+    @staticmethod
+    def adjust_last_purchase_dates(
+        all_purchases: List[List[Any]],
+        customer_id_index: int,
+        date_index: int,
+        last_purchase_years: Optional[Dict[Any, int]] = None,
+        rng: Optional[np.random.Generator] = None,
+        streams: Optional[CustomerStreams] = None
+    ) -> List[List[Any]]:
         """Müşterilerin son alışveriş tarihlerini istenen oranlara göre düzenler.
         
         Bu fonksiyon, müşterilerin belirli bir oranının son alışverişi 2022'de,
@@ -211,6 +438,10 @@ class PurchaseGenerator:
             all_purchases: Tüm alışveriş verileri
             customer_id_index: Customer ID'nin bulunduğu sütun indeksi
             date_index: Satın alma tarihinin bulunduğu sütun indeksi
+            last_purchase_years: assign_last_purchase_years sonucu; verilirse müşteri
+                seçimi yeniden yapılmaz (parça parça işlemede tüm müşteriler için bir kez hesaplanır)
+            rng: Rastgele sayı üreteci (streams verilmezse; o da verilmezse Utils.default_rng() kullanılır)
+            streams: Müşteri bazlı rastgele akışlar; verilirse yeni tarihler müşterinin akışından çekilir
             
         Returns:
             Düzenlenmiş alışveriş verileri
@@ -225,19 +456,23 @@ class PurchaseGenerator:
                 customer_purchases[customer_id] = []
             customer_purchases[customer_id].append(purchase)
         
-        # Tüm müşterilerin listesini alalım ve karıştıralım
-        customer_ids = list(customer_purchases.keys())
-        random.shuffle(customer_ids)
-        
-        # Son alışverişi 2022'de olacak müşteri sayısı (%5)
-        customers_2022_count = int(len(customer_ids) * 0.05)
-        
-        # Son alışverişi 2023'de olacak müşteri sayısı (%11)
-        customers_2023_count = int(len(customer_ids) * 0.11)
-        
         # Müşteri gruplarını belirle
-        customers_2022 = customer_ids[:customers_2022_count]
-        customers_2023 = customer_ids[customers_2022_count:customers_2022_count+customers_2023_count]
+        if last_purchase_years is None:
+            last_purchase_years = PurchaseGenerator.assign_last_purchase_years(
+                list(customer_purchases.keys()), rng, streams
+            )
+        customers_2022 = [cid for cid, year in last_purchase_years.items() if year == 2022 and cid in customer_purchases]
+        customers_2023 = [cid for cid, year in last_purchase_years.items() if year == 2023 and cid in customer_purchases]
+        
+        # Yeni tarihler için müşteri başına iki düzgün sayı (ay ve gün)
+        selected_customers = customers_2022 + customers_2023
+        if streams is not None:
+            date_uniforms = streams.uniforms(
+                np.asarray(selected_customers, dtype=np.int64), 0, CustomerStreams.LAST_PURCHASE, num_draws=3
+            )[:, 1:]
+        else:
+            date_uniforms = (rng if rng is not None else Utils.default_rng()).random((len(selected_customers), 2))
+        date_uniforms = dict(zip(selected_customers, date_uniforms))
         
         # Her müşterinin son alışveriş tarihini düzenle
         for customer_id in customers_2022:
@@ -252,8 +487,9 @@ class PurchaseGenerator:
             # Eğer tarih 2022'den sonra ise, 2022'ye ayarla
             if purchase_date.year > 2022:
                 # 2022'de rastgele bir tarih seç (Kasım veya Aralık ayı)
-                month = random.choice([11, 12])
-                day = random.randint(1, 28 if month == 2 else 30 if month in [4, 6, 9, 11] else 31)
+                month_uniform, day_uniform = date_uniforms[customer_id]
+                month = 11 + int(month_uniform * 2)
+                day = 1 + int(day_uniform * (28 if month == 2 else 30 if month in [4, 6, 9, 11] else 31))
                 new_date = datetime(2022, month, day)
                 
                 # Yeni tarihi güncelle
@@ -271,8 +507,9 @@ class PurchaseGenerator:
             # Eğer tarih 2023'ten önce veya sonra ise, 2023'e ayarla
             if purchase_date.year != 2023:
                 # 2023'te rastgele bir tarih seç
-                month = random.randint(1, 12)
-                day = random.randint(1, 28 if month == 2 else 30 if month in [4, 6, 9, 11] else 31)
+                month_uniform, day_uniform = date_uniforms[customer_id]
+                month = 1 + int(month_uniform * 12)
+                day = 1 + int(day_uniform * (28 if month == 2 else 30 if month in [4, 6, 9, 11] else 31))
                 new_date = datetime(2023, month, day)
                 
                 # Yeni tarihi güncelle
@@ -285,107 +522,162 @@ class PurchaseGenerator:
         
         return adjusted_purchases
     
+    @staticmethod
+    def last_purchase_year_array(customer_ids: np.ndarray, streams: CustomerStreams) -> np.ndarray:
+        """assign_last_purchase_years'ın akış tabanlı, dizi döndüren sürümü.
+        
+        Returns:
+            customer_ids ile hizalı son alışveriş yılları; seçilmeyen müşteriler için 0
+        """
+        if not len(customer_ids):
+            return np.zeros(0, dtype=np.int64)
+        uniforms = streams.uniforms(customer_ids, 0, CustomerStreams.LAST_PURCHASE)[:, 0]
+        return np.where(uniforms < 0.05, 2022, np.where(uniforms < 0.16, 2023, 0))
+    
+    @staticmethod
+    def adjust_last_purchase_dates_columnar(
+        purchases: pd.DataFrame,
+        last_purchase_years: Optional[Dict[Any, int]] = None,
+        rng: Optional[np.random.Generator] = None,
+        streams: Optional[CustomerStreams] = None
+    ) -> pd.DataFrame:
+        """adjust_last_purchase_dates'in sütun bazlı karşılığı.
+        
+        Tarihler gün sıralarıyla (epoch'tan bu yana gün) işlenir ve satırlar
+        müşteriye göre kararlı biçimde sıralanır. Her müşterinin son alışverişi
+        (gün sırası, satır konumu) anahtarının np.maximum.reduceat ile bulunan
+        en büyüğüdür; seçilen müşterilerin son alışveriş tarihleri toplu olarak
+        yeniden yazılır. Müşteri başına liste oluşturulmaz ve karşılaştırma
+        sırasında tarih metni ayrıştırılmaz.
+        
+        Sonuç adjust_last_purchase_dates ile aynıdır: satırlar müşterilerin ilk
+        görüldüğü sırayla gruplanır, müşteri içindeki sıra korunur. 'Purchase
+        Date' girişte gün sırası, datetime veya metin olabilir; çıkışta int32
+        gün sırasıdır (bkz. DateTimeUtils.ordinal_column).
+        
+        Args:
+            purchases: 'Customer ID' ve 'Purchase Date' sütunlu alışveriş tablosu
+            last_purchase_years: assign_last_purchase_years sonucu; verilmezse burada hesaplanır
+                (streams ile müşteri sırasıyla hizalı bir dizi olarak, bkz. last_purchase_year_array)
+            rng: Rastgele sayı üreteci (streams verilmezse; o da verilmezse Utils.default_rng() kullanılır)
+            streams: Müşteri bazlı rastgele akışlar
+        
+        Returns:
+            Düzenlenmiş alışveriş tablosu
+        """
+        if purchases.empty:
+            return purchases.reset_index(drop=True)
+        
+        # Satırları müşterilerin ilk görüldüğü sıraya göre kararlı biçimde grupla
+        customer_codes, customer_ids = pd.factorize(purchases['Customer ID'])
+        order = np.argsort(customer_codes, kind='stable')
+        purchases = purchases.iloc[order].reset_index(drop=True)
+        customer_codes = customer_codes[order]
+        
+        ordinals = DateTimeUtils.date_ordinals(purchases['Purchase Date'])
+        
+        # Her müşterinin son alışverişi: eşit tarihlerde müşteri içindeki son satır
+        num_rows = len(purchases)
+        group_starts = np.flatnonzero(np.r_[True, customer_codes[1:] != customer_codes[:-1]])
+        last_keys = np.maximum.reduceat(ordinals * num_rows + np.arange(num_rows), group_starts)
+        last_rows = last_keys - (last_keys // num_rows) * num_rows
+        
+        if last_purchase_years is None and streams is not None:
+            # Yıllar yalnızca müşterinin kendi akışına bağlıdır; eşleme kurulmaz
+            customer_years = PurchaseGenerator.last_purchase_year_array(customer_ids.to_numpy(), streams)
+            selected = np.flatnonzero(customer_years > 0)
+            target_ids = customer_ids.to_numpy()[selected]
+            years = customer_years[selected]
+            rows = last_rows[selected]
+        else:
+            # Müşteri grupları: önce 2022, sonra 2023 (assign_last_purchase_years sırasıyla)
+            if last_purchase_years is None:
+                last_purchase_years = PurchaseGenerator.assign_last_purchase_years(customer_ids.tolist(), rng, streams)
+            target_years = pd.Series(last_purchase_years, dtype=np.int64)
+            target_years = target_years[target_years.index.isin(customer_ids)]
+            target_years = pd.concat([target_years[target_years == 2022], target_years[target_years == 2023]])
+            target_ids = target_years.index.to_numpy()
+            years = target_years.to_numpy()
+            rows = last_rows[customer_ids.get_indexer(target_years.index)]
+        if not len(years):
+            return purchases
+        
+        # Yeni tarihler için müşteri başına iki düzgün sayı (ay ve gün)
+        if streams is not None:
+            date_uniforms = streams.uniforms(
+                target_ids.astype(np.int64), 0, CustomerStreams.LAST_PURCHASE, num_draws=3
+            )[:, 1:]
+        else:
+            date_uniforms = (rng if rng is not None else Utils.default_rng()).random((len(years), 2))
+        
+        last_years = DateTimeUtils.ordinal_parts(ordinals[rows])[0]
+        
+        # 2022: Kasım veya Aralık'ta rastgele bir gün; 2023: yılın herhangi bir günü
+        months = np.where(years == 2022, 11 + (date_uniforms[:, 0] * 2).astype(np.int64),
+                          1 + (date_uniforms[:, 0] * 12).astype(np.int64))
+        month_lengths = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+        days = 1 + (date_uniforms[:, 1] * month_lengths[months - 1]).astype(np.int64)
+        new_dates = (
+            (years - 1970).astype('datetime64[Y]').astype('datetime64[M]') + (months - 1)
+        ).astype('datetime64[D]') + (days - 1)
+        
+        # Yalnızca son alışverişi hedef yılda olmayanlar güncellenir
+        changed = np.where(years == 2022, last_years > 2022, last_years != 2023)
+        ordinals[rows[changed]] = new_dates[changed].astype(np.int64)
+        purchases['Purchase Date'] = DateTimeUtils.ordinal_column(ordinals)
+        return purchases
+    
     @staticmethod
     def generate_purchase_details_for_season(
         season: str, 
         product_data: Dict[str, Any], 
         gender: Optional[str] = None, 
         age: Optional[str] = None, 
-        location: Optional[str] = None
+        location: Optional[str] = None,
+        rng: Optional[np.random.Generator] = None
     ) -> DataTypes.PurchaseDetails:
-        """Belirli bir mevsim için uygun ürün detayları oluşturur."""
-        # Kategori ağırlıkları
-        category_season_weights = SeasonModel.define_category_season_weights()
+        """Belirli bir mevsim için uygun ürün detayları oluşturur.
         
-        # Ürün istatistikleri
-        item_stats = ProductModel.define_item_stats()
-        
-        # Mevsime uygun renk ağırlıkları
-        season_color_preferences = SeasonModel.define_season_color_preferences()
-        
-        # Lokasyon bazlı iklim çarpanlarını belirleme
-        climate_multipliers = LocationModel.get_climate_multipliers(location, product_data)
-        
-        # Kategori seçimi için ağırlıkları hesaplama ve kategori seçimi
-        category_weights = ProductModel.calculate_category_weights(
-            season, gender, age, category_season_weights, product_data['category_weights']
-        )
-        category = StatisticalUtils.weighted_choice(list(category_weights.keys()), category_weights)
-        
-        # Kategoriye özgü ürünler
-        items_in_category = list(product_data['category_items'][category].keys())
-        
-        # Ürün seçimi için ağırlıkları hesaplama ve ürün seçimi
-        item_weights = ProductModel.calculate_item_weights(
-            items_in_category, category, season, gender, age, climate_multipliers, product_data
-        )
-        item = StatisticalUtils.weighted_choice(items_in_category, item_weights)
+        Sabit model tabloları ve örnekleyiciler product_data içinden okunur
+        (bkz. ProductModel.get_product_data); satır başına yeniden oluşturulmaz.
+        """
+        rng = rng if rng is not None else Utils.default_rng()
+        samplers = product_data['samplers']
         
-        # Seçilen ürüne göre istatistikleri alma
-        item_stat = item_stats.get(
-            item, {'mean': 59.764, 'std_dev': 23.685, 'min': 20.00, 'max': 100.00}
-        )
+        # Bağlama (mevsim, cinsiyet, yaş grubu, iklim) göre hazır dağılımlar
+        climate = LocationModel.get_climate(location, product_data)
+        distribution = product_data['conditional_distributions'].get(season, gender, age, climate)
         
-        # Belirtilen fiyat dağılımına göre fiyat üretimi
-        # 20-30$ aralığında: %15
-        # 31-50$ aralığında: %40
-        # 51-65$ aralığında: %25
-        # 66-80$ aralığında: %12
-        # 81-100$ aralığında: %8
-        # Ağırlıkları biraz ayarlayarak istenen dağılıma daha yakın sonuçlar elde edelim
-        price_ranges = [
-            (20, 30, 0.18),  # Biraz artırıldı
-            (31, 50, 0.42),  # Biraz artırıldı
-            (51, 65, 0.25),  # Aynı kaldı
-            (66, 80, 0.10),  # Biraz azaltıldı
-            (81, 100, 0.05)  # Biraz azaltıldı
-        ]
+        # Kategori ve ürün seçimi
+        category = distribution.category_sampler.draw(rng)
+        item = distribution.item_samplers[category].draw(rng)
         
-        # Rastgele bir fiyat aralığı seç
-        selected_range = StatisticalUtils.weighted_choice(
-            price_ranges, 
-            [r[2] for r in price_ranges]
-        )
+        # Rastgele bir fiyat aralığı seç (bkz. ProductModel.define_price_ranges)
+        min_price, max_price, _ = samplers['price_range'].draw(rng)
         
         # Seçilen aralıkta rastgele bir fiyat üret
-        min_price, max_price, _ = selected_range
-        purchase_amount = round(random.uniform(min_price, max_price), 2)
+        purchase_amount = round(rng.uniform(min_price, max_price), 2)
         
-        # Mevsimsel faktörler ekleme - kış aylarında daha yüksek fiyatlar
-        if season == 'Winter':
-            purchase_amount = min(purchase_amount * 1.08, 100.0)  # Kış ürünleri genelde daha pahalı
-        elif season == 'Summer':
-            purchase_amount = purchase_amount * 0.92  # Yaz ürünleri genelde daha ucuz olabilir (yaz indirimleri)
+        # Mevsimsel faktörler ekleme - kışın daha yüksek, yazın daha düşük fiyatlar (en fazla 100$)
+        purchase_amount = min(purchase_amount * product_data['season_price_factors'].get(season, 1.0), 100.0)
         
         # 2 ondalık basamağa yuvarlama
         purchase_amount = round(purchase_amount, 2)
         
         # Mevsime uygun renk seçimi
-        color = StatisticalUtils.weighted_choice(
-            list(season_color_preferences[season].keys()), 
-            season_color_preferences[season]
-        )
+        color = samplers['color'][season].draw(rng)
         
         # Cinsiyete göre beden dağılımı
-        if gender in ['Male', 'Female']:
-            # Cinsiyete göre beden ağırlıkları
-            size_weights = Constants.SIZE_DISTRIBUTION.get(gender, {})
-            if size_weights:
-                size = StatisticalUtils.weighted_choice(Constants.SIZES, size_weights)
-            else:
-                size = random.choice(Constants.SIZES)
+        if gender in samplers['size']:
+            size = samplers['size'][gender].draw(rng)
         else:
             # Cinsiyet belirtilmemişse rastgele seçim
-            size = random.choice(Constants.SIZES)
+            size = Constants.SIZES[int(rng.integers(len(Constants.SIZES)))]
         
         # İnceleme puanı, gönderim türü ve ödeme yöntemi
-        review_rating = StatisticalUtils.generate_review_rating(category, item, purchase_amount, season)
-        shipping_type = StatisticalUtils.weighted_choice(
-            product_data['shipping_types'], product_data['shipping_weights']
-        )
-        payment_method = StatisticalUtils.weighted_choice(
-            product_data['payment_methods'], product_data['payment_weights']
-        )
+        review_rating = StatisticalUtils.generate_review_rating(category, item, purchase_amount, season, rng)
+        shipping_type = samplers['shipping'].draw(rng)
+        payment_method = samplers['payment'].draw(rng)
         
         return DataTypes.PurchaseDetails(
             category=category,
@@ -399,11 +691,18 @@ class PurchaseGenerator:
         )
     
     @staticmethod
-    def assign_customer_locations(customers_df: pd.DataFrame, product_data: Dict[str, Any]) -> Dict[int, str]:
+    def assign_customer_locations(
+        customers_df: pd.DataFrame,
+        product_data: Dict[str, Any],
+        streams: Optional[CustomerStreams] = None
+    ) -> Dict[int, str]:
         """Her müşteriye kalıcı bir konum atar, nüfus dağılımına göre gerçekçi bir şekilde.
         
         Bu fonksiyon her müşteriye (CustomerID) tek bir eyalet atar.
         Eyaletlerin nüfus büyüklüğüne göre müşteri sayıları belirlenir.
+        
+        streams verilirse her müşterinin eyaleti kendi akışından nüfus
+        ağırlıklarıyla çekilir; atama diğer müşterilere bağlı olmaz.
         """
         # Customer ID'ler için sabit liste oluştur
         customer_ids = customers_df['Customer ID'].unique()
@@ -413,6 +712,11 @@ class PurchaseGenerator:
         locations = list(product_data['location_data'].keys())
         populations = np.array([product_data['location_data'][loc]['population'] for loc in locations])
         
+        if streams is not None:
+            location_sampler = StatisticalUtils.create_sampler(locations, populations.tolist())
+            uniforms = streams.uniforms(customer_ids, 0, CustomerStreams.LOCATION)[:, 0]
+            return dict(zip(customer_ids.tolist(), location_sampler.pick(uniforms).tolist()))
+        
         # Toplam nüfus
         total_population = sum(populations)
         
@@ -446,20 +750,48 @@ class PurchaseGenerator:
         # Son kontrol - tüm müşterilerin bir konumu olduğundan emin ol
         for cid in customer_ids:
             if cid not in customer_locations:
-                # Eğer bir müşterinin konumu atanmamışsa, rastgele bir konum ata
-                customer_locations[cid] = random.choice(locations)
+                # Eğer bir müşterinin konumu atanmamışsa, en kalabalık eyalete ata
+                customer_locations[cid] = locations[int(np.argmax(populations))]
         
         return customer_locations
     
+    @staticmethod
+    def customer_location_array(
+        df: pd.DataFrame,
+        product_data: Dict[str, Any],
+        streams: Optional[CustomerStreams] = None
+    ) -> np.ndarray:
+        """assign_customer_locations'ın satır hizalı sürümü: df'nin her satırı için müşterinin eyaleti.
+        
+        streams verilirse eyalet yalnızca müşterinin kendi LOCATION akışına
+        bağlıdır; bir müşteri parçası için tüm müşteri kümesine ait eşleme
+        gerekmez.
+        """
+        customer_ids = df['Customer ID'].to_numpy()
+        if streams is not None:
+            locations = list(product_data['location_data'])
+            populations = [product_data['location_data'][location]['population'] for location in locations]
+            location_sampler = StatisticalUtils.create_sampler(locations, populations)
+            return location_sampler.pick(streams.uniforms(customer_ids, 0, CustomerStreams.LOCATION)[:, 0])
+        customer_locations = PurchaseGenerator.assign_customer_locations(df, product_data)
+        return np.array([customer_locations[customer_id] for customer_id in customer_ids], dtype=object)
+    
     @staticmethod
     def process_past_purchases(
         df: pd.DataFrame, 
-        product_data: Dict[str, Any]
+        product_data: Dict[str, Any],
+        streams: Optional[CustomerStreams] = None
     ) -> List[List[Any]]:
-        """Müşterilerin geçmiş alışveriş kayıtlarını oluşturur."""
+        """Müşterilerin geçmiş alışveriş kayıtlarını oluşturur.
+        
+        Her müşterinin çekimleri streams.generator(müşteri, PAST) akışından
+        yapılır; streams verilmezse Constants.RANDOM_SEED kullanılır.
+        """
+        streams = streams if streams is not None else CustomerStreams()
+        
         # Performans optimizasyonu için ön hesaplamalar
         print("Müşteri lokasyonları atanıyor...")
-        customer_locations = PurchaseGenerator.assign_customer_locations(df, product_data)
+        customer_locations = PurchaseGenerator.assign_customer_locations(df, product_data, streams)
         
         # Vektörel işlemler için hazırlık
         customer_ids = df['Customer ID'].values
@@ -493,16 +825,18 @@ class PurchaseGenerator:
                 gender = genders[idx]
                 age_group = age_groups[idx]
                 
-                # Müşteri için atanmış konumu al
+                # Müşteri için atanmış konumu ve müşteriye özel rastgele akışı al
                 location = customer_locations[customer_id]
+                rng = streams.generator(customer_id, CustomerStreams.PAST)
                 
                 # Müşteriye özgü sezon tercihi oluşturma
-                row_seasons = StatisticalUtils.generate_random_seasons(product_data['seasons'], previous_purchases)
+                row_seasons = StatisticalUtils.generate_random_seasons(product_data['seasons'], previous_purchases, rng)
                 
                 # Müşteriye özgü tarihler oluşturma
                 dates = DateTimeUtils.generate_dates(
                     frequencies[idx], previous_purchases, customer_id, row_seasons, 
-                    product_data['season_months'], product_data['holidays']
+                    product_data['season_months'], product_data['holidays'],
+                    product_data['day_weight_calendar'], rng
                 )
                 
                 # Temel satır verilerini bir kez kopyala
@@ -516,7 +850,7 @@ class PurchaseGenerator:
                     
                     # Mevsim, cinsiyet, yaş ve lokasyona uygun ürün detayları
                     purchase_details = PurchaseGenerator.generate_purchase_details_for_season(
-                        season, product_data, gender, age_group, location
+                        season, product_data, gender, age_group, location, rng
                     )
                     
                     # Satır verilerini güncelleme
@@ -542,55 +876,29 @@ class PurchaseGenerator:
     @staticmethod
     def process_future_purchases(
         df: pd.DataFrame, 
-        product_data: Dict[str, Any]
+        product_data: Dict[str, Any],
+        streams: Optional[CustomerStreams] = None
     ) -> List[List[Any]]:
-        """Müşterilerin gelecek alışveriş kayıtlarını oluşturur."""
-        print("Gelecek alışveriş tahminleri oluşturuluyor...")
-        
-        # Satış verilerini içe aktar
-        from sales_data import MONTH_WEIGHTS, SALES_DATA
+        """Müşterilerin gelecek alışveriş kayıtlarını oluşturur.
         
-        # 2024 yılı için hedef satış rakamları
-        target_sales_2024 = SALES_DATA[2024]
-        
-        # Ay bazında hedef satış oranlarını hesapla - StatisticalUtils'i kullanarak normalize et
-        target_month_ratios = StatisticalUtils.normalize_weights(target_sales_2024)
+        Ay ataması assign_future_months ile, gün ve ürün detayları
+        streams.generator(müşteri, FUTURE) akışından yapılır; streams
+        verilmezse Constants.RANDOM_SEED kullanılır.
+        """
+        print("Gelecek alışveriş tahminleri oluşturuluyor...")
+        streams = streams if streams is not None else CustomerStreams()
         
         # Müşteri sayısı
         customer_count = len(df)
         print(f"Toplam {customer_count} müşteri için gelecek alışveriş tahminleri oluşturuluyor...")
         
-        # Ay bazında müşteri sayılarını hesapla
-        customers_per_month = {month: int(ratio * customer_count) for month, ratio in target_month_ratios.items()}
-        
-        # Toplam müşteri sayısını kontrol et ve gerekirse ayarla
-        total_assigned = sum(customers_per_month.values())
-        if total_assigned < customer_count:
-            # Eksik müşterileri Kasım ve Aralık aylarına ekle (bu aylar genelde daha yoğun)
-            remaining = customer_count - total_assigned
-            customers_per_month[11] += remaining // 2
-            customers_per_month[12] += remaining - (remaining // 2)
-        elif total_assigned > customer_count:
-            # Fazla müşterileri Ocak ayından çıkar (Ocak ayında zirve var)
-            excess = total_assigned - customer_count
-            customers_per_month[1] = max(1, customers_per_month[1] - excess)
-        
-        # Ay bazında müşteri listelerini oluştur
-        month_customer_lists = {}
-        customer_indices = list(range(customer_count))
-        random.shuffle(customer_indices)  # Müşterileri karıştır
-        
-        # Müşterileri aylara dağıt
-        start_idx = 0
-        for month in range(1, 13):
-            count = customers_per_month[month]
-            end_idx = min(start_idx + count, customer_count)
-            month_customer_lists[month] = customer_indices[start_idx:end_idx]
-            start_idx = end_idx
+        # Müşterileri 2024 hedef satış oranlarına göre aylara dağıt
+        future_months = PurchaseGenerator.assign_future_months(customer_count, streams=streams, customer_ids=df['Customer ID'].to_numpy())
+        month_customer_lists = {month: np.flatnonzero(future_months == month).tolist() for month in range(1, 13)}
         
         # Önce her müşteriye gerçekçi bir şekilde konum atama
         print("Müşteri lokasyonları atanıyor...")
-        customer_locations = PurchaseGenerator.assign_customer_locations(df, product_data)
+        customer_locations = PurchaseGenerator.assign_customer_locations(df, product_data, streams)
         
         # Vektörel işlemler için hazırlık
         customer_ids = df['Customer ID'].values
@@ -648,15 +956,16 @@ class PurchaseGenerator:
                     customer_id = customer_ids[idx]
                     gender = genders[idx]
                     age_group = age_groups[idx]
+                    rng = streams.generator(customer_id, CustomerStreams.FUTURE)
                     
                     # Temel satır verilerini kopyalama
                     purchase_row = row.drop(['Discount Applied', 'Frequency of Purchases']).copy()
                     
                     # Rastgele gün seçimi
                     if day_weights is not None:
-                        day = np.random.choice(range(1, last_day + 1), p=day_weights)
+                        day = int(rng.choice(np.arange(1, last_day + 1), p=day_weights))
                     else:
-                        day = random.randint(1, last_day)
+                        day = int(rng.integers(1, last_day + 1))
                     
                     # Tarihi oluşturma
                     try:
@@ -664,7 +973,7 @@ class PurchaseGenerator:
                         future_date = future_date_obj.strftime(Constants.DATE_FORMAT)
                     except ValueError:
                         # Geçersiz tarih durumunda DateTimeUtils'i kullan
-                        future_date = DateTimeUtils.generate_random_future_date()
+                        future_date = DateTimeUtils.generate_random_future_date(rng)
                     
                     # Müşterinin atanmış konumunu al
                     location = customer_locations[customer_id]
@@ -673,7 +982,7 @@ class PurchaseGenerator:
                     if season:
                         # Ürün detaylarını oluşturma
                         purchase_details = PurchaseGenerator.generate_purchase_details_for_season(
-                            season, product_data, gender, age_group, location
+                            season, product_data, gender, age_group, location, rng
                         )
                         
                         # Satır verilerini güncelleme
@@ -695,3 +1004,350 @@ class PurchaseGenerator:
                     output_rows.append(row_as_list)
         
         return output_rows
+    
+    @staticmethod
+    def generate_purchase_amounts(
+        seasons: np.ndarray,
+        product_data: Dict[str, Any],
+        rng: Optional[np.random.Generator] = None,
+        uniforms: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Mevsim dizisi için satın alma tutarlarını toplu olarak üretir.
+        
+        generate_purchase_details_for_season'daki fiyat modelinin dizi sürümüdür:
+        fiyat aralığı kümülatif ağırlıklar üzerinde searchsorted ile seçilir,
+        aralık içindeki fiyat tek bir düzgün dağılım çekimiyle üretilir, mevsim
+        çarpanı bir arama dizisinden okunur ve sonuç np.clip ile 100$'a sınırlanır.
+        uniforms (satır başına iki düzgün sayı) verilirse rng kullanılmaz.
+        """
+        num_rows = len(seasons)
+        if uniforms is None:
+            uniforms = (rng if rng is not None else Utils.default_rng()).random((num_rows, 2))
+        
+        # Fiyat aralığı ve aralık içinde düzgün dağılımlı fiyat
+        price_ranges = np.array([r[:2] for r in product_data['price_ranges']], dtype=np.float64)
+        range_indices = product_data['samplers']['price_range'].pick_indices(uniforms[:, 0])
+        min_prices = price_ranges[range_indices, 0]
+        max_prices = price_ranges[range_indices, 1]
+        purchase_amounts = np.round(min_prices + (max_prices - min_prices) * uniforms[:, 1], 2)
+        
+        # Mevsim çarpanları: mevsim kodu -> çarpan arama dizisi (tanımsız mevsimler için 1)
+        season_factors = product_data['season_price_factors']
+        season_codes, season_names = pd.factorize(seasons)
+        factor_lookup = np.array([season_factors.get(season, 1.0) for season in season_names], dtype=np.float64)
+        
+        return np.round(np.clip(purchase_amounts * factor_lookup[season_codes], 0.0, 100.0), 2)
+    
+    @staticmethod
+    def generate_purchase_details_columnar(
+        seasons: np.ndarray,
+        genders: np.ndarray,
+        age_groups: np.ndarray,
+        climates: np.ndarray,
+        product_data: Dict[str, Any],
+        rng: Optional[np.random.Generator] = None,
+        uniforms: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """generate_purchase_details_for_season'ın sütun bazlı sürümü.
+        
+        Her satır için mevsim, cinsiyet, yaş grubu ve iklim dizileri alır ve
+        ürün detay sütunlarını sütun adı -> dizi sözlüğü olarak döndürür.
+        Kategori ve ürün, aynı bağlamı paylaşan satırlar için toplu çekilir.
+        Metin sütunları, product_data['category_dtypes'] sözlükleriyle
+        kodlanmış pd.Categorical olarak döndürülür; satır başına Python
+        metin nesnesi oluşturulmaz.
+        
+        Her satırın çekimleri uniforms dizisinin (satır sayısı x DETAIL_DRAWS)
+        o satıra ait düzgün sayılarından yapılır; böylece bir satırın sonucu
+        diğer satırlara bağlı değildir. uniforms verilmezse rng ile üretilir.
+        """
+        samplers = product_data['samplers']
+        dtypes = product_data['category_dtypes']
+        num_rows = len(seasons)
+        if uniforms is None:
+            uniforms = (rng if rng is not None else Utils.default_rng()).random((num_rows, PurchaseGenerator.DETAIL_DRAWS))
+        seasons = pd.Categorical(seasons, dtype=dtypes['Season'])
+        
+        # Metin yerine sözlük kodları (bkz. ProductModel.define_vocabularies)
+        category_codes = np.full(num_rows, -1, dtype=np.int64)
+        item_codes = np.full(num_rows, -1, dtype=np.int64)
+        
+        # Bağlama göre gruplama: (mevsim, cinsiyet, yaş grubu, iklim)
+        contexts = pd.DataFrame({'season': seasons, 'gender': genders, 'age': age_groups, 'climate': climates})
+        context_groups = contexts.groupby(['season', 'gender', 'age', 'climate'], sort=False, observed=True).indices
+        for (season, gender, age_group, climate), row_indices in context_groups.items():
+            distribution = product_data['conditional_distributions'].get(season, gender, age_group, climate)
+            group_categories = distribution.category_sampler.pick_codes(uniforms[row_indices, 0], dtypes['Category'])
+            category_codes[row_indices] = group_categories
+            for category, item_sampler in distribution.item_samplers.items():
+                category_rows = row_indices[group_categories == dtypes['Category'].categories.get_loc(category)]
+                if len(category_rows):
+                    item_codes[category_rows] = item_sampler.pick_codes(uniforms[category_rows, 1], dtypes['Item Purchased'])
+        categories = pd.Categorical.from_codes(category_codes, dtype=dtypes['Category'])
+        items = pd.Categorical.from_codes(item_codes, dtype=dtypes['Item Purchased'])
+        
+        # Fiyatlar (aralık seçimi, aralık içinde fiyat ve mevsimsel faktör tek seferde)
+        purchase_amounts = PurchaseGenerator.generate_purchase_amounts(seasons, product_data, uniforms=uniforms[:, 2:4])
+        
+        # Mevsime uygun renkler
+        color_codes = np.full(num_rows, -1, dtype=np.int64)
+        for season, color_sampler in samplers['color'].items():
+            season_rows = np.flatnonzero(seasons == season)
+            if len(season_rows):
+                color_codes[season_rows] = color_sampler.pick_codes(uniforms[season_rows, 4], dtypes['Color'])
+        
+        # Cinsiyete göre bedenler (cinsiyet belirtilmemişse eşit olasılık)
+        size_codes = dtypes['Size'].categories.get_indexer(Constants.SIZES)[
+            (uniforms[:, 5] * len(Constants.SIZES)).astype(np.int64)
+        ]
+        for gender, size_sampler in samplers['size'].items():
+            gender_rows = np.flatnonzero(genders == gender)
+            if len(gender_rows):
+                size_codes[gender_rows] = size_sampler.pick_codes(uniforms[gender_rows, 5], dtypes['Size'])
+        
+        # Değerlendirme puanları (fiyat, kategori ve ürüne bağlı J-curve), faktör grupları halinde
+        review_ratings = StatisticalUtils.generate_review_ratings(
+            categories, items, purchase_amounts, product_data, uniforms=uniforms[:, 6]
+        )
+        
+        return {
+            'Item Purchased': items,
+            'Category': categories,
+            'Purchase Amount (USD)': purchase_amounts,
+            'Color': pd.Categorical.from_codes(color_codes, dtype=dtypes['Color']),
+            'Size': pd.Categorical.from_codes(size_codes, dtype=dtypes['Size']),
+            'Review Rating': review_ratings,
+            'Shipping Type': pd.Categorical.from_codes(
+                samplers['shipping'].pick_codes(uniforms[:, 7], dtypes['Shipping Type']), dtype=dtypes['Shipping Type']
+            ),
+            'Payment Method': pd.Categorical.from_codes(
+                samplers['payment'].pick_codes(uniforms[:, 8], dtypes['Payment Method']), dtype=dtypes['Payment Method']
+            )
+        }
+    
+    @staticmethod
+    def process_past_purchases_columnar(
+        df: pd.DataFrame,
+        product_data: Dict[str, Any],
+        locations: Optional[np.ndarray] = None,
+        rng: Optional[np.random.Generator] = None,
+        streams: Optional[CustomerStreams] = None
+    ) -> pd.DataFrame:
+        """process_past_purchases'ın sütun bazlı sürümü; sonucu doğrudan DataFrame olarak döndürür.
+        
+        Müşteri özellikleri 'Previous Purchases' sayısı kadar np.repeat ile
+        çoğaltılır; mevsim, tarih ve ürün detayları tüm satırlar için toplu
+        çekilir. Dağılımlar satır bazlı yol ile aynıdır: her müşterinin tarihleri
+        kronolojik sıralanır, mevsim sütunu üretim sırasını korur.
+        
+        streams verilirse her satırın düzgün sayıları (müşteri kimliği,
+        alışveriş sırası) çiftinden türetilir; bir müşterinin alışverişleri
+        hangi müşterilerle birlikte üretildiğinden bağımsızdır. Aksi halde
+        tüm sayılar rng'den çekilir. locations, df satırlarıyla hizalı müşteri
+        eyaletleridir (bkz. customer_location_array); verilmezse burada atanır.
+        """
+        if locations is None:
+            locations = PurchaseGenerator.customer_location_array(df, product_data, streams)
+        
+        counts = np.maximum(df['Previous Purchases'].to_numpy().astype(np.int64), 0)
+        customer_index = np.repeat(np.arange(len(df)), counts)
+        num_rows = len(customer_index)
+        
+        # Satır başına düzgün sayılar: mevsim, yıl, ay, gün ve ürün detayları
+        num_draws = 4 + PurchaseGenerator.DETAIL_DRAWS
+        customer_ids = df['Customer ID'].to_numpy()
+        if streams is not None:
+            purchase_indices = np.arange(num_rows) - np.repeat(np.cumsum(counts) - counts, counts)
+            uniforms = streams.uniforms(customer_ids[customer_index], purchase_indices, CustomerStreams.PAST, num_draws)
+            profile_uniforms = streams.uniforms(customer_ids, 0, CustomerStreams.SEASON_PROFILE)[:, 0]
+        else:
+            rng = rng if rng is not None else Utils.default_rng()
+            uniforms = rng.random((num_rows, num_draws))
+            profile_uniforms = rng.random(len(df))
+        
+        # Müşteri bazlı özellikler
+        genders = df['Gender'].to_numpy(dtype=object)
+        age_groups = np.array([CustomerModel.get_age_group(age) for age in df['Age'].to_numpy().astype(int)], dtype=object)
+        climates = np.array([LocationModel.get_climate(location, product_data) for location in locations], dtype=object)
+        
+        # Müşteri mevsim tercihi ve her alışveriş için mevsim
+        preferences = StatisticalUtils.define_season_preferences()
+        thresholds = np.array([threshold for threshold, _ in preferences])
+        customer_profiles = np.minimum(np.searchsorted(thresholds, profile_uniforms, side='right'), len(preferences) - 1)
+        row_profiles = customer_profiles[customer_index]
+        season_dtype = product_data['category_dtypes']['Season']
+        season_codes = np.full(num_rows, -1, dtype=np.int64)
+        for profile_idx, (_, season_weights) in enumerate(preferences):
+            profile_rows = np.flatnonzero(row_profiles == profile_idx)
+            if len(profile_rows):
+                season_codes[profile_rows] = StatisticalUtils.create_sampler(season_weights).pick_codes(
+                    uniforms[profile_rows, 0], season_dtype
+                )
+        seasons = pd.Categorical.from_codes(season_codes, dtype=season_dtype)
+        
+        # Tarihler: ağırlıklı yıl, mevsime uygun ağırlıklı ay, takvimden ağırlıklı gün
+        from sales_data import YEAR_WEIGHTS, MONTH_WEIGHTS
+        calendar = product_data['day_weight_calendar']
+        year_sampler = StatisticalUtils.create_sampler([calendar.years.index(y) for y in YEAR_WEIGHTS], list(YEAR_WEIGHTS.values()))
+        year_indices = year_sampler.pick(uniforms[:, 1]).astype(np.int64)
+        months = np.zeros(num_rows, dtype=np.int64)
+        for season, season_month_list in product_data['season_months'].items():
+            season_rows = np.flatnonzero(seasons == season)
+            if len(season_rows):
+                month_sampler = StatisticalUtils.create_sampler(season_month_list, [MONTH_WEIGHTS[m] for m in season_month_list])
+                months[season_rows] = month_sampler.pick(uniforms[season_rows, 2])
+        dates = DateTimeUtils.draw_calendar_days(calendar, year_indices, months, uniforms[:, 3])
+        
+        # Her müşterinin tarihlerini kronolojik sırala
+        dates = dates[np.lexsort((dates, customer_index))]
+        
+        details = PurchaseGenerator.generate_purchase_details_columnar(
+            seasons, genders[customer_index], age_groups[customer_index], climates[customer_index], product_data,
+            uniforms=uniforms[:, 4:]
+        )
+        
+        return PurchaseGenerator.assemble_purchases(df, customer_index, {**details, 'Season': seasons}, dates)
+    
+    @staticmethod
+    def assemble_purchases(
+        df: pd.DataFrame,
+        customer_index: np.ndarray,
+        generated: Dict[str, Any],
+        dates: np.ndarray
+    ) -> pd.DataFrame:
+        """Müşteri sütunlarını satırlara çoğaltır ve üretilen sütunları giriş sütun sırasıyla yerleştirir.
+        
+        Üretilen sütunların giriş verisindeki değerleri hiç çoğaltılmaz;
+        müşteri sütunları (pd.Categorical dahil) tipini koruyarak çoğaltılır.
+        'Purchase Date' int32 gün sırası olarak eklenir; metne yalnızca çıktı
+        yazılırken çevrilir.
+        """
+        base = df.drop(['Discount Applied', 'Frequency of Purchases'], axis=1)
+        columns = {
+            column: generated[column] if column in generated
+            else base[column].iloc[customer_index].reset_index(drop=True)
+            for column in base.columns
+        }
+        purchases = pd.DataFrame({**columns, **generated}, index=pd.RangeIndex(len(customer_index)))
+        purchases['Purchase Date'] = DateTimeUtils.ordinal_column(dates)
+        return purchases
+    
+    @staticmethod
+    def assign_future_months(
+        customer_count: int,
+        rng: Optional[np.random.Generator] = None,
+        streams: Optional[CustomerStreams] = None,
+        customer_ids: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Müşterileri 2024 hedef satış oranlarına göre gelecek alışveriş aylarına dağıtır.
+        
+        streams ve customer_ids verilirse her müşterinin ayı kendi akışından
+        hedef oranlarla çekilir (oranlar beklenen değer olarak tutar). Aksi
+        halde ay kotaları tam uygulanır ve müşteriler rng ile karıştırılır.
+        
+        Returns:
+            Her müşteri için ay numarası (1-12); ay kotası dışında kalan müşteriler için 0
+        """
+        # Satış verilerini içe aktar
+        from sales_data import SALES_DATA
+        
+        # Ay bazında hedef satış oranları
+        target_month_ratios = StatisticalUtils.normalize_weights(SALES_DATA[2024])
+        if streams is not None:
+            month_sampler = StatisticalUtils.create_sampler(target_month_ratios)
+            uniforms = streams.uniforms(customer_ids, 0, CustomerStreams.FUTURE_MONTH)[:, 0]
+            return month_sampler.pick(uniforms).astype(np.int64)
+        rng = rng if rng is not None else Utils.default_rng()
+        
+        # Ay bazında hedef satış oranlarına göre müşteri sayıları
+        customers_per_month = {month: int(ratio * customer_count) for month, ratio in target_month_ratios.items()}
+        
+        # Toplam müşteri sayısını kontrol et ve gerekirse ayarla
+        total_assigned = sum(customers_per_month.values())
+        if total_assigned < customer_count:
+            # Eksik müşterileri Kasım ve Aralık aylarına ekle (bu aylar genelde daha yoğun)
+            remaining = customer_count - total_assigned
+            customers_per_month[11] += remaining // 2
+            customers_per_month[12] += remaining - (remaining // 2)
+        elif total_assigned > customer_count:
+            # Fazla müşterileri Ocak ayından çıkar (Ocak ayında zirve var)
+            excess = total_assigned - customer_count
+            customers_per_month[1] = max(1, customers_per_month[1] - excess)
+        
+        # Karıştırılmış müşterileri aylara dağıt
+        month_counts = np.array([customers_per_month[month] for month in range(1, 13)])
+        month_sequence = np.repeat(np.arange(1, 13), month_counts)[:customer_count]
+        future_months = np.zeros(customer_count, dtype=np.int64)
+        future_months[rng.permutation(customer_count)[:len(month_sequence)]] = month_sequence
+        return future_months
+    
+    @staticmethod
+    def process_future_purchases_columnar(
+        df: pd.DataFrame,
+        product_data: Dict[str, Any],
+        locations: Optional[np.ndarray] = None,
+        rng: Optional[np.random.Generator] = None,
+        future_months: Optional[np.ndarray] = None,
+        streams: Optional[CustomerStreams] = None
+    ) -> pd.DataFrame:
+        """process_future_purchases'ın sütun bazlı sürümü; her müşteri için 2024'te bir alışveriş üretir.
+        
+        future_months verilirse (bkz. assign_future_months) ay ataması yeniden
+        yapılmaz; müşteriler parçalar halinde işlenirken ay kotaları tüm müşteri
+        kümesi üzerinden bir kez hesaplanır. streams verilirse gün ve ürün
+        detayları müşterinin FUTURE akışından çekilir. locations, df satırlarıyla
+        hizalı müşteri eyaletleridir (bkz. customer_location_array).
+        """
+        customer_ids = df['Customer ID'].to_numpy()
+        if locations is None:
+            locations = PurchaseGenerator.customer_location_array(df, product_data, streams)
+        if future_months is None:
+            future_months = PurchaseGenerator.assign_future_months(len(df), rng, streams, customer_ids)
+        
+        # Ay sırasına göre gelecek alışverişi olan müşteriler
+        customer_index = np.flatnonzero(future_months > 0)
+        customer_index = customer_index[np.argsort(future_months[customer_index], kind='stable')]
+        months = future_months[customer_index]
+        
+        # Satır başına düzgün sayılar: gün ve ürün detayları
+        num_draws = 1 + PurchaseGenerator.DETAIL_DRAWS
+        if streams is not None:
+            uniforms = streams.uniforms(customer_ids[customer_index], 0, CustomerStreams.FUTURE, num_draws)
+        else:
+            uniforms = (rng if rng is not None else Utils.default_rng()).random((len(customer_index), num_draws))
+        
+        # Gün seçimi: Kasım'ın ve Aralık'ın son günleri daha ağırlıklı, diğer aylar eşit
+        days = np.zeros(len(months), dtype=np.int64)
+        for month in range(1, 13):
+            month_rows = np.flatnonzero(months == month)
+            if not len(month_rows):
+                continue
+            last_day = DateTimeUtils.get_last_day_of_month(month, 2024)
+            day_weights = [1.0] * last_day
+            if month == 11:
+                day_weights = [1 if d < 20 else 3 for d in range(1, last_day + 1)]
+            elif month == 12:
+                day_weights = [1 if d < 20 else 4 for d in range(1, last_day + 1)]
+            day_sampler = StatisticalUtils.create_sampler(list(range(1, last_day + 1)), day_weights)
+            days[month_rows] = day_sampler.pick(uniforms[month_rows, 0])
+        month_starts = np.array([np.datetime64(f'2024-{month:02d}-01', 'D') for month in range(1, 13)])
+        dates = month_starts[months - 1] + (days - 1)
+        
+        # Ay-mevsim eşleştirmesi (ay -> mevsim kodu)
+        season_dtype = product_data['category_dtypes']['Season']
+        month_to_season = season_dtype.categories.get_indexer([None] + [
+            DateTimeUtils.get_season_for_month(month, product_data['season_months']) for month in range(1, 13)
+        ])
+        seasons = pd.Categorical.from_codes(month_to_season[months], dtype=season_dtype)
+        
+        genders = df['Gender'].to_numpy(dtype=object)[customer_index]
+        age_groups = np.array([CustomerModel.get_age_group(age) for age in df['Age'].to_numpy().astype(int)], dtype=object)[customer_index]
+        climates = np.array([
+            LocationModel.get_climate(location, product_data) for location in locations[customer_index]
+        ], dtype=object)
+        
+        details = PurchaseGenerator.generate_purchase_details_columnar(
+            seasons, genders, age_groups, climates, product_data, uniforms=uniforms[:, 1:]
+        )
+        
+        return PurchaseGenerator.assemble_purchases(df, customer_index, {**details, 'Season': seasons}, dates)
@@ -4,23 +4,322 @@ Veri Veri İşleme ve Ana Program Akışı (final_generate4.py)
 Bu modül, veri işleme işlemlerini ve ana program akışını içerir.
 
 İçerik:
+- OutputWriter: CSV, Parquet ve Feather çıktı yazıcısı
+- OutputManifest: Artımlı güncelleme için çıktı özeti (manifest)
 - DataIO: Veri okuma ve yazma işlemleri
 - HolidayAdjuster: Tatil etkisi ve özel dönem ayarlamaları
-- Main: Ana program akışı
+- DerivedFeatures: Tarihten türetilen özellik sütunları (haftanın günü, ay, hafta, tatil yakınlığı)
+- Main: Komut satırı arayüzü ve ana program akışı
 """
 
-import pandas as pd
-import numpy as np
-import random
+from __future__ import annotations
+
+import argparse
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Any, Union, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Any, Union, Optional
 
 # Diğer modüllerden gerekli sınıfları içe aktarma
-from final_generate1 import Constants, DataTypes, DateTimeUtils
+from final_generate1 import Constants, DataTypes, DateTimeUtils, Utils, StageProfiler, CustomerStreams, lazy_import
 from final_generate2 import ProductModel, SeasonModel
 from final_generate3 import PurchaseGenerator, StatisticalUtils
-# Satış verilerini bir kez içe aktarma
-from sales_data import SPECIAL_DAY_WEIGHTS
+
+# pandas/numpy ve sales_data ağırlıkları ilk kullanımda yüklenir (bkz. final_generate1.lazy_import)
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+
+class OutputWriter:
+    """Çıktıyı CSV, Parquet veya Feather (Arrow IPC) biçiminde parça parça yazar.
+    
+    Parquet ve Feather çıktılarında metin sütunları sabit sözlüklerle
+    (dictionary) kodlanır, 'Purchase Date' date32, tutarlar float32 ve
+    bayraklar int8 olarak saklanır. Şema tüm parçalarda aynıdır; Parquet
+    satır grupları parça büyüklüğünden bağımsız olarak row_group_size
+    satırda toplanır.
+    """
+    
+    # Sayısal ve tarih sütunlarının Arrow tipleri; diğer metin sütunları sözlükle kodlanır
+    COLUMN_TYPES = {
+        'Customer ID': 'int32',
+        'Age': 'int8',
+        'Purchase Amount (USD)': 'float32',
+        'Review Rating': 'float32',
+        'Promo Code Used': 'int8',
+        'Previous Purchases': 'int16',
+        'Purchase Date': 'date32',
+        'WeekdayNum': 'int8',
+        'Weekend': 'int8',
+        'Month': 'int8',
+        'Quarter': 'int8',
+        'ISOWeek': 'int8',
+        'DaysToHoliday': 'int16',
+    }
+    
+    def __init__(
+        self,
+        output_file: str,
+        output_format: str = 'csv',
+        categories: Optional[Dict[str, List[str]]] = None,
+        row_group_size: int = Constants.ROW_GROUP_SIZE
+    ):
+        """
+        Args:
+            output_file: Çıktı dosyası
+            output_format: 'csv', 'parquet' veya 'feather'
+            categories: Sütun -> sözlük değerleri (bkz. output_categories); Parquet/Feather için gerekli
+            row_group_size: Parquet satır grubu / Feather kayıt grubu büyüklüğü
+        """
+        if output_format not in Constants.OUTPUT_FORMATS:
+            raise ValueError(f"Bilinmeyen çıktı biçimi: {output_format}")
+        self.output_file = output_file
+        self.output_format = output_format
+        self.categories = categories or {}
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self._schema = None
+        self._writer = None
+        self._pending = []
+        self._pending_rows = 0
+    
+    @staticmethod
+    def import_pyarrow():
+        """pyarrow modülünü içe aktarır; kurulu değilse anlaşılır bir hata verir."""
+        try:
+            import pyarrow
+            import pyarrow.ipc
+            import pyarrow.parquet
+        except ImportError as exc:
+            raise ImportError("Parquet ve Feather çıktısı için pyarrow gereklidir: pip install pyarrow") from exc
+        return pyarrow
+    
+    @staticmethod
+    def output_categories(input_df: pd.DataFrame, product_data: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Sözlükle kodlanacak sütunların değer listelerini oluşturur.
+        
+        Değerler ürün modelinden ve giriş verisinden alınır; böylece her parça
+        aynı sözlüğü kullanır ve dosya boyunca şema değişmez.
+        """
+        known_values = {
+            **product_data['vocabularies'],
+            'Weekday': DerivedFeatures.WEEKDAY_NAMES,
+        }
+        for column in ['Gender', 'Subscription Status', 'Item Purchased', 'Category', 'Size', 'Color',
+                       'Season', 'Shipping Type', 'Payment Method', 'Location']:
+            if column in input_df.columns:
+                known_values[column] = list(known_values.get(column, [])) + input_df[column].dropna().astype(str).tolist()
+        return {column: list(dict.fromkeys(values)) for column, values in known_values.items()}
+    
+    def to_arrow_table(self, df: pd.DataFrame):
+        """DataFrame'i çıktı şemasına göre tiplenmiş bir Arrow tablosuna dönüştürür."""
+        pa = OutputWriter.import_pyarrow()
+        arrays, fields = [], []
+        for column in df.columns:
+            values = df[column]
+            arrow_type = OutputWriter.COLUMN_TYPES.get(column)
+            if arrow_type == 'date32':
+                array = pa.array(DateTimeUtils.date_ordinals(values).astype(np.int32), type=pa.date32())
+            elif arrow_type is not None:
+                array = pa.array(values.to_numpy().astype(arrow_type))
+            elif column in self.categories:
+                vocabulary = self.categories[column]
+                if isinstance(values.dtype, pd.CategoricalDtype):
+                    # Kodlu sütunlar metne çevrilmeden çıktı sözlüğüne eşlenir
+                    lookup = pd.Index(vocabulary).get_indexer(values.cat.categories.astype(str))
+                    codes = np.where(values.cat.codes.to_numpy() >= 0, lookup[values.cat.codes.to_numpy()], -1)
+                else:
+                    codes = pd.Categorical(values.astype(str), categories=vocabulary).codes
+                if (codes < 0).any():
+                    unknown = sorted(set(values.astype(str)) - set(vocabulary))
+                    raise ValueError(f"'{column}' sütununda sözlükte olmayan değerler: {unknown[:5]}")
+                index_type = pa.int8() if len(vocabulary) <= 127 else pa.int16()
+                array = pa.DictionaryArray.from_arrays(
+                    pa.array(codes.astype(index_type.to_pandas_dtype())), pa.array(vocabulary, type=pa.string())
+                )
+            else:
+                array = pa.array(values.astype(str).to_numpy(), type=pa.string())
+            arrays.append(array)
+            fields.append(pa.field(column, array.type))
+        return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+    
+    def write(self, df: pd.DataFrame) -> None:
+        """Bir parçayı çıktıya ekler."""
+        if self.output_format == 'csv':
+            if 'Purchase Date' in df.columns and pd.api.types.is_integer_dtype(df['Purchase Date']):
+                # Gün sıraları yalnızca burada metne çevrilir
+                df = df.assign(**{'Purchase Date': DateTimeUtils.format_ordinals(df['Purchase Date'].to_numpy())})
+            df.to_csv(self.output_file, mode='w' if self.rows_written == 0 else 'a',
+                      header=self.rows_written == 0, index=False)
+            self.rows_written += len(df)
+            return
+        
+        table = self.to_arrow_table(df)
+        if self._schema is None:
+            self._schema = table.schema
+        self._pending.append(table)
+        self._pending_rows += table.num_rows
+        while self._pending_rows >= self.row_group_size:
+            self._flush(self.row_group_size)
+    
+    def _flush(self, num_rows: int) -> None:
+        """Bekleyen satırlardan num_rows kadarını tek bir satır grubu olarak yazar."""
+        pa = OutputWriter.import_pyarrow()
+        pending = pa.concat_tables(self._pending)
+        group, rest = pending.slice(0, num_rows), pending.slice(num_rows)
+        if self._writer is None:
+            if self.output_format == 'parquet':
+                self._writer = pa.parquet.ParquetWriter(self.output_file, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(self.output_file, self._schema)
+        if self.output_format == 'parquet':
+            self._writer.write_table(group, row_group_size=num_rows)
+        else:
+            self._writer.write_table(group, max_chunksize=num_rows)
+        self.rows_written += group.num_rows
+        self._pending = [rest] if rest.num_rows else []
+        self._pending_rows = rest.num_rows
+    
+    def close(self) -> None:
+        """Kalan satırları yazar ve dosyayı kapatır."""
+        if self.output_format == 'csv':
+            return
+        if self._pending_rows:
+            self._flush(self._pending_rows)
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+    
+    def __enter__(self) -> 'OutputWriter':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    @staticmethod
+    def read_chunks(output_file: str, output_format: str = 'csv', chunk_size: int = 100_000):
+        """Yazılmış bir çıktı dosyasını DataFrame parçaları halinde okur."""
+        if output_format == 'csv':
+            # round_trip: yeniden yazılan tutarlar bit düzeyinde aynı kalır
+            yield from pd.read_csv(output_file, chunksize=chunk_size, float_precision='round_trip')
+            return
+        pa = OutputWriter.import_pyarrow()
+        if output_format == 'parquet':
+            for batch in pa.parquet.ParquetFile(output_file).iter_batches(batch_size=chunk_size):
+                yield batch.to_pandas(date_as_object=False)
+        else:
+            with pa.memory_map(output_file) as source:
+                reader = pa.ipc.open_file(source)
+                for batch_idx in range(reader.num_record_batches):
+                    yield reader.get_batch(batch_idx).to_pandas(date_as_object=False)
+
+
+class OutputManifest:
+    """Akış halinde yazılmış çıktının yanında tutulan, artımlı güncelleme için özet dosyası.
+    
+    Manifest '<çıktı dosyası>.manifest.npz' olarak kaydedilir ve
+    DataTypes.OutputManifest alanlarını içerir. Giriş satırı özetleri
+    pandas.util.hash_pandas_object ile, yapılandırma özeti ise seed, çıktı
+    biçimi ve model modüllerinin kaynak kodundan hesaplanır; model veya
+    ayarlama kodu değişirse manifest geçersiz sayılır.
+    """
+    
+    VERSION = 2
+    
+    # Çıktıyı belirleyen modüller; kaynak kodları yapılandırma özetine katılır
+    MODEL_MODULES = ['final_generate1', 'final_generate2', 'final_generate3', 'final_generate4', 'sales_data']
+    
+    # Manifestte dizi olarak saklanan alanlar
+    ARRAY_FIELDS = [
+        'customer_ids', 'fingerprints', 'month_counts', 'candidate_ids', 'candidate_counters', 'candidate_months',
+        'candidate_thresholds', 'moved_ids', 'moved_counters', 'moved_dates'
+    ]
+    
+    @staticmethod
+    def path(output_file: str) -> str:
+        """Çıktı dosyasının manifest dosyası yolunu döndürür."""
+        return output_file + '.manifest.npz'
+    
+    @staticmethod
+    def config_fingerprint(seed: int, output_format: str) -> str:
+        """seed, çıktı biçimi ve model modüllerinin kaynak kodundan yapılandırma özeti hesaplar."""
+        import hashlib
+        import json
+        import os
+        digest = hashlib.sha256(json.dumps(
+            {'version': OutputManifest.VERSION, 'seed': seed, 'format': output_format}
+        ).encode('utf-8'))
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for module in OutputManifest.MODEL_MODULES:
+            with open(os.path.join(directory, module + '.py'), 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+    
+    @staticmethod
+    def row_fingerprints(df: pd.DataFrame) -> np.ndarray:
+        """Giriş tablosunun her satırı için 64 bitlik özet döndürür."""
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+    
+    @staticmethod
+    def create(
+        df: pd.DataFrame,
+        seed: int,
+        output_format: str,
+        total_rows: int,
+        month_counts: np.ndarray,
+        candidates: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        candidate_thresholds: np.ndarray,
+        moved: Tuple[np.ndarray, np.ndarray, np.ndarray]
+    ) -> DataTypes.OutputManifest:
+        """Üretimi tamamlanmış bir çıktı için manifest oluşturur."""
+        return DataTypes.OutputManifest(
+            config=OutputManifest.config_fingerprint(seed, output_format),
+            total_rows=int(total_rows),
+            customer_ids=df['Customer ID'].to_numpy(),
+            fingerprints=OutputManifest.row_fingerprints(df),
+            month_counts=np.asarray(month_counts, dtype=np.int64),
+            candidate_ids=candidates[0],
+            candidate_counters=candidates[1],
+            candidate_months=candidates[2],
+            candidate_thresholds=np.asarray(candidate_thresholds, dtype=np.float64),
+            moved_ids=moved[0],
+            moved_counters=moved[1],
+            moved_dates=moved[2]
+        )
+    
+    @staticmethod
+    def save(output_file: str, manifest: DataTypes.OutputManifest) -> None:
+        """Manifesti çıktı dosyasının yanına yazar."""
+        import json
+        import os
+        path = OutputManifest.path(output_file)
+        meta = {'version': OutputManifest.VERSION, 'config': manifest.config, 'total_rows': manifest.total_rows}
+        arrays = {field: getattr(manifest, field) for field in OutputManifest.ARRAY_FIELDS}
+        with open(path + '.tmp', 'wb') as f:
+            np.savez(f, meta=np.array(json.dumps(meta)), **arrays)
+        os.replace(path + '.tmp', path)
+    
+    @staticmethod
+    def discard(output_file: str) -> None:
+        """Çıktı dosyasının manifestini (varsa) siler; sonraki artımlı çalıştırma tüm veriyi yeniden üretir."""
+        import os
+        path = OutputManifest.path(output_file)
+        if os.path.exists(path):
+            os.remove(path)
+    
+    @staticmethod
+    def load(output_file: str) -> Optional[DataTypes.OutputManifest]:
+        """Çıktı dosyasının manifestini okur; manifest veya çıktı yoksa ya da manifest eski sürümse None döndürür."""
+        import json
+        import os
+        path = OutputManifest.path(output_file)
+        if not os.path.exists(path) or not os.path.exists(output_file):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('version') != OutputManifest.VERSION:
+                return None
+            arrays = {field: data[field] for field in OutputManifest.ARRAY_FIELDS}
+        return DataTypes.OutputManifest(config=meta['config'], total_rows=meta['total_rows'], **arrays)
 
 
 class DataIO:
@@ -36,6 +335,39 @@ class DataIO:
         """'Discount Applied' ve 'Frequency of Purchases' sütunlarını filtreler. 'Previous Purchases' sütunu korunur."""
         return df.drop(['Discount Applied', 'Frequency of Purchases'], axis=1)
     
+    @staticmethod
+    def keep_years(df: pd.DataFrame, years: List[int]) -> pd.DataFrame:
+        """Yalnızca 'Purchase Date' yılı years içinde olan satırları döndürür."""
+        purchase_years, _, _ = DateTimeUtils.ordinal_parts(DateTimeUtils.date_ordinals(df['Purchase Date']))
+        return df[np.isin(purchase_years, years)]
+    
+    @staticmethod
+    def filter_output_years(
+        output_file: str,
+        years: List[int],
+        output_format: str = 'csv',
+        categories: Optional[Dict[str, List[str]]] = None,
+        chunk_size: int = 100_000
+    ) -> int:
+        """Yazılmış çıktıdan years dışındaki yıllara ait satırları çıkarır.
+        
+        Tüm ayarlamalar (yeniden dağıtım dahil) tam veri üzerinde yapıldıktan
+        sonra uygulanır; böylece kalan satırlar tam çıktıdakilerle aynıdır.
+        
+        Returns:
+            Dosyada kalan satır sayısı
+        """
+        import os
+        temp_file = output_file + '.tmp'
+        kept_rows = 0
+        with OutputWriter(temp_file, output_format, categories) as writer:
+            for chunk_df in OutputWriter.read_chunks(output_file, output_format, chunk_size):
+                chunk_df = DataIO.keep_years(chunk_df, years)
+                writer.write(chunk_df)
+                kept_rows += len(chunk_df)
+        os.replace(temp_file, output_file)
+        return kept_rows
+    
     @staticmethod
     def write_to_csv(data: List[List[Any]], output_file: str) -> None:
         """Verileri CSV dosyasına yazar."""
@@ -53,8 +385,20 @@ class DataIO:
         print(f"Toplam {len(rows)} satır veri oluşturuldu.")
     
     @staticmethod
-    def create_previous_purchases_data(df: pd.DataFrame, product_data: Dict[str, Any]) -> List[List[Any]]:
+    def output_path(output_file: str, output_format: str) -> str:
+        """Çıktı dosyasının uzantısını çıktı biçimine göre ayarlar."""
+        import os
+        return os.path.splitext(output_file)[0] + Constants.OUTPUT_FORMATS[output_format]
+    
+    @staticmethod
+    def create_previous_purchases_data(
+        df: pd.DataFrame,
+        product_data: Dict[str, Any],
+        seed: int = Constants.RANDOM_SEED
+    ) -> List[List[Any]]:
         """Geçmiş ve gelecek alışveriş verilerini oluşturur."""
+        streams = CustomerStreams(seed)
+        
         # İstenmeyen sütunları kaldırma
         filtered_df = DataIO.filter_columns(df)
         
@@ -64,11 +408,11 @@ class DataIO:
         
         # Geçmiş alışveriş kayıtlarını oluşturma
         print("Geçmiş alışveriş kayıtları oluşturuluyor...")
-        past_purchases = PurchaseGenerator.process_past_purchases(df, product_data)
+        past_purchases = PurchaseGenerator.process_past_purchases(df, product_data, streams)
         
         # Gelecek alışveriş kayıtlarını oluşturma
         print("Gelecek alışveriş tahminleri oluşturuluyor...")
-        future_purchases = PurchaseGenerator.process_future_purchases(df, product_data)
+        future_purchases = PurchaseGenerator.process_future_purchases(df, product_data, streams)
         
         # Tüm satırları birleştirme
         all_rows = past_purchases + future_purchases
@@ -83,21 +427,461 @@ class DataIO:
         date_index = len(header) - 1  # Son sütun Purchase Date
         
         # PurchaseGenerator sınıfındaki adjust_last_purchase_dates metodunu kullan
-        adjusted_rows = PurchaseGenerator.adjust_last_purchase_dates(all_rows, customer_id_index, date_index)
+        adjusted_rows = PurchaseGenerator.adjust_last_purchase_dates(
+            all_rows, customer_id_index, date_index, streams=streams
+        )
         
         # Başlığı ve satırları birleştirme
         output_data = [header] + adjusted_rows
         
         return output_data
+    
+    @staticmethod
+    def generate_shard(
+        shard_df: pd.DataFrame,
+        streams: CustomerStreams,
+        product_data: Optional[Dict[str, Any]] = None
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, List[Dict[str, Any]]]:
+        """Bir müşteri parçası için geçmiş ve gelecek alışverişleri üretir.
+        
+        Tüm rastgelelik müşteri bazlı akışlardan (streams) türetilir; böylece
+        bir müşterinin alışverişleri hangi parçada ve hangi süreçte
+        üretildiğinden bağımsızdır. Müşteri lokasyonları ve gelecek alışveriş
+        ayları da yalnızca kendi akışlarına bağlı olduğundan parça içinde
+        atanır. product_data verilmezse (işçi süreçlerinde) önbellekten alınır.
+        
+        Returns:
+            (geçmiş alışverişler, gelecek alışverişler, StageProfiler aşama ölçümleri)
+        """
+        profiler = StageProfiler()
+        if product_data is None:
+            product_data = ProductModel.get_product_data()
+        locations = PurchaseGenerator.customer_location_array(shard_df, product_data, streams)
+        with profiler.stage('process_past_purchases', rows_in=len(shard_df)) as stage:
+            past_purchases = PurchaseGenerator.process_past_purchases_columnar(
+                shard_df, product_data, locations, streams=streams
+            )
+            stage['rows_out'] = len(past_purchases)
+        with profiler.stage('process_future_purchases', rows_in=len(shard_df)) as stage:
+            future_purchases = PurchaseGenerator.process_future_purchases_columnar(
+                shard_df, product_data, locations, streams=streams
+            )
+            stage['rows_out'] = len(future_purchases)
+        return past_purchases, future_purchases, profiler.report()['stages']
+    
+    @staticmethod
+    def _generate_shard_task(task: Tuple[pd.DataFrame, CustomerStreams]) -> Tuple[pd.DataFrame, pd.DataFrame, List[Dict[str, Any]]]:
+        """ProcessPoolExecutor için generate_shard sarmalayıcısı."""
+        return DataIO.generate_shard(*task)
+    
+    @staticmethod
+    def run_shards(
+        tasks: Iterable[Tuple[pd.DataFrame, CustomerStreams]],
+        product_data: Dict[str, Any],
+        executor: Optional[Any] = None,
+        profiler: Optional[StageProfiler] = None
+    ) -> List[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """Parçaları sırayla veya verilen süreç havuzunda üretir; aşama ölçümlerini profiler'a ekler."""
+        if executor is not None:
+            results = list(executor.map(DataIO._generate_shard_task, tasks))
+        else:
+            results = [DataIO.generate_shard(*task, product_data) for task in tasks]
+        if profiler is not None:
+            for _, _, stages in results:
+                profiler.merge(stages)
+        return [(past, future) for past, future, _ in results]
+    
+    @staticmethod
+    def encode_customer_columns(df: pd.DataFrame, product_data: Dict[str, Any]) -> pd.DataFrame:
+        """Müşteri düzeyindeki metin sütunlarını (cinsiyet, lokasyon, abonelik) pd.Categorical'a çevirir.
+        
+        Sözlük, model değerleri ve giriş verisindeki değerlerden bir kez
+        oluşturulur; böylece tüm parçalar aynı kategorileri paylaşır ve
+        birleştirildiklerinde sütunlar kodlu kalır.
+        """
+        df = df.copy()
+        for column in Constants.CUSTOMER_CATEGORICAL_COLUMNS:
+            if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+                values = list(product_data['vocabularies'].get(column, [])) + df[column].dropna().tolist()
+                df[column] = pd.Categorical(df[column], categories=list(dict.fromkeys(values)))
+        return df
+    
+    @staticmethod
+    def shard_count(num_customers: int) -> int:
+        """num_customers müşteri için plan_shards'ın üreteceği parça sayısı."""
+        return max(1, -(-num_customers // Constants.SHARD_SIZE))
+    
+    @staticmethod
+    def plan_shards(
+        df: pd.DataFrame,
+        product_data: Dict[str, Any],
+        streams: CustomerStreams
+    ) -> Iterator[Tuple[pd.DataFrame, CustomerStreams]]:
+        """Müşterileri parçalara böler ve her parça için generate_shard argümanlarını sırayla üretir.
+        
+        Müşteri düzeyindeki metin sütunları parçalara bölünmeden önce bir kez
+        kodlanır (bkz. encode_customer_columns); parçalar ise istendikçe
+        dilimlenir, böylece tüm görevler aynı anda bellekte tutulmaz.
+        Müşteri düzeyindeki atamalar generate_shard içinde yapılır.
+        """
+        df = DataIO.encode_customer_columns(df, product_data)
+        return (
+            (df.iloc[shard_idx * Constants.SHARD_SIZE:(shard_idx + 1) * Constants.SHARD_SIZE], streams)
+            for shard_idx in range(DataIO.shard_count(len(df)))
+        )
+    
+    @staticmethod
+    def create_purchases_frame(
+        df: pd.DataFrame,
+        product_data: Dict[str, Any],
+        seed: int = Constants.RANDOM_SEED,
+        workers: int = 1,
+        profiler: Optional[StageProfiler] = None
+    ) -> pd.DataFrame:
+        """Geçmiş ve gelecek alışveriş verilerini sütun bazlı üretip DataFrame olarak döndürür.
+        
+        create_previous_purchases_data ile aynı çıktıyı (aynı sütunlar ve
+        dağılımlar) satır bazlı pandas Series işlemleri olmadan üretir.
+        
+        Müşteriler Constants.SHARD_SIZE büyüklüğünde parçalara bölünür. Her
+        müşterinin çekimleri CustomerStreams(seed) üzerinden (seed, müşteri
+        kimliği) çiftinden türetildiği için, aynı seed ile workers=1 ve
+        workers=N aynı çıktıyı üretir ve herhangi bir müşteri alt kümesi tek
+        başına yeniden üretilebilir.
+        """
+        profiler = profiler if profiler is not None else StageProfiler()
+        streams = CustomerStreams(seed)
+        with profiler.stage('plan_shards', rows_in=len(df)):
+            tasks = DataIO.plan_shards(df, product_data, streams)
+        
+        print(f"Alışveriş kayıtları {DataIO.shard_count(len(df))} parça halinde {workers} işçi ile oluşturuluyor...")
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = DataIO.run_shards(tasks, product_data, executor, profiler)
+        else:
+            results = DataIO.run_shards(tasks, product_data, profiler=profiler)
+        
+        # Parçalar sırayla birleştirilir: önce tüm geçmiş, sonra tüm gelecek alışverişler
+        past_purchases = pd.concat([past for past, _ in results], ignore_index=True)
+        future_purchases = pd.concat([future for _, future in results], ignore_index=True)
+        all_purchases = pd.concat([past_purchases, future_purchases], ignore_index=True)
+        
+        # Son alışveriş tarihlerini istenen oranlara göre düzenle
+        print("Son alışveriş tarihleri düzenleniyor...")
+        print("- Son alışverişi 2022'de olan müşteriler: %5")
+        print("- Son alışverişi 2023'de olan müşteriler: %11")
+        with profiler.stage('adjust_last_purchase_dates', rows_in=len(all_purchases)) as stage:
+            adjusted_df = PurchaseGenerator.adjust_last_purchase_dates_columnar(all_purchases, streams=streams)
+            stage['rows_out'] = len(adjusted_df)
+        
+        return adjusted_df
+    
+    @staticmethod
+    def adjusted_chunks(
+        tasks: Iterable[Tuple[pd.DataFrame, CustomerStreams]],
+        product_data: Dict[str, Any],
+        streams: CustomerStreams,
+        shards_per_chunk: int,
+        executor: Optional[Any] = None,
+        profiler: Optional[StageProfiler] = None
+    ):
+        """Parçaları shards_per_chunk'lık gruplar halinde üretir ve satır bazlı ayarlamaları uygular.
+        
+        Görevler gruplar halinde tüketilir; her grup son alışveriş düzenlemesi,
+        tatil/COVID etkisi, promosyon kodu ve haftanın günü aşamalarından
+        geçer. Son alışveriş yılları müşterinin kendi akışına bağlı olduğundan
+        her grup kendi müşterileri için belirler; tüm müşteriler üzerinde
+        durum tutulmaz.
+        
+        Yields:
+            (ayarlanmış parça DataFrame'i, o ana kadar işlenen parça sayısı)
+        """
+        profiler = profiler if profiler is not None else StageProfiler()
+        
+        all_holidays = HolidayAdjuster.all_holidays()
+        tasks = iter(tasks)
+        shards_done = 0
+        
+        while True:
+            chunk_tasks = list(islice(tasks, shards_per_chunk))
+            if not chunk_tasks:
+                break
+            shards_done += len(chunk_tasks)
+            results = DataIO.run_shards(chunk_tasks, product_data, executor, profiler)
+            
+            chunk_df = pd.concat(
+                [past for past, _ in results] + [future for _, future in results], ignore_index=True
+            )
+            del results
+            
+            with profiler.stage('adjust_last_purchase_dates', rows_in=len(chunk_df)) as stage:
+                chunk_df = PurchaseGenerator.adjust_last_purchase_dates_columnar(chunk_df, streams=streams)
+                stage['rows_out'] = len(chunk_df)
+            chunk_df = HolidayAdjuster.apply_row_adjustments(chunk_df, all_holidays, profiler, streams)
+            yield chunk_df, shards_done
+    
+    @staticmethod
+    def write_purchases_streaming(
+        df: pd.DataFrame,
+        product_data: Dict[str, Any],
+        output_file: str,
+        seed: int = Constants.RANDOM_SEED,
+        workers: int = 1,
+        chunk_size: int = Constants.CHUNK_SIZE,
+        output_format: str = 'csv',
+        profiler: Optional[StageProfiler] = None,
+        years: Optional[List[int]] = None
+    ) -> int:
+        """Alışverişleri müşteri parçaları halinde üretip ayarlayarak dosyaya ekler.
+        
+        Her parça üretim, son alışveriş düzenlemesi, tatil/COVID etkisi,
+        promosyon kodu ve haftanın günü aşamalarından geçip doğrudan çıktı
+        dosyasına yazılır; bellekte aynı anda yalnızca bir parça tutulur.
+        Parçalar arasında yalnızca küçük global durum taşınır: 2024 aylık satış
+        sayıları ve her ayın 2024 yeniden dağıtım adayları. Satır bazlı ayarlamalar
+        müşteri bazlı akışları kullandığından sonuç parça büyüklüğüne bağlı değildir. 2024 aylarından
+        satış taşınması gerekirse, çıktı dosyası ikinci bir akış geçişiyle düzeltilir.
+        
+        output_format 'parquet' veya 'feather' ise çıktı OutputWriter ile
+        tiplenmiş ve sözlükle kodlanmış sütunlarla yazılır. Sonunda
+        update_purchases_incremental için çıktının manifesti kaydedilir.
+        
+        years verilirse (Constants.YEAR_RANGE'in alt kümesi) tüm ayarlamalar
+        tam veri üzerinde yapıldıktan sonra yalnızca bu yıllara ait satırlar
+        dosyada bırakılır. Bu durumda manifest kaydedilmez; çıktı tam veriyi
+        temsil etmediği için sonraki artımlı çalıştırma tüm veriyi yeniden üretir.
+        
+        Returns:
+            Yazılan toplam satır sayısı
+        """
+        profiler = profiler if profiler is not None else StageProfiler()
+        streams = CustomerStreams(seed)
+        with profiler.stage('plan_shards', rows_in=len(df)):
+            tasks = DataIO.plan_shards(df, product_data, streams)
+        shard_count = DataIO.shard_count(len(df))
+        shards_per_chunk = max(1, chunk_size // Constants.SHARD_SIZE)
+        
+        # Parçalar arasında taşınan global durum
+        month_counts_2024 = np.zeros(13, dtype=np.int64)
+        candidates = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        candidate_thresholds = np.ones(13)
+        total_rows = 0
+        categories = OutputWriter.output_categories(df, product_data)
+        writer = OutputWriter(output_file, output_format, categories)
+        
+        executor = None
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=workers)
+        
+        print(f"Alışveriş kayıtları {shard_count} parça halinde, her seferde {shards_per_chunk} parça işlenerek yazılıyor...")
+        try:
+            for chunk_df, shards_done in DataIO.adjusted_chunks(
+                tasks, product_data, streams, shards_per_chunk, executor, profiler
+            ):
+                month_counts_2024, candidates, candidate_thresholds = HolidayAdjuster.track_sales(
+                    chunk_df, month_counts_2024, candidates, candidate_thresholds, streams
+                )
+                with profiler.stage('write_output', rows_in=len(chunk_df)) as stage:
+                    writer.write(chunk_df)
+                    stage['rows_out'] = len(chunk_df)
+                total_rows += len(chunk_df)
+                print(f"  {shards_done}/{shard_count} parça yazıldı ({total_rows} satır)")
+        finally:
+            with profiler.stage('write_output'):
+                writer.close()
+            if executor is not None:
+                executor.shutdown()
+        
+        with profiler.stage('redistribute_sales_by_target', rows_in=total_rows) as stage:
+            moved = HolidayAdjuster.redistribute_sales_in_file(
+                output_file, month_counts_2024, candidates, max(total_rows // 10, 1), output_format, categories,
+                streams
+            )
+            stage['rows_out'] = total_rows
+        
+        if years is not None and set(years) != set(Constants.YEAR_RANGE):
+            with profiler.stage('filter_years', rows_in=total_rows) as stage:
+                total_rows = DataIO.filter_output_years(
+                    output_file, years, output_format, categories, max(total_rows // 10, 1)
+                )
+                stage['rows_out'] = total_rows
+            OutputManifest.discard(output_file)
+        else:
+            OutputManifest.save(output_file, OutputManifest.create(
+                df, seed, output_format, total_rows, month_counts_2024, candidates, candidate_thresholds, moved
+            ))
+        
+        print(f"Veri {output_file} dosyasına başarıyla yazıldı.")
+        print(f"Toplam {total_rows} satır veri oluşturuldu.")
+        return total_rows
+    
+    @staticmethod
+    def update_purchases_incremental(
+        df: pd.DataFrame,
+        product_data: Dict[str, Any],
+        output_file: str,
+        seed: int = Constants.RANDOM_SEED,
+        workers: int = 1,
+        chunk_size: int = Constants.CHUNK_SIZE,
+        output_format: str = 'csv',
+        profiler: Optional[StageProfiler] = None
+    ) -> int:
+        """Yalnızca giriş satırı değişen, yeni veya silinen müşterilerin alışverişlerini günceller.
+        
+        Giriş satırı özetleri çıktının manifestiyle (bkz. OutputManifest)
+        karşılaştırılır. Değişmeyen müşterilerin satırları mevcut çıktıdan
+        kopyalanır ve önceki yeniden dağıtımın taşıdığı tarihler geri alınır;
+        değişen ve yeni müşteriler yeniden üretilip dosyanın sonuna eklenir.
+        Müşteri bazlı akışlar sayesinde her müşterinin satırları tam
+        üretimdekiyle aynıdır, yalnızca satır sırası farklıdır.
+        
+        Global aşamalar tam satırlar yerine manifestteki özetlerden yeniden
+        hesaplanır: 2024 aylık satış sayıları çıkarılan ve eklenen satırlarla
+        güncellenir, aylar arası satış taşıması saklanan aday listelerinden
+        planlanır. Son alışveriş yılları zaten müşteri bazlıdır. Manifest
+        yoksa, yapılandırma değişmişse veya aday listesi yetmezse tüm veri
+        write_purchases_streaming ile yeniden üretilir.
+        
+        Returns:
+            Çıktıdaki toplam satır sayısı
+        """
+        import os
+        profiler = profiler if profiler is not None else StageProfiler()
+        manifest = OutputManifest.load(output_file)
+        if manifest is None or manifest.config != OutputManifest.config_fingerprint(seed, output_format):
+            print("Geçerli bir manifest bulunamadı veya yapılandırma değişti; tüm veri yeniden üretiliyor...")
+            return DataIO.write_purchases_streaming(
+                df, product_data, output_file, seed, workers, chunk_size, output_format, profiler
+            )
+        
+        # Değişen/yeni müşteriler ve eski satırları çıkarılacak müşteriler
+        customer_ids = df['Customer ID'].to_numpy()
+        changed = ~pd.MultiIndex.from_arrays([customer_ids, OutputManifest.row_fingerprints(df)]).isin(
+            pd.MultiIndex.from_arrays([manifest.customer_ids, manifest.fingerprints])
+        )
+        removed_ids = np.setdiff1d(manifest.customer_ids, customer_ids)
+        dropped_ids = np.union1d(customer_ids[changed], removed_ids)
+        print(f"{int(changed.sum())} müşteri yeni veya değişmiş, {len(removed_ids)} müşteri silinmiş.")
+        if len(dropped_ids) == 0:
+            print(f"{output_file} güncel; yeniden üretilecek müşteri yok.")
+            return manifest.total_rows
+        
+        streams = CustomerStreams(seed)
+        tasks = iter(())
+        shard_count = 0
+        if changed.any():
+            with profiler.stage('plan_shards', rows_in=int(changed.sum())):
+                tasks = DataIO.plan_shards(df[changed], product_data, streams)
+            shard_count = DataIO.shard_count(int(changed.sum()))
+        shards_per_chunk = max(1, chunk_size // Constants.SHARD_SIZE)
+        
+        month_counts_2024 = manifest.month_counts.copy()
+        kept = ~np.isin(manifest.candidate_ids, dropped_ids)
+        candidates = (manifest.candidate_ids[kept], manifest.candidate_counters[kept], manifest.candidate_months[kept])
+        candidate_thresholds = manifest.candidate_thresholds
+        total_rows = 0
+        categories = OutputWriter.output_categories(df, product_data)
+        temp_file = output_file + '.incremental'
+        writer = OutputWriter(temp_file, output_format, categories)
+        
+        executor = None
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=workers)
+        
+        try:
+            # Değişmeyen müşterilerin satırlarını kopyala; önceki taşımaları geri al
+            moved_rows = pd.MultiIndex.from_arrays([manifest.moved_ids, manifest.moved_counters])
+            seen: Dict[Any, int] = {}
+            with profiler.stage('copy_unchanged_rows', rows_in=manifest.total_rows) as stage:
+                for chunk_df in OutputWriter.read_chunks(output_file, output_format, max(manifest.total_rows // 10, 1)):
+                    chunk_ids = chunk_df['Customer ID'].to_numpy()
+                    rows, found = HolidayAdjuster.match_rows(chunk_ids, moved_rows, seen)
+                    if len(rows):
+                        chunk_df, _ = HolidayAdjuster.replace_dates(chunk_df, rows, manifest.moved_dates[found])
+                        chunk_df = DerivedFeatures.apply(chunk_df)
+                    dropped = np.isin(chunk_ids, dropped_ids)
+                    if dropped.any():
+                        years, months, _ = DateTimeUtils.ordinal_parts(
+                            DateTimeUtils.date_ordinals(chunk_df['Purchase Date'][dropped])
+                        )
+                        month_counts_2024 -= np.bincount(months[years == 2024], minlength=13)
+                        chunk_df = chunk_df[~dropped]
+                    writer.write(chunk_df)
+                    total_rows += len(chunk_df)
+                stage['rows_out'] = total_rows
+            
+            # Değişen ve yeni müşterileri üretip sona ekle
+            print(f"Alışveriş kayıtları {shard_count} parça halinde yeniden üretiliyor...")
+            for chunk_df, shards_done in DataIO.adjusted_chunks(
+                tasks, product_data, streams, shards_per_chunk, executor, profiler
+            ):
+                month_counts_2024, candidates, candidate_thresholds = HolidayAdjuster.track_sales(
+                    chunk_df, month_counts_2024, candidates, candidate_thresholds, streams
+                )
+                with profiler.stage('write_output', rows_in=len(chunk_df)) as stage:
+                    writer.write(chunk_df)
+                    stage['rows_out'] = len(chunk_df)
+                total_rows += len(chunk_df)
+                print(f"  {shards_done}/{shard_count} parça yazıldı ({total_rows} satır)")
+        finally:
+            with profiler.stage('write_output'):
+                writer.close()
+            if executor is not None:
+                executor.shutdown()
+        
+        # Silinen adayların yerini saklanmayan satırlar doldurması gerekiyorsa baştan üret
+        _, outgoing, _ = HolidayAdjuster.plan_sales_redistribution(
+            {month: int(month_counts_2024[month]) for month in range(1, 13)}
+        )
+        if not HolidayAdjuster.candidates_cover(candidates, candidate_thresholds, outgoing, streams):
+            os.remove(temp_file)
+            print("2024 yeniden dağıtım adayları yetersiz; tüm veri yeniden üretiliyor...")
+            return DataIO.write_purchases_streaming(
+                df, product_data, output_file, seed, workers, chunk_size, output_format, profiler
+            )
+        
+        with profiler.stage('redistribute_sales_by_target', rows_in=total_rows) as stage:
+            moved = HolidayAdjuster.redistribute_sales_in_file(
+                temp_file, month_counts_2024, candidates, max(total_rows // 10, 1), output_format, categories,
+                streams
+            )
+            stage['rows_out'] = total_rows
+        os.replace(temp_file, output_file)
+        
+        OutputManifest.save(output_file, OutputManifest.create(
+            df, seed, output_format, total_rows, month_counts_2024, candidates, candidate_thresholds, moved
+        ))
+        
+        print(f"Veri {output_file} dosyasına başarıyla güncellendi.")
+        print(f"Toplam {total_rows} satır veri var.")
+        return total_rows
 
 
 class HolidayAdjuster:
     """Tatil etkisi ve mevsimsel ayarlamalar."""
     
+    # Hedefin üzerindeki bir 2024 ayından en fazla taşınan satış sayısı
+    MAX_REDISTRIBUTION = 2000
+    
+    # Akış halinde yazımda her ay için saklanan, anahtarı en küçük 2024 satırı
+    # sayısı; artımlı güncellemede silinen müşterilerin adaylarının yerini doldurur
+    REDISTRIBUTION_CANDIDATES = 4 * MAX_REDISTRIBUTION
+    
+    @staticmethod
+    def all_holidays(years: Optional[List[int]] = None) -> List[Tuple[datetime, str, float]]:
+        """Verilen (varsayılan olarak Constants.YEAR_RANGE) yılların tatil listelerini birleştirir."""
+        holidays = []
+        for year in (years if years is not None else Constants.YEAR_RANGE):
+            holidays.extend(HolidayAdjuster.convert_holidays_to_list(year))
+        return holidays
+    
     @staticmethod
     def convert_holidays_to_list(year: int) -> List[Tuple[datetime, str, float]]:
         """SeasonModel.define_holidays() tarafından tanımlanan tatil günlerini liste formatına dönüştürür."""
-        holidays_dict = SeasonModel.define_holidays()
+        holidays_dict = ProductModel.get_product_data()['holidays']
         holidays_list = []
         
         # Sabit tarihli tatiller
@@ -139,356 +923,726 @@ class HolidayAdjuster:
         return holidays_list
     
     @staticmethod
-    def apply_holiday_effect(df: pd.DataFrame, holidays: List[Tuple[datetime, str, float]]) -> pd.DataFrame:
+    def build_holiday_table(
+        holidays: List[Tuple[datetime, str, float]],
+        start_ordinal: int,
+        end_ordinal: int
+    ) -> DataTypes.HolidayTable:
+        """Verilen gün aralığı için tatil etkisi tablosunu oluşturur.
+        
+        Her gün için en yakın tatile olan uzaklık ve tatil kaynaklı fiyat artışı
+        olasılığı bir kez hesaplanır. Bir gün birden fazla tatilin ±3 gün
+        penceresine düşebilir; satır bazlı eski döngüde her tatil için ayrı zar
+        atılıp son başarılı artış geçerli olduğundan, bir günün toplam artış
+        olasılığı 1 - Π(1 - p_i) olarak birleştirilir.
+        
+        Args:
+            holidays: (tarih, isim, ağırlık) şeklinde tatil listesi
+            start_ordinal: Tablonun ilk günü (1970-01-01'den bu yana gün)
+            end_ordinal: Tablonun son günü (dahil)
+        
+        Returns:
+            Gün sırası ile indekslenen tatil tablosu
+        """
+        days = np.arange(start_ordinal, end_ordinal + 1, dtype=np.int64)
+        holiday_ordinals = np.array([h[0] for h in holidays], dtype='datetime64[D]').astype(np.int64)
+        holiday_weights = np.array([h[2] for h in holidays], dtype=np.float64)
+        
+        # Gün x tatil uzaklık matrisi (~1100 gün x ~100 tatil)
+        distances = np.abs(days[:, None] - holiday_ordinals[None, :])
+        
+        # Tatile yakınlık faktörü: tatil günü=1.0, ±1 gün=0.7, ±2 gün=0.5, ±3 gün=0.3
+        proximity_lookup = np.array([1.0, 0.7, 0.5, 0.3, 0.0])
+        proximity_factors = proximity_lookup[np.minimum(distances, 4)]
+        
+        # Satın alma miktarını artırma olasılığı: ağırlık * yakınlık faktörü / 10
+        probabilities = holiday_weights[None, :] * proximity_factors / 10
+        uplift_probability = 1.0 - np.prod(1.0 - probabilities, axis=1)
+        
+        return DataTypes.HolidayTable(
+            start_ordinal=int(start_ordinal),
+            nearest_distance=distances.min(axis=1),
+            uplift_probability=uplift_probability
+        )
+    
+    @staticmethod
+    def row_uniforms(
+        df: pd.DataFrame,
+        stream: int,
+        num_draws: int,
+        rng: Optional[np.random.Generator] = None,
+        streams: Optional[CustomerStreams] = None
+    ) -> np.ndarray:
+        """Ayarlama aşamaları için satır başına num_draws düzgün sayı üretir.
+        
+        streams verilirse sayılar (müşteri, müşteri içindeki satır sırası)
+        çiftinden türetilir ve satırın hangi parçada işlendiğine bağlı olmaz;
+        aksi halde rng'den çekilir.
+        """
+        if streams is not None:
+            return streams.row_uniforms(df['Customer ID'].to_numpy(), stream, num_draws)
+        return (rng if rng is not None else Utils.default_rng()).random((len(df), num_draws))
+    
+    @staticmethod
+    def apply_holiday_effect(
+        df: pd.DataFrame,
+        holidays: List[Tuple[datetime, str, float]],
+        rng: Optional[np.random.Generator] = None,
+        streams: Optional[CustomerStreams] = None
+    ) -> pd.DataFrame:
         """Tüm tatiller için satış artışı etkisi uygular, toplam satır sayısını değiştirmeden.
         
+        Tatil etkisi sütun bazında hesaplanır: tatil olasılıkları gün sırasına
+        göre bir tabloda tutulur ve 'Purchase Date' sütunu bu tabloya eşlenir.
+        
         Args:
             df: Müşteri verileri DataFrame'i
             holidays: (tarih, isim, ağırlık) şeklinde tatil listesi
+            rng: Rastgele sayı üreteci (streams verilmezse; o da verilmezse Utils.default_rng() kullanılır)
+            streams: Müşteri bazlı rastgele akışlar
         
         Returns:
             Tatil etkisi uygulanmış DataFrame
         """
-        # Tarih sütununu datetime formatına çevir
+        # Tarihler gün sıralarıyla işlenir (bkz. DateTimeUtils.date_ordinals)
         df = df.copy()  # DataFrame'in kopyasını oluştur
-        df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
+        ordinals = DateTimeUtils.date_ordinals(df['Purchase Date'])
+        df['Purchase Date'] = DateTimeUtils.ordinal_column(ordinals)
+        
+        if df.empty:
+            return df
         
         # Kasım ve Aralık ayları için özel ağırlıklar
+        from sales_data import SPECIAL_DAY_WEIGHTS
         black_friday_weight = SPECIAL_DAY_WEIGHTS['black_friday']
         christmas_weight = SPECIAL_DAY_WEIGHTS['christmas']
         
-        # Tatil günlerine yakın tarihlerde yapılan alışverişlerin ağırlıklarını artır
-        for index, row in df.iterrows():
-            purchase_date = row['Purchase Date']
-            
-            # Kasım ayı için özel işlem
-            if purchase_date.month == 11:
-                # Black Friday etkisi (Kasım ayının son haftası)
-                if purchase_date.day >= 20:
-                    # Satın alma miktarını artır - en az %30, en fazla %60 artış
-                    price_adjustment = 1.3 + (np.random.random() * 0.3 * black_friday_weight)  # 1.3 ile 1.6 arasında
-                    df.at[index, 'Purchase Amount (USD)'] = min(row['Purchase Amount (USD)'] * price_adjustment, 100.0)
-            
-            # Aralık ayı için özel işlem
-            elif purchase_date.month == 12:
-                # Yılbaşı alışverişleri etkisi (Aralık ayının son 10 günü)
-                if purchase_date.day >= 20:
-                    # Satın alma miktarını artır - en az %30, en fazla %60 artış
-                    price_adjustment = 1.3 + (np.random.random() * 0.3 * christmas_weight)  # 1.3 ile 1.6 arasında
-                    df.at[index, 'Purchase Amount (USD)'] = min(row['Purchase Amount (USD)'] * price_adjustment, 100.0)
-            
-            # Diğer tatil günleri için normal işlem
-            for holiday_date, holiday_name, weight in holidays:
-                # Satın alma tarihi ile tatil arasındaki fark
-                date_diff = abs((purchase_date - holiday_date).days)
-                
-                # Eğer satın alma, tatilden önceki veya sonraki 3 gün içinde gerçekleştiyse
-                if date_diff <= 3:
-                    # Tatile yakınlık faktörü: tatil günü=1.0, ±1 gün=0.7, ±2 gün=0.5, ±3 gün=0.3
-                    proximity_factor = 1.0 if date_diff == 0 else (0.7 if date_diff == 1 else (0.5 if date_diff == 2 else 0.3))
-                    
-                    # Satın alma miktarını artırma olasılığı: ağırlık * yakınlık faktörü / 10
-                    probability = (weight * proximity_factor) / 10
-                    
-                    # Belirli olasılıkla satın alma miktarını artır
-                    if np.random.random() < probability:
-                        # Satın alma miktarını artır - en az %30, en fazla %60 artış
-                        price_adjustment = 1.3 + (np.random.random() * 0.3)  # 1.3 ile 1.6 arasında
-                        df.at[index, 'Purchase Amount (USD)'] = min(row['Purchase Amount (USD)'] * price_adjustment, 100.0)
+        _, months, days = DateTimeUtils.ordinal_parts(ordinals)
+        amounts = df['Purchase Amount (USD)'].to_numpy(dtype=np.float64)
+        adjusted = amounts.copy()
+        uniforms = HolidayAdjuster.row_uniforms(df, CustomerStreams.HOLIDAY, 3, rng, streams)
+        
+        # Black Friday (Kasım) ve yılbaşı (Aralık) etkisi: ayın 20'si ve sonrası
+        season_weights = np.where(months == 11, black_friday_weight, christmas_weight)
+        seasonal_mask = ((months == 11) | (months == 12)) & (days >= 20)
+        seasonal_count = int(seasonal_mask.sum())
+        if seasonal_count:
+            # Satın alma miktarını artır - en az %30, en fazla %60 artış
+            price_adjustment = 1.3 + uniforms[seasonal_mask, 0] * 0.3 * season_weights[seasonal_mask]
+            adjusted[seasonal_mask] = np.minimum(amounts[seasonal_mask] * price_adjustment, 100.0)
+        
+        # Diğer tatil günleri için tablo üzerinden olasılık eşlemesi
+        table = HolidayAdjuster.build_holiday_table(holidays, ordinals.min(), ordinals.max())
+        probabilities = table.uplift_probability[ordinals - table.start_ordinal]
+        uplift_mask = uniforms[:, 1] < probabilities
+        uplift_count = int(uplift_mask.sum())
+        if uplift_count:
+            # Satın alma miktarını artır - en az %30, en fazla %60 artış
+            price_adjustment = 1.3 + uniforms[uplift_mask, 2] * 0.3
+            adjusted[uplift_mask] = np.minimum(amounts[uplift_mask] * price_adjustment, 100.0)
+        
+        df['Purchase Amount (USD)'] = adjusted
         
         return df
     
     @staticmethod
-    def apply_covid_effect(df: pd.DataFrame) -> pd.DataFrame:
+    def apply_covid_effect(
+        df: pd.DataFrame,
+        rng: Optional[np.random.Generator] = None,
+        streams: Optional[CustomerStreams] = None
+    ) -> pd.DataFrame:
         """2022 yılı için COVID-19 etkisini uygular, toplam satır sayısını değiştirmeden.
         
         Not: Bu fonksiyon sadece 2022 yılı için COVID-19 etkisini uygular çünkü
         pandemi etkisi 2022 yılında daha belirgindi. 2023 ve 2024 yıllarında
         alışveriş davranışları normale dönmeye başladı.
         
+        Her 2022 satırı kendi düzgün sayılarıyla %15 olasılıkla azaltma, %25
+        olasılıkla online alışveriş değişikliği için seçilir; böylece bir satırın
+        sonucu diğer satırlara bağlı değildir. Azaltma ve artış çarpanları,
+        yeni nakliye türleri ve ödeme yöntemleri dizi olarak hesaplanır; satır
+        bazlı Python döngüsü yoktur.
+        
         Args:
             df: Müşteri verileri DataFrame'i
+            rng: Rastgele sayı üreteci (streams verilmezse; o da verilmezse Utils.default_rng() kullanılır)
+            streams: Müşteri bazlı rastgele akışlar
         
         Returns:
             COVID etkisi uygulanmış DataFrame
         """
-        # DataFrame'in kopyasını oluştur (tarih sütunu zaten apply_holiday_effect'te datetime'a çevrildi)
+        # DataFrame'in kopyasını oluştur
         df = df.copy()
         
         # 2022 yılındaki satırları belirle
-        mask_2022 = df['Purchase Date'].dt.year == 2022
-        indices_2022 = df.index[mask_2022].tolist()
+        mask_2022 = DateTimeUtils.ordinal_parts(DateTimeUtils.date_ordinals(df['Purchase Date']))[0] == 2022
         
-        if not indices_2022:  # Eğer 2022 yılında satır yoksa, değişiklik yapma
+        if not mask_2022.any():  # Eğer 2022 yılında satır yoksa, değişiklik yapma
             return df
         
-        # Rastgele %15 oranında 2022 satırlarının satın alma miktarlarını azalt (mağaza içi alışveriş azalması)
-        indices_to_reduce = np.random.choice(indices_2022, size=int(len(indices_2022) * 0.15), replace=False)
-        for idx in indices_to_reduce:
-            # Satın alma miktarını azalt
-            reduction_factor = 0.7 + np.random.random() * 0.2  # 0.7 ile 0.9 arasında
-            df.at[idx, 'Purchase Amount (USD)'] = df.at[idx, 'Purchase Amount (USD)'] * reduction_factor
+        # Satır başına düzgün sayılar: azaltma seçimi ve çarpanı, değişiklik seçimi, nakliye, ödeme, artış çarpanı
+        uniforms = HolidayAdjuster.row_uniforms(df, CustomerStreams.COVID, 6, rng, streams)
+        shipping_sampler = StatisticalUtils.create_sampler(['Express', '2-Day Shipping', 'Next Day Air'], [0.5, 0.3, 0.2])
+        payment_sampler = StatisticalUtils.create_sampler(['Credit Card', 'PayPal', 'Apple Pay', 'Google Pay'], [0.5, 0.3, 0.1, 0.1])
+        
+        # Tüm 2022 satırları için değerler tek seferde hesaplanır ve her sütuna bir kez yazılır
+        amounts = df['Purchase Amount (USD)'].to_numpy(dtype=np.float64).copy()
+        
+        # 2022 satırlarının %15'inin satın alma miktarlarını azalt (mağaza içi alışveriş azalması)
+        reduced_rows = np.flatnonzero(mask_2022 & (uniforms[:, 0] < 0.15))
+        amounts[reduced_rows] *= 0.7 + uniforms[reduced_rows, 1] * 0.2  # 0.7 ile 0.9 arasında
         
         # 2022 satırlarının %25'inin nakliye türünü ve ödeme yöntemini değiştir (online alışveriş artışı)
-        indices_to_modify = np.random.choice(indices_2022, size=int(len(indices_2022) * 0.25), replace=False)
-        for idx in indices_to_modify:
-            # Nakliye türünü değiştir - online alışveriş için express seçenekler
-            df.at[idx, 'Shipping Type'] = np.random.choice(['Express', '2-Day Shipping', 'Next Day Air'], p=[0.5, 0.3, 0.2])
-            
-            # Ödeme yöntemini online seçeneklere ayarla
-            df.at[idx, 'Payment Method'] = np.random.choice(['Credit Card', 'PayPal', 'Apple Pay', 'Google Pay'], p=[0.5, 0.3, 0.1, 0.1])
-            
-            # Satın alma miktarını biraz artır (online alışveriş teşvikleri nedeniyle)
-            increase_factor = 1.05 + np.random.random() * 0.1  # 1.05 ile 1.15 arasında
-            df.at[idx, 'Purchase Amount (USD)'] = min(df.at[idx, 'Purchase Amount (USD)'] * increase_factor, 100.0)
+        online_rows = np.flatnonzero(mask_2022 & (uniforms[:, 2] < 0.25))
+        
+        # Satın alma miktarını biraz artır (online alışveriş teşvikleri nedeniyle)
+        increase_factors = 1.05 + uniforms[online_rows, 5] * 0.1  # 1.05 ile 1.15 arasında
+        amounts[online_rows] = np.minimum(amounts[online_rows] * increase_factors, 100.0)
+        df['Purchase Amount (USD)'] = amounts
+        
+        # Nakliye türü online alışveriş için express seçenekler, ödeme yöntemi online seçenekler
+        df.iloc[online_rows, df.columns.get_loc('Shipping Type')] = shipping_sampler.pick(uniforms[online_rows, 3])
+        df.iloc[online_rows, df.columns.get_loc('Payment Method')] = payment_sampler.pick(uniforms[online_rows, 4])
         
         return df
     
     @staticmethod
-    def redistribute_sales_by_target(df: pd.DataFrame) -> pd.DataFrame:
+    def redistribute_sales_by_target(df: pd.DataFrame, streams: Optional[CustomerStreams] = None) -> pd.DataFrame:
         """Satış sayılarını hedef değerlere göre yeniden dağıtır.
         
-        Bu fonksiyon, ay bazında satış sayılarını hedef değerlere daha yakın hale getirir.
-        Özellikle, Ocak 2024'teki fazla satışları azaltıp, Kasım ve Aralık 2024'teki satışları artırır.
+        Bu fonksiyon, 2024 yılı ay bazında satış sayılarını SALES_DATA hedeflerine
+        daha yakın hale getirir: hedefin üzerindeki aylardaki fazla satışlar
+        hedefin altındaki aylara taşınır (bkz. plan_sales_redistribution).
+        
+        Taşınacak satırlar ve yeni günleri satır bazlı REDISTRIBUTE akışından
+        seçilir (bkz. plan_moves); tarihler tek seferde yazılır. Bu yüzden akış
+        halinde yazım ve artımlı güncelleme aynı satırları taşır.
         
         Args:
             df: Müşteri verileri DataFrame'i
+            streams: Müşteri bazlı rastgele akışlar
             
         Returns:
             Yeniden dağıtılmış DataFrame
         """
         print("Satış sayıları hedef değerlere göre yeniden dağıtılıyor...")
-        
-        # Satış verilerini içe aktar
-        from sales_data import SALES_DATA
+        streams = streams if streams is not None else CustomerStreams()
         
         # DataFrame'in kopyasını oluştur
         df = df.copy()
         
-        # Tarih sütununu datetime formatına çevir
-        df['Purchase Date'] = pd.to_datetime(df['Purchase Date'])
-        
-        # 2024 yılı için hedef satış rakamları
-        target_sales_2024 = SALES_DATA[2024]
-        
-        # 2024 yılı verilerini filtrele
-        df_2024 = df[df['Purchase Date'].dt.year == 2024].copy()
+        # Tarihler gün sıralarıyla işlenir
+        df['Purchase Date'] = DateTimeUtils.ordinal_column(DateTimeUtils.date_ordinals(df['Purchase Date']))
         
-        # Ay bazında satış sayılarını hesapla
-        month_counts = df_2024.groupby(df_2024['Purchase Date'].dt.month).size()
+        # 2024 yılı için ay bazında satış sayılarını hesapla
+        month_counts = HolidayAdjuster.month_counts_2024(df)
         
-        # Toplam satış sayısı
-        total_sales = len(df_2024)
+        target_counts, outgoing, incoming = HolidayAdjuster.plan_sales_redistribution(
+            {month: int(month_counts[month]) for month in range(1, 13)}
+        )
         
-        # Hedef satış oranlarını hesapla - Utils sınıfını kullanarak normalize et
-        from final_generate1 import Utils
-        target_ratios = Utils.normalize_weights(target_sales_2024)
-        
-        # Ay bazında hedef satış sayılarını hesapla
-        target_counts = {month: int(ratio * total_sales) for month, ratio in target_ratios.items()}
-        
-        # Ay bazında fazla/eksik satış sayılarını hesapla
-        diff_counts = {}
-        for month in range(1, 13):
-            current = month_counts.get(month, 0)
-            target = target_counts.get(month, 0)
-            diff_counts[month] = current - target
-        
-        # Ocak ayındaki fazla satışları Kasım ve Aralık aylarına taşı
-        if diff_counts[1] > 0:  # Ocak ayında fazla satış varsa
-            # Kasım ve Aralık aylarına taşınacak satış sayısı
-            to_move = min(diff_counts[1], 2000)  # En fazla 2000 satış taşı
-            
-            # Kasım ve Aralık aylarına eşit olarak dağıt
-            to_november = to_move // 2
-            to_december = to_move - to_november
-            
-            print(f"Ocak ayından {to_november} satış Kasım ayına, {to_december} satış Aralık ayına taşınıyor...")
+        # Hedefin üzerindeki aylardaki fazla satışları hedefin altındaki aylara taşı
+        if outgoing.sum() > 0:
+            HolidayAdjuster.print_moves(outgoing, incoming)
             
-            # Ocak ayından rastgele satırları seç
-            january_indices = df_2024[df_2024['Purchase Date'].dt.month == 1].index.tolist()
-            if len(january_indices) > to_move:
-                indices_to_move = np.random.choice(january_indices, size=to_move, replace=False)
-                
-                # Kasım ayına taşınacak satırlar
-                november_indices = indices_to_move[:to_november]
-                
-                # Aralık ayına taşınacak satırlar
-                december_indices = indices_to_move[to_november:]
-                
-                # Kasım ayına taşı
-                for idx in november_indices:
-                    # Rastgele bir gün seç (Black Friday etkisi için son 10 gün ağırlıklı)
-                    # Olasılık değerlerini oluştur
-                    nov_probs_dict = {d: 0.02 if d < 20 else 0.05 for d in range(1, 31)}
-                    # Utils sınıfını kullanarak normalize et
-                    from final_generate1 import Utils
-                    nov_probs_dict = Utils.normalize_weights(nov_probs_dict)
-                    nov_probs = [nov_probs_dict[d] for d in range(1, 31)]
-                    
-                    day = np.random.choice(
-                        range(1, 31),
-                        p=nov_probs  # 20-30 Kasım için daha yüksek olasılık
-                    )
-                    new_date = datetime(2024, 11, day)
-                    df.at[idx, 'Purchase Date'] = new_date
-                
-                # Aralık ayına taşı
-                for idx in december_indices:
-                    # Rastgele bir gün seç (Yılbaşı etkisi için son 10 gün ağırlıklı)
-                    # Olasılık değerlerini oluştur
-                    dec_probs_dict = {d: 0.02 if d < 20 else 0.05 for d in range(1, 32)}
-                    # Utils sınıfını kullanarak normalize et
-                    from final_generate1 import Utils
-                    dec_probs_dict = Utils.normalize_weights(dec_probs_dict)
-                    dec_probs = [dec_probs_dict[d] for d in range(1, 32)]
-                    
-                    day = np.random.choice(
-                        range(1, 32),
-                        p=dec_probs  # 20-31 Aralık için daha yüksek olasılık
-                    )
-                    new_date = datetime(2024, 12, day)
-                    df.at[idx, 'Purchase Date'] = new_date
-        
-        # Diğer aylar için de benzer işlemleri yapabiliriz, ancak şimdilik sadece Ocak-Kasım-Aralık düzeltmesi yeterli
+            # Her aydan anahtarı en küçük satırları seç ve yeni tarihlerini ata
+            moved_ids, moved_counters, new_dates = HolidayAdjuster.plan_moves(
+                HolidayAdjuster.month_candidates(df), outgoing, incoming, streams
+            )
+            rows, found = HolidayAdjuster.match_rows(
+                df['Customer ID'].to_numpy(), pd.MultiIndex.from_arrays([moved_ids, moved_counters])
+            )
+            df, _ = HolidayAdjuster.replace_dates(df, rows, new_dates[found])
         
         # Yeniden dağıtım sonrası satış sayılarını hesapla
-        df_2024_new = df[df['Purchase Date'].dt.year == 2024]
-        new_month_counts = df_2024_new.groupby(df_2024_new['Purchase Date'].dt.month).size()
+        new_month_counts = HolidayAdjuster.month_counts_2024(df)
         
         print("Yeniden dağıtım sonrası 2024 yılı ay bazında satış sayıları:")
         for month in range(1, 13):
-            old_count = month_counts.get(month, 0)
-            new_count = new_month_counts.get(month, 0)
+            old_count = month_counts[month]
+            new_count = new_month_counts[month]
             target = target_counts.get(month, 0)
             print(f"Ay {month}: Önceki: {old_count}, Yeni: {new_count}, Hedef: {target}")
         
         return df
     
     @staticmethod
-    def apply_promo_codes(df: pd.DataFrame) -> pd.DataFrame:
+    def month_counts_2024(df: pd.DataFrame) -> np.ndarray:
+        """2024 aylık satış sayılarını indeksi ay olan uzunluk 13 dizi olarak döndürür."""
+        years, months, _ = DateTimeUtils.ordinal_parts(DateTimeUtils.date_ordinals(df['Purchase Date']))
+        return np.bincount(months[years == 2024], minlength=13)
+    
+    @staticmethod
+    def plan_sales_redistribution(month_counts: Dict[int, int]) -> Tuple[Dict[int, int], np.ndarray, np.ndarray]:
+        """2024 aylık satış sayılarından hedef sayıları ve aylar arası taşınacak satış sayılarını hesaplar.
+        
+        Hedefin üzerindeki her aydan fazlası kadar (en fazla MAX_REDISTRIBUTION)
+        satış çıkar; ayda en az bir satış kalır. Taşınan toplam, hedefin
+        altındaki ayların toplam eksiğini aşmaz ve eksiklerle orantılı
+        paylaştırılır (bkz. scale_counts).
+        
+        Args:
+            month_counts: Ay -> 2024 satış sayısı
+            
+        Returns:
+            (ay bazında hedef satış sayıları, aylardan çıkacak satış sayıları,
+            aylara girecek satış sayıları); son ikisi indeksi ay olan uzunluk 13 dizilerdir
+        """
+        # Satış verilerini içe aktar
+        from sales_data import SALES_DATA
+        
+        # Hedef satış oranlarını hesapla
+        target_ratios = Utils.normalize_weights(SALES_DATA[2024])
+        
+        # Ay bazında hedef satış sayılarını hesapla
+        total_sales = sum(month_counts.values())
+        target_counts = {month: int(ratio * total_sales) for month, ratio in target_ratios.items()}
+        
+        counts = np.array([month_counts.get(month, 0) for month in range(13)], dtype=np.int64)
+        targets = np.array([target_counts.get(month, 0) for month in range(13)], dtype=np.int64)
+        excess = counts - targets
+        excess[0] = 0
+        
+        # Fazla satışlar (ay başına en fazla MAX_REDISTRIBUTION) ve eksikler
+        outgoing = np.minimum(np.maximum(excess, 0), HolidayAdjuster.MAX_REDISTRIBUTION)
+        outgoing[counts <= outgoing] = 0
+        deficits = np.maximum(-excess, 0)
+        
+        to_move = int(min(outgoing.sum(), deficits.sum()))
+        return (
+            target_counts,
+            HolidayAdjuster.scale_counts(outgoing, to_move),
+            HolidayAdjuster.scale_counts(deficits, to_move)
+        )
+    
+    @staticmethod
+    def scale_counts(counts: np.ndarray, total: int) -> np.ndarray:
+        """Negatif olmayan tam sayıları toplamları total olacak şekilde orantılı küçültür.
+        
+        Yuvarlamadan kalan birimler kesir kısmı en büyük elemanlara verilir;
+        total, counts toplamından büyük olmamalıdır.
+        """
+        counts_sum = int(counts.sum())
+        if total >= counts_sum:
+            return counts.copy()
+        scaled = counts * total // counts_sum
+        fractions = counts * total % counts_sum
+        scaled[np.argsort(-fractions, kind='stable')[:total - int(scaled.sum())]] += 1
+        return scaled
+    
+    @staticmethod
+    def print_moves(outgoing: np.ndarray, incoming: np.ndarray) -> None:
+        """Aylardan çıkan ve aylara giren satış sayılarını yazdırır."""
+        moves_out = ', '.join(f"Ay {month}: {int(outgoing[month])}" for month in np.flatnonzero(outgoing))
+        moves_in = ', '.join(f"Ay {month}: {int(incoming[month])}" for month in np.flatnonzero(incoming))
+        print(f"Toplam {int(outgoing.sum())} satış taşınıyor. Çıkan: {moves_out}. Giren: {moves_in}")
+    
+    @staticmethod
+    def month_candidates(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """2024 satırlarını (müşteri kimlikleri, müşteri içi satır sıraları, aylar) olarak döndürür.
+        
+        df müşterilerin tüm satırlarını içermelidir; satır sırası
+        CustomerStreams.row_uniforms'taki sayaçla aynıdır.
+        """
+        customer_ids = df['Customer ID'].to_numpy()
+        counters = pd.Series(customer_ids).groupby(customer_ids, sort=False).cumcount().to_numpy()
+        years, months, _ = DateTimeUtils.ordinal_parts(DateTimeUtils.date_ordinals(df['Purchase Date']))
+        in_2024 = years == 2024
+        return customer_ids[in_2024], counters[in_2024], months[in_2024]
+    
+    @staticmethod
+    def merge_candidates(
+        candidates: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        new_candidates: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        thresholds: np.ndarray,
+        streams: CustomerStreams
+    ) -> Tuple[Tuple[np.ndarray, np.ndarray, np.ndarray], np.ndarray]:
+        """2024 aday listesine yeni satırları ekler ve her ayın anahtarı en küçük satırlarını tutar.
+        
+        Liste, her ay için yeniden dağıtım anahtarı o ayın eşiğinden küçük tüm
+        2024 satırlarını içerir. Bir ayın adayları REDISTRIBUTION_CANDIDATES
+        satırı aşınca kırpılır ve o ayın eşiği ilk atılan satırın anahtarına iner.
+        
+        Returns:
+            (aday listesi, yeni aylık eşikler (uzunluk 13))
+        """
+        customer_ids, counters, months = (
+            np.concatenate([old, new]) for old, new in zip(candidates, new_candidates)
+        )
+        if np.bincount(months, minlength=13).max() > HolidayAdjuster.REDISTRIBUTION_CANDIDATES:
+            keys = streams.uniforms(customer_ids, counters, CustomerStreams.REDISTRIBUTE)[:, 0]
+            order = np.lexsort((keys, months))
+            sorted_months = months[order]
+            ranks = np.arange(len(order)) - np.searchsorted(sorted_months, sorted_months)
+            first_dropped = order[ranks == HolidayAdjuster.REDISTRIBUTION_CANDIDATES]
+            thresholds = thresholds.copy()
+            thresholds[months[first_dropped]] = np.minimum(thresholds[months[first_dropped]], keys[first_dropped])
+            keep = np.sort(order[ranks < HolidayAdjuster.REDISTRIBUTION_CANDIDATES])
+            customer_ids, counters, months = customer_ids[keep], counters[keep], months[keep]
+        return (customer_ids, counters, months), thresholds
+    
+    @staticmethod
+    def candidates_cover(
+        candidates: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        thresholds: np.ndarray,
+        outgoing: np.ndarray,
+        streams: CustomerStreams
+    ) -> bool:
+        """Aday listesinin her aydan çıkacak, anahtarı en küçük satırları kesin olarak içerip içermediğini döndürür."""
+        customer_ids, counters, months = candidates
+        if (np.bincount(months, minlength=13) < outgoing).any():
+            return False
+        keys = streams.uniforms(customer_ids, counters, CustomerStreams.REDISTRIBUTE)[:, 0]
+        for month in np.flatnonzero(outgoing):
+            month_keys = np.sort(keys[months == month])
+            if month_keys[outgoing[month] - 1] >= thresholds[month]:
+                return False
+        return True
+    
+    @staticmethod
+    def track_sales(
+        df: pd.DataFrame,
+        month_counts: np.ndarray,
+        candidates: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        thresholds: np.ndarray,
+        streams: CustomerStreams
+    ) -> Tuple[np.ndarray, Tuple[np.ndarray, np.ndarray, np.ndarray], np.ndarray]:
+        """Bir parçanın 2024 aylık satış sayılarını ve 2024 yeniden dağıtım adaylarını biriktirir.
+        
+        Returns:
+            (2024 aylık satış sayıları, aday listesi, aylık aday eşikleri)
+        """
+        new_candidates = HolidayAdjuster.month_candidates(df)
+        month_counts = month_counts + np.bincount(new_candidates[2], minlength=13)
+        candidates, thresholds = HolidayAdjuster.merge_candidates(candidates, new_candidates, thresholds, streams)
+        return month_counts, candidates, thresholds
+    
+    @staticmethod
+    def relocation_calendar() -> DataTypes.DayWeightCalendar:
+        """Taşınan satışların yeni günleri için 2024 gün ağırlıkları takvimi.
+        
+        Kasım ve Aralık'ta Black Friday / yılbaşı etkisi için 20. gün ve
+        sonrası daha olasıdır; diğer aylarda günler eşit olasılıklıdır.
+        """
+        year_start = np.datetime64('2024-01-01', 'D')
+        _, months, days = DateTimeUtils.ordinal_parts(year_start + np.arange(366))
+        day_weights = np.where((months >= 11) & (days >= 20), 0.05, 0.02)
+        month_starts = np.array(
+            [(np.datetime64(f'2024-{month:02d}', 'M').astype('datetime64[D]') - year_start).astype(np.int64)
+             for month in range(1, 13)] + [366],
+            dtype=np.int64
+        )
+        return DataTypes.DayWeightCalendar(
+            years=(2024,),
+            day_weights=day_weights[np.newaxis, :],
+            cumulative_weights=np.concatenate(
+                [np.cumsum(day_weights[start:end]) for start, end in zip(month_starts[:-1], month_starts[1:])]
+            )[np.newaxis, :],
+            month_starts=month_starts[np.newaxis, :]
+        )
+    
+    @staticmethod
+    def plan_moves(
+        candidates: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        outgoing: np.ndarray,
+        incoming: np.ndarray,
+        streams: CustomerStreams
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Taşınacak 2024 satırlarını ve yeni tarihlerini tek seferde belirler.
+        
+        Her ayın adayları arasından yeniden dağıtım anahtarı en küçük
+        outgoing[ay] satır seçilir. Seçilen satırlar anahtara göre sıralanıp
+        sırayla hedef aylara incoming sayıları kadar dağıtılır. Yeni gün
+        satırın ikinci düzgün sayısıyla relocation_calendar'dan çekilir.
+        
+        Returns:
+            (müşteri kimlikleri, müşteri içi satır sıraları, yeni tarihler (datetime64[D]))
+        """
+        customer_ids, counters, months = candidates
+        uniforms = streams.uniforms(customer_ids, counters, CustomerStreams.REDISTRIBUTE, 2)
+        
+        # Her ayın anahtarı en küçük outgoing[ay] satırı
+        order = np.lexsort((counters, customer_ids, uniforms[:, 0], months))
+        sorted_months = months[order]
+        ranks = np.arange(len(order)) - np.searchsorted(sorted_months, sorted_months)
+        selected = order[ranks < outgoing[sorted_months]]
+        
+        # Seçilen satırlar anahtar sırasıyla hedef aylara
+        selected = selected[np.lexsort((counters[selected], customer_ids[selected], uniforms[selected, 0]))]
+        target_months = np.repeat(np.arange(13), incoming)
+        new_dates = DateTimeUtils.draw_calendar_days(
+            HolidayAdjuster.relocation_calendar(), np.zeros(len(selected), dtype=np.int64), target_months,
+            uniforms[selected, 1]
+        )
+        return customer_ids[selected], counters[selected], new_dates.astype('datetime64[D]')
+    
+    @staticmethod
+    def match_rows(
+        customer_ids: np.ndarray,
+        targets: pd.MultiIndex,
+        seen: Optional[Dict[Any, int]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Bir parçadaki satırları (müşteri kimliği, müşteri içi satır sırası) hedefleriyle eşler.
+        
+        Args:
+            customer_ids: Parçanın 'Customer ID' sütunu
+            targets: Aranan (müşteri kimliği, satır sırası) çiftleri
+            seen: Dosya parça parça okunuyorsa, hedef müşterilerin önceki
+                parçalardaki satır sayıları (yerinde güncellenir)
+        
+        Returns:
+            (parçadaki satır konumları, targets içindeki karşılık gelen konumlar)
+        """
+        seen = seen if seen is not None else {}
+        positions = np.flatnonzero(np.isin(customer_ids, targets.get_level_values(0)))
+        if len(positions) == 0:
+            return positions, positions
+        target_ids = customer_ids[positions]
+        counters = pd.Series(target_ids).groupby(target_ids, sort=False).cumcount().to_numpy()
+        counters = counters + np.array([seen.get(customer_id, 0) for customer_id in target_ids], dtype=np.int64)
+        for customer_id, count in zip(*np.unique(target_ids, return_counts=True)):
+            seen[customer_id] = seen.get(customer_id, 0) + int(count)
+        found = targets.get_indexer(pd.MultiIndex.from_arrays([target_ids, counters]))
+        hit = found >= 0
+        return positions[hit], found[hit]
+    
+    @staticmethod
+    def replace_dates(df: pd.DataFrame, rows: np.ndarray, new_dates: np.ndarray) -> Tuple[pd.DataFrame, np.ndarray]:
+        """rows konumlarındaki satırların 'Purchase Date' değerlerini değiştirir.
+        
+        Returns:
+            (güncellenmiş DataFrame, satırların önceki tarihleri (datetime64[D]))
+        """
+        ordinals = DateTimeUtils.date_ordinals(df['Purchase Date'])
+        previous_dates = ordinals[rows].astype('datetime64[D]')
+        ordinals[rows] = DateTimeUtils.date_ordinals(new_dates)
+        df['Purchase Date'] = DateTimeUtils.ordinal_column(ordinals)
+        return df, previous_dates
+    
+    @staticmethod
+    def redistribute_sales_in_file(
+        output_file: str,
+        month_counts: np.ndarray,
+        candidates: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        chunk_size: int = 100_000,
+        output_format: str = 'csv',
+        categories: Optional[Dict[str, List[str]]] = None,
+        streams: Optional[CustomerStreams] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """redistribute_sales_by_target'ın akış halinde yazılmış dosya için sürümü.
+        
+        Parçalar boyunca toplanan 2024 aylık satış sayılarını ve aylık aday
+        listelerini (bkz. track_sales) kullanır. Taşıma gerekiyorsa dosya
+        parça parça okunur, seçilen satırların tarihleri ve tarihten türetilen
+        sütunlar (bkz. DerivedFeatures) güncellenir ve dosya yeniden yazılır.
+        
+        Args:
+            output_file: Akış halinde yazılmış çıktı dosyası
+            month_counts: İndeksi ay olan 2024 satış sayıları (uzunluk 13)
+            candidates: Her ayın anahtarı en küçük 2024 satırları (müşteri kimlikleri, satır sıraları, aylar)
+            chunk_size: Düzeltme geçişinde bir seferde okunan satır sayısı
+            output_format: Çıktı dosyasının biçimi ('csv', 'parquet' veya 'feather')
+            categories: Parquet/Feather için sözlük değerleri (bkz. OutputWriter.output_categories)
+            streams: Müşteri bazlı rastgele akışlar
+        
+        Returns:
+            Taşınan satırların (müşteri kimlikleri, müşteri içi satır sıraları, özgün tarihleri)
+        """
+        import os
+        streams = streams if streams is not None else CustomerStreams()
+        
+        print("Satış sayıları hedef değerlere göre yeniden dağıtılıyor...")
+        counts = {month: int(month_counts[month]) for month in range(1, 13)}
+        target_counts, outgoing, incoming = HolidayAdjuster.plan_sales_redistribution(counts)
+        for month in range(1, 13):
+            print(f"Ay {month}: Mevcut: {counts[month]}, Hedef: {target_counts.get(month, 0)}")
+        if outgoing.sum() == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype='datetime64[D]')
+        
+        HolidayAdjuster.print_moves(outgoing, incoming)
+        moved_ids, moved_counters, new_dates = HolidayAdjuster.plan_moves(candidates, outgoing, incoming, streams)
+        targets = pd.MultiIndex.from_arrays([moved_ids, moved_counters])
+        original_dates = np.empty(len(new_dates), dtype='datetime64[D]')
+        seen: Dict[Any, int] = {}
+        
+        temp_file = output_file + '.tmp'
+        writer = OutputWriter(temp_file, output_format, categories)
+        for chunk_df in OutputWriter.read_chunks(output_file, output_format, chunk_size):
+            rows, found = HolidayAdjuster.match_rows(chunk_df['Customer ID'].to_numpy(), targets, seen)
+            if len(rows):
+                chunk_df, original_dates[found] = HolidayAdjuster.replace_dates(chunk_df, rows, new_dates[found])
+                chunk_df = DerivedFeatures.apply(chunk_df)
+            writer.write(chunk_df)
+        writer.close()
+        os.replace(temp_file, output_file)
+        return moved_ids, moved_counters, original_dates
+    
+    @staticmethod
+    def add_weekday_columns(df: pd.DataFrame) -> pd.DataFrame:
+        """WeekdayNum, Weekday ve Weekend sütunlarını 'Purchase Date' sütunundan hesaplar (bkz. DerivedFeatures)."""
+        return DerivedFeatures.apply(df, columns=DerivedFeatures.WEEKDAY_COLUMNS)
+    
+    @staticmethod
+    def apply_promo_codes(
+        df: pd.DataFrame,
+        verbose: bool = True,
+        rng: Optional[np.random.Generator] = None,
+        streams: Optional[CustomerStreams] = None
+    ) -> pd.DataFrame:
         """Müşteri bazında promosyon kodu kullanımını uygular.
         
-        Subscription Status 1 (üyelik durumu aktif) olan müşterilerin %35'inin alışverişlerinde,
-        Subscription Status 0 (üye olmayan) müşterilerin %15'inin alışverişlerinde promosyon kodu
+        Subscription Status 'Yes' (üyelik durumu aktif, Constants.SUBSCRIBED_STATUS) olan müşterilerin
+        %35'inin alışverişlerinde, 'No' (üye olmayan) müşterilerin %15'inin alışverişlerinde promosyon kodu
         kullanıldığını belirten yeni bir sütun ekler. Promosyon kodu kullanımı tek bir müşterinin
         tüm alışverişlerine değil, farklı müşterilerin alışverişlerine dağıtılır.
         
+        Seçim tek seferde yapılır: müşteri başına hedef sayı int(alışveriş sayısı
+        * oran) olarak hesaplanır ve satırlar (müşteri, satır anahtarı) çiftine
+        göre sıralanarak her müşterinin en küçük anahtarlı satırları işaretlenir.
+        
         Args:
             df: Müşteri alışveriş verileri DataFrame'i
+            verbose: False ise istatistikler yazdırılmaz (parça parça işlemede)
+            rng: Rastgele sayı üreteci (streams verilmezse; o da verilmezse Utils.default_rng() kullanılır)
+            streams: Müşteri bazlı rastgele akışlar; her müşterinin seçimi kendi satırlarına bağlıdır
             
         Returns:
             Promosyon kodu sütunu eklenmiş DataFrame
         """
-        print("Promosyon kodu kullanımı uygulanıyor...")
+        if verbose:
+            print("Promosyon kodu kullanımı uygulanıyor...")
         
         # DataFrame'in kopyasını oluştur
         df = df.copy()
         
-        # Promosyon kodu sütununu ekle, varsayılan olarak 0 (kullanılmadı)
-        df['Promo Code Used'] = 0
+        # Satır başına üyelik durumu (sütun metin veya pd.Categorical olabilir)
+        subscribed_rows = (df['Subscription Status'] == Constants.SUBSCRIBED_STATUS).to_numpy()
         
-        # Müşteri kimliklerine göre verileri grupla
-        customer_groups = df.groupby('Customer ID')
+        # Satır başına seçim anahtarı: her müşterinin en küçük anahtarlı alışverişleri seçilir
+        promo_keys = HolidayAdjuster.row_uniforms(df, CustomerStreams.PROMO, 1, rng, streams)[:, 0]
         
-        # Her müşteri için ayrı ayrı işlem yap
-        for customer_id, customer_df in customer_groups:
-            # Müşterinin abonelik durumunu belirle
-            subscription_status = customer_df['Subscription Status'].iloc[0]
-            
-            # Hedef promosyon kodu kullanım oranını belirle
-            if subscription_status == 1:
-                target_promo_ratio = 0.35  # Aboneliği olan müşteriler için %35
-            else:
-                target_promo_ratio = 0.15  # Aboneliği olmayan müşteriler için %15
-            
-            # Müşterinin kaç alışverişinde promosyon kodu kullanılacağını hesapla
-            num_purchases = len(customer_df)
-            num_promo_uses = int(num_purchases * target_promo_ratio)
-            
-            if num_promo_uses > 0:
-                # Rastgele alışveriş indekslerini seç
-                indices_to_apply = np.random.choice(
-                    customer_df.index.tolist(), 
-                    size=num_promo_uses, 
-                    replace=False
-                )
-                
-                # Seçilen alışverişlere promosyon kodu kullanımını uygula
-                df.loc[indices_to_apply, 'Promo Code Used'] = 1
+        # Müşteri kodları (ilk görülme sırasıyla) ve müşteri başına alışveriş sayıları
+        customer_codes, _ = pd.factorize(df['Customer ID'])
+        purchase_counts = np.bincount(customer_codes)
+        first_rows = np.unique(customer_codes, return_index=True)[1]
+        
+        # Hedef promosyon kodu kullanım oranı müşterinin ilk satırındaki abonelik durumuna göre belirlenir:
+        # üyeler ('Yes') için %35, diğerleri için %15
+        subscribed = subscribed_rows[first_rows]
+        promo_counts = (purchase_counts * np.where(subscribed, 0.35, 0.15)).astype(np.int64)
+        
+        # Müşteri içinde anahtar sırası: (müşteri, anahtar) sıralamasında grubun başından uzaklık
+        order = np.lexsort((promo_keys, customer_codes))
+        group_starts = np.cumsum(purchase_counts) - purchase_counts
+        key_ranks = np.empty(len(df), dtype=np.int64)
+        key_ranks[order] = np.arange(len(df)) - group_starts[customer_codes[order]]
+        
+        # Her müşterinin en küçük anahtarlı int(alışveriş sayısı * oran) alışverişinde promosyon kodu kullanılır
+        df['Promo Code Used'] = (key_ranks < promo_counts[customer_codes]).astype(np.int64)
+        
+        if not verbose:
+            return df
         
         # Promosyon kodu kullanım istatistiklerini göster
-        sub_status_1_count = len(df[df['Subscription Status'] == 1])
-        sub_status_0_count = len(df[df['Subscription Status'] == 0])
+        promo_used = df['Promo Code Used'].to_numpy() == 1
+        sub_status_1_count = int(subscribed_rows.sum())
+        sub_status_0_count = int((~subscribed_rows).sum())
         
-        promo_used_sub_1 = len(df[(df['Subscription Status'] == 1) & (df['Promo Code Used'] == 1)])
-        promo_used_sub_0 = len(df[(df['Subscription Status'] == 0) & (df['Promo Code Used'] == 1)])
+        promo_used_sub_1 = int((subscribed_rows & promo_used).sum())
+        promo_used_sub_0 = int((~subscribed_rows & promo_used).sum())
         
         # Sıfıra bölme hatalarını önlemek için kontrol ekliyoruz
         if sub_status_1_count > 0:
             promo_percent_1 = (promo_used_sub_1 / sub_status_1_count) * 100
-            print(f"Subscription Status 1 (Üyeler): Toplam {sub_status_1_count} alışveriş, "
+            print(f"Subscription Status Yes (Üyeler): Toplam {sub_status_1_count} alışveriş, "
                   f"{promo_used_sub_1} alışverişte promosyon kodu kullanıldı ({promo_percent_1:.2f}%)")
         else:
-            print(f"Subscription Status 1 (Üyeler): Veri yok")
+            print(f"Subscription Status Yes (Üyeler): Veri yok")
         
         if sub_status_0_count > 0:
             promo_percent_0 = (promo_used_sub_0 / sub_status_0_count) * 100
-            print(f"Subscription Status 0 (Üye olmayanlar): Toplam {sub_status_0_count} alışveriş, "
+            print(f"Subscription Status No (Üye olmayanlar): Toplam {sub_status_0_count} alışveriş, "
                   f"{promo_used_sub_0} alışverişte promosyon kodu kullanıldı ({promo_percent_0:.2f}%)")
         else:
-            print(f"Subscription Status 0 (Üye olmayanlar): Veri yok")
+            print(f"Subscription Status No (Üye olmayanlar): Veri yok")
         
         return df
     
     @staticmethod
-    def apply_adjustments(df: pd.DataFrame) -> pd.DataFrame:
-        """Tatil etkisi ve COVID-19 etkisi gibi çeşitli ayarlamaları uygular."""
+    def apply_row_adjustments(
+        df: pd.DataFrame,
+        holidays: List[Tuple[datetime, str, float]],
+        profiler: Optional[StageProfiler] = None,
+        streams: Optional[CustomerStreams] = None
+    ) -> pd.DataFrame:
+        """Satır/müşteri bazlı ayarlamaları (tatil, COVID, promosyon kodu, türetilmiş sütunlar) bir parçaya uygular.
+        
+        Parça, müşterilerin tüm satırlarını içermelidir; streams verilirse
+        sonuç parçanın hangi müşterileri birlikte içerdiğine bağlı değildir.
+        """
+        profiler = profiler if profiler is not None else StageProfiler()
+        streams = streams if streams is not None else CustomerStreams()
+        
+        with profiler.stage('apply_holiday_effect', rows_in=len(df)) as stage:
+            df = HolidayAdjuster.apply_holiday_effect(df, holidays, streams=streams)
+            stage['rows_out'] = len(df)
+        with profiler.stage('apply_covid_effect', rows_in=len(df)) as stage:
+            df = HolidayAdjuster.apply_covid_effect(df, streams=streams)
+            stage['rows_out'] = len(df)
+        with profiler.stage('apply_promo_codes', rows_in=len(df)) as stage:
+            df = HolidayAdjuster.apply_promo_codes(df, verbose=False, streams=streams)
+            stage['rows_out'] = len(df)
+        with profiler.stage('add_derived_columns', rows_in=len(df)) as stage:
+            df = DerivedFeatures.apply(df, holidays)
+            stage['rows_out'] = len(df)
+        return df
+    
+    @staticmethod
+    def apply_adjustments(
+        df: pd.DataFrame,
+        profiler: Optional[StageProfiler] = None,
+        seed: int = Constants.RANDOM_SEED
+    ) -> pd.DataFrame:
+        """Tatil etkisi ve COVID-19 etkisi gibi çeşitli ayarlamaları uygular.
+        
+        Tüm aşamalar CustomerStreams(seed) akışlarını kullanır; satış yeniden
+        dağıtımı da taşınacak satırları satır bazlı anahtarlarla seçer.
+        """
         print("Veri ayarlamaları uygulanıyor...")
+        profiler = profiler if profiler is not None else StageProfiler()
+        streams = CustomerStreams(seed)
         
         # 2022, 2023 ve 2024 için tatil günlerini al
-        all_holidays = []
-        for year in range(2022, 2025):
-            holidays = HolidayAdjuster.convert_holidays_to_list(year)
-            all_holidays.extend(holidays)
+        all_holidays = HolidayAdjuster.all_holidays([2022, 2023, 2024])
         
         # Tatil etkisini uygula
         print("Tatil günü etkisi uygulanıyor...")
-        holiday_adjusted_df = HolidayAdjuster.apply_holiday_effect(df, all_holidays)
+        with profiler.stage('apply_holiday_effect', rows_in=len(df)) as stage:
+            holiday_adjusted_df = HolidayAdjuster.apply_holiday_effect(df, all_holidays, streams=streams)
+            stage['rows_out'] = len(holiday_adjusted_df)
         
         # Covid etkisini uygula
         print("COVID-19 etkisi 2022 yılı için uygulanıyor...")
-        covid_adjusted_df = HolidayAdjuster.apply_covid_effect(holiday_adjusted_df)
+        with profiler.stage('apply_covid_effect', rows_in=len(holiday_adjusted_df)) as stage:
+            covid_adjusted_df = HolidayAdjuster.apply_covid_effect(holiday_adjusted_df, streams=streams)
+            stage['rows_out'] = len(covid_adjusted_df)
         
         # Satış sayılarını hedef değerlere göre yeniden dağıt
         print("Satış sayıları hedef değerlere göre yeniden dağıtılıyor...")
-        sales_adjusted_df = HolidayAdjuster.redistribute_sales_by_target(covid_adjusted_df)
+        with profiler.stage('redistribute_sales_by_target', rows_in=len(covid_adjusted_df)) as stage:
+            sales_adjusted_df = HolidayAdjuster.redistribute_sales_by_target(covid_adjusted_df, streams)
+            stage['rows_out'] = len(sales_adjusted_df)
         
         # Promosyon kodu kullanımını uygula
-        promo_adjusted_df = HolidayAdjuster.apply_promo_codes(sales_adjusted_df)
-        
-        # Haftanın günü bilgisini ekle
-        print("Haftanın günü bilgisi ekleniyor...")
-        # Tarih sütununun datetime formatında olduğundan emin ol
-        promo_adjusted_df['Purchase Date'] = pd.to_datetime(promo_adjusted_df['Purchase Date'])
-        
-        # Haftanın günü numarasını ekle (1: Pazartesi, 2: Salı, ..., 7: Pazar)
-        promo_adjusted_df['WeekdayNum'] = promo_adjusted_df['Purchase Date'].dt.dayofweek + 1
-        
-        # Haftanın günü ismini ekle (İngilizce)
-        day_names = {
-            1: 'Monday',
-            2: 'Tuesday',
-            3: 'Wednesday',
-            4: 'Thursday',
-            5: 'Friday',
-            6: 'Saturday',
-            7: 'Sunday'
-        }
-        promo_adjusted_df['Weekday'] = promo_adjusted_df['WeekdayNum'].map(day_names)
+        with profiler.stage('apply_promo_codes', rows_in=len(sales_adjusted_df)) as stage:
+            promo_adjusted_df = HolidayAdjuster.apply_promo_codes(sales_adjusted_df, streams=streams)
+            stage['rows_out'] = len(promo_adjusted_df)
         
-        # Hafta içi/sonu bilgisini ekle (0: Hafta içi, 1: Hafta sonu)
-        promo_adjusted_df['Weekend'] = promo_adjusted_df['WeekdayNum'].apply(lambda x: 1 if x >= 6 else 0)
+        # Haftanın günü, ay, hafta ve tatil yakınlığı sütunlarını ekle
+        print("Tarihten türetilen sütunlar ekleniyor...")
+        with profiler.stage('add_derived_columns', rows_in=len(promo_adjusted_df)) as stage:
+            promo_adjusted_df = DerivedFeatures.apply(promo_adjusted_df, all_holidays)
+            stage['rows_out'] = len(promo_adjusted_df)
         
         print(f"Özet:")
         print(f"Orijinal satın alma sayısı: {len(df)}")
@@ -496,8 +1650,8 @@ class HolidayAdjuster:
         print(f"Fark: {len(promo_adjusted_df) - len(df)} ({(len(promo_adjusted_df) - len(df)) / len(df) * 100:.2f}%)")
         
         # 2022 yılı karşılaştırması
-        orig_2022 = len(df[pd.to_datetime(df['Purchase Date']).dt.year == 2022])
-        adj_2022 = len(promo_adjusted_df[pd.to_datetime(promo_adjusted_df['Purchase Date']).dt.year == 2022])
+        orig_2022 = int((DateTimeUtils.ordinal_parts(DateTimeUtils.date_ordinals(df['Purchase Date']))[0] == 2022).sum())
+        adj_2022 = int((DateTimeUtils.ordinal_parts(DateTimeUtils.date_ordinals(promo_adjusted_df['Purchase Date']))[0] == 2022).sum())
         print(f"\n2022 satın alma sayısı (orijinal): {orig_2022}")
         print(f"2022 satın alma sayısı (düzeltilmiş): {adj_2022}")
         print(f"2022 değişim: {adj_2022 - orig_2022} ({(adj_2022 - orig_2022) / orig_2022 * 100:.2f}%)")
@@ -514,39 +1668,208 @@ class HolidayAdjuster:
         return promo_adjusted_df
 
 
-def main():
-    """Ana program akışı."""
-    # Rastgele sayı üreteci için sabit başlangıç değeri
-    print("Program başlatılıyor...")
-    random.seed(Constants.RANDOM_SEED)
-    np.random.seed(Constants.RANDOM_SEED)
+class DerivedFeatures:
+    """'Purchase Date' sütunundan türetilen özellik sütunları.
     
-    # Veri yükleme
-    print(f"{Constants.INPUT_FILE} dosyası yükleniyor...")
-    df = DataIO.load_data(Constants.INPUT_FILE)
+    Tarih bileşenleri (yıl, ay, gün, haftanın günü, en yakın tatile uzaklık)
+    gün sıralarından tek geçişte hesaplanır (bkz. DataTypes.DateParts). Her
+    özellik bu bileşenlerden tek bir dizi işlemiyle üretilir ve tüm sütunlar
+    tabloya tek seferde eklenir. Yeni bir sütun register ile eklenir; ayrı bir
+    tam tablo geçişi gerektirmez. Sayısal sütunların çıktı tipleri
+    OutputWriter.COLUMN_TYPES'ta tanımlıdır.
+    """
     
-    # Ürün verilerini tanımlama
-    print("Ürün verileri tanımlanıyor...")
-    product_data = ProductModel.define_product_data()
+    WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+    WEEKDAY_COLUMNS = ['WeekdayNum', 'Weekday', 'Weekend']
+    
+    # Sütun adı -> tarih bileşenlerinden sütun değerlerini üreten fonksiyon (sütunlar bu sırayla eklenir)
+    FEATURES: Dict[str, Callable[[DataTypes.DateParts], Any]] = {
+        # Haftanın günü numarası (1: Pazartesi, ..., 7: Pazar), İngilizce adı ve hafta sonu bayrağı
+        'WeekdayNum': lambda parts: (parts.weekdays + 1).astype(np.int8),
+        'Weekday': lambda parts: pd.Categorical.from_codes(parts.weekdays, categories=DerivedFeatures.WEEKDAY_NAMES),
+        'Weekend': lambda parts: (parts.weekdays >= 5).astype(np.int8),
+        'Month': lambda parts: parts.months.astype(np.int8),
+        'Quarter': lambda parts: ((parts.months - 1) // 3 + 1).astype(np.int8),
+        'ISOWeek': lambda parts: DerivedFeatures.iso_weeks(parts).astype(np.int8),
+        'DaysToHoliday': lambda parts: parts.holiday_distances.astype(np.int16),
+    }
+    
+    @staticmethod
+    def register(column: str, feature: Callable[[DataTypes.DateParts], Any]) -> None:
+        """Yeni bir türetilmiş sütun ekler; sonraki apply çağrıları bu sütunu da üretir."""
+        DerivedFeatures.FEATURES[column] = feature
+    
+    @staticmethod
+    def date_parts(
+        ordinals: np.ndarray,
+        holidays: Optional[List[Tuple[datetime, str, float]]] = None
+    ) -> DataTypes.DateParts:
+        """Gün sıralarından tarih bileşenlerini hesaplar.
+        
+        En yakın tatile uzaklık, satırların gün aralığı için bir kez kurulan
+        tatil tablosundan okunur (bkz. HolidayAdjuster.build_holiday_table);
+        holidays verilmezse Constants.YEAR_RANGE tatilleri kullanılır.
+        """
+        years, months, days = DateTimeUtils.ordinal_parts(ordinals)
+        holiday_distances = np.zeros(len(ordinals), dtype=np.int64)
+        if len(ordinals):
+            holidays = holidays if holidays is not None else HolidayAdjuster.all_holidays()
+            table = HolidayAdjuster.build_holiday_table(holidays, ordinals.min(), ordinals.max())
+            holiday_distances = table.nearest_distance[ordinals - table.start_ordinal]
+        return DataTypes.DateParts(
+            ordinals=ordinals,
+            years=years,
+            months=months,
+            days=days,
+            weekdays=(ordinals + 3) % 7,  # 1970-01-01 Perşembe
+            holiday_distances=holiday_distances
+        )
+    
+    @staticmethod
+    def iso_weeks(parts: DataTypes.DateParts) -> np.ndarray:
+        """ISO 8601 hafta numaraları: haftanın Perşembe gününün yılı içindeki hafta sırası."""
+        thursdays = parts.ordinals - parts.weekdays + 3
+        iso_year_starts = thursdays.astype('datetime64[D]').astype('datetime64[Y]').astype('datetime64[D]').astype(np.int64)
+        return (thursdays - iso_year_starts) // 7 + 1
     
-    # Geçmiş alışveriş verilerini oluşturma
-    print("Alışveriş verileri oluşturuluyor...")
-    output_data = DataIO.create_previous_purchases_data(df, product_data)
+    @staticmethod
+    def apply(
+        df: pd.DataFrame,
+        holidays: Optional[List[Tuple[datetime, str, float]]] = None,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Türetilmiş sütunları (varsayılan olarak FEATURES'taki tüm sütunlar) tabloya ekler.
+        
+        Var olan sütunlar (ör. tarihleri taşınmış bir parçada) yerinde
+        güncellenir; yeni sütunlar sona eklenir.
+        
+        Args:
+            df: 'Purchase Date' sütunlu alışveriş tablosu
+            holidays: DaysToHoliday için tatil listesi (verilmezse Constants.YEAR_RANGE tatilleri)
+            columns: Yalnızca bu sütunları üret
+        """
+        features = DerivedFeatures.FEATURES
+        if columns is not None:
+            features = {column: features[column] for column in columns}
+        parts = DerivedFeatures.date_parts(DateTimeUtils.date_ordinals(df['Purchase Date']), holidays)
+        return df.assign(**{column: feature(parts) for column, feature in features.items()})
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Komut satırı argümanlarını ayrıştırır."""
+    parser = argparse.ArgumentParser(description="Geçmiş ve gelecek alışveriş verilerini oluşturur.")
+    parser.add_argument('--input', default=Constants.INPUT_FILE,
+                        help=f"Müşteri giriş dosyası (varsayılan: {Constants.INPUT_FILE})")
+    parser.add_argument('--output', default=Constants.OUTPUT_FILE,
+                        help=f"Çıktı dosyası; uzantı --format'a göre ayarlanır (varsayılan: {Constants.OUTPUT_FILE})")
+    parser.add_argument('--format', choices=list(Constants.OUTPUT_FORMATS), default='csv',
+                        help="Çıktı biçimi: csv, parquet veya feather (varsayılan: csv)")
+    parser.add_argument('--seed', type=int, default=Constants.RANDOM_SEED,
+                        help=f"Tüm rastgele akışların başlangıç değeri (varsayılan: {Constants.RANDOM_SEED})")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Müşteri parçalarını işleyecek süreç sayısı (varsayılan: 1)")
+    parser.add_argument('--chunk-size', type=int, default=Constants.CHUNK_SIZE,
+                        help=f"Bir seferde işlenip dosyaya eklenen müşteri sayısı (varsayılan: {Constants.CHUNK_SIZE})")
+    parser.add_argument('--years', type=int, nargs='+', choices=Constants.YEAR_RANGE,
+                        help="Yalnızca bu yıllara ait alışverişleri yaz (varsayılan: tüm yıllar)")
+    parser.add_argument('--limit-customers', type=int,
+                        help="Giriş dosyasındaki yalnızca ilk N müşteriyi kullan")
+    parser.add_argument('--report', default=Constants.REPORT_FILE,
+                        help=f"Aşama ölçümlerinin yazılacağı JSON dosyası (varsayılan: {Constants.REPORT_FILE})")
+    parser.add_argument('--profile',
+                        help="Ana süreci cProfile ile profille ve istatistikleri bu dosyaya yaz (işçi süreçleri hariç)")
+    parser.add_argument('--progress', action='store_true',
+                        help="Her aşama bittiğinde süre ve satır sayısını yazdır")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Aşamaların tracemalloc bellek farkını ve tepe değerini ölç (yavaşlatır)")
+    parser.add_argument('--in-memory', action='store_true',
+                        help="Tüm veriyi bellekte oluşturup ayarlamaları tek seferde uygula")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Yalnızca giriş satırı değişen müşterileri yeniden üret (manifest gerekir)")
+    args = parser.parse_args(argv)
+    if args.in_memory and args.incremental:
+        parser.error("--incremental yalnızca akış halinde yazımla kullanılabilir")
+    if args.years and args.incremental:
+        parser.error("--years --incremental ile kullanılamaz; artımlı güncelleme tam çıktı gerektirir")
+    for option in ('workers', 'chunk_size', 'limit_customers'):
+        value = getattr(args, option)
+        if value is not None and value < 1:
+            parser.error(f"--{option.replace('_', '-')} en az 1 olmalıdır")
+    if args.seed < 0:
+        parser.error("--seed negatif olmayan bir tam sayı olmalıdır")
+    return args
+
+
+def run(args: argparse.Namespace) -> None:
+    """Ayrıştırılmış argümanlarla veri üretim hattını çalıştırır."""
+    profiler = StageProfiler(trace_memory=args.trace_memory, progress=args.progress)
+    
+    # Tüm rastgelelik args.seed'den türetilen açık üreteçlerle yapılır (bkz. CustomerStreams)
+    print("Program başlatılıyor...")
     
-    # Verileri doğrudan DataFrame'e dönüştür
-    header = output_data[0]
-    rows = output_data[1:]
-    temp_df = pd.DataFrame(rows, columns=header)
+    # Veri yükleme
+    print(f"{args.input} dosyası yükleniyor...")
+    with profiler.stage('load_data') as stage:
+        df = DataIO.load_data(args.input)
+        if args.limit_customers is not None:
+            df = df.head(args.limit_customers)
+        stage['rows_out'] = len(df)
     
-    # Tatil etkisi ve COVID etkisi uygula
-    adjusted_df = HolidayAdjuster.apply_adjustments(temp_df)
+    # Ürün verilerini tanımlama (bir kez oluşturulur, tüm üreticiler paylaşır)
+    print("Ürün verileri tanımlanıyor...")
+    with profiler.stage('define_product_data'):
+        product_data = ProductModel.get_product_data()
     
-    # Son dosyayı kaydet
-    adjusted_df.to_csv(Constants.OUTPUT_FILE, index=False)
-    print(f"Düzeltilmiş veri {Constants.OUTPUT_FILE} dosyasına kaydedildi.")
+    output_file = DataIO.output_path(args.output, args.format)
+    if args.in_memory:
+        # Geçmiş ve gelecek alışveriş verilerini sütun bazlı oluşturma
+        print("Alışveriş verileri oluşturuluyor...")
+        temp_df = DataIO.create_purchases_frame(df, product_data, args.seed, args.workers, profiler)
+        
+        # Tatil etkisi ve COVID etkisi uygula
+        adjusted_df = HolidayAdjuster.apply_adjustments(temp_df, profiler, args.seed)
+        if args.years:
+            adjusted_df = DataIO.keep_years(adjusted_df, args.years)
+        
+        # Son dosyayı kaydet
+        with profiler.stage('write_output', rows_in=len(adjusted_df)) as stage:
+            with OutputWriter(output_file, args.format, OutputWriter.output_categories(df, product_data)) as writer:
+                writer.write(adjusted_df)
+            stage['rows_out'] = len(adjusted_df)
+    elif args.incremental:
+        # Yalnızca değişen müşterileri yeniden üretip mevcut çıktıya ekleme
+        print("Alışveriş verileri artımlı olarak güncelleniyor...")
+        DataIO.update_purchases_incremental(
+            df, product_data, output_file, args.seed, args.workers, args.chunk_size, args.format, profiler
+        )
+    else:
+        # Müşteri parçalarını üretip ayarlayarak dosyaya akış halinde yazma
+        print("Alışveriş verileri oluşturuluyor...")
+        DataIO.write_purchases_streaming(
+            df, product_data, output_file, args.seed, args.workers, args.chunk_size, args.format, profiler,
+            args.years
+        )
+    print(f"Düzeltilmiş veri {output_file} dosyasına kaydedildi.")
     
+    profiler.write_report(args.report)
     print("Program başarıyla tamamlandı!")
 
 
+def main(argv: Optional[List[str]] = None):
+    """Ana program akışı; --profile verilirse çalıştırmayı cProfile ile ölçer."""
+    args = parse_args(argv)
+    if args.profile is None:
+        run(args)
+        return
+    
+    import cProfile
+    import pstats
+    code_profiler = cProfile.Profile()
+    code_profiler.runcall(run, args)
+    code_profiler.dump_stats(args.profile)
+    print(f"\nProfil {args.profile} dosyasına kaydedildi; en pahalı 15 fonksiyon (kümülatif süre):")
+    pstats.Stats(code_profiler).sort_stats('cumulative').print_stats(15)
+
+
 if __name__ == "__main__":
     main()
@@ -3,8 +3,15 @@ Satış Verileri ve Ağırlık Hesaplamaları
 ---------------------------------------
 Bu modül, kullanıcının verdiği satış rakamlarını içerir ve
 bu verilere göre ağırlık hesaplamaları yapar.
+
+YEAR_WEIGHTS, MONTH_WEIGHTS ve SPECIAL_DAY_WEIGHTS modül içe aktarılırken
+değil, ilk erişildiklerinde hesaplanır ve önbelleğe alınır (PEP 562 modül
+__getattr__). `from sales_data import YEAR_WEIGHTS` biçimi değişmeden çalışır.
 """
 
+from functools import lru_cache
+from types import MappingProxyType
+
 # Kullanıcının verdiği satış rakamları
 SALES_DATA = {
     2022: {
@@ -106,21 +113,36 @@ def calculate_special_day_weights():
         'back_to_school': back_to_school_factor
     }
 
-# Ağırlıkları hesapla
-YEAR_WEIGHTS = calculate_year_weights()
-MONTH_WEIGHTS = calculate_month_weights()
-SPECIAL_DAY_WEIGHTS = calculate_special_day_weights()
+# Tembel hesaplanan ağırlıklar: ad -> hesaplama fonksiyonu
+_LAZY_WEIGHTS = {
+    'YEAR_WEIGHTS': calculate_year_weights,
+    'MONTH_WEIGHTS': calculate_month_weights,
+    'SPECIAL_DAY_WEIGHTS': calculate_special_day_weights,
+}
+
+
+@lru_cache(maxsize=None)
+def _lazy_weights(name):
+    """Ağırlık sözlüğünü bir kez hesaplar; önbellekteki değer salt okunurdur."""
+    return MappingProxyType(_LAZY_WEIGHTS[name]())
+
+
+def __getattr__(name):
+    """YEAR_WEIGHTS, MONTH_WEIGHTS ve SPECIAL_DAY_WEIGHTS'e ilk erişimde hesaplama yapar."""
+    if name in _LAZY_WEIGHTS:
+        return _lazy_weights(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Sonuçları yazdır
 if __name__ == "__main__":
     print("Yıl Ağırlıkları:")
-    for year, weight in YEAR_WEIGHTS.items():
+    for year, weight in _lazy_weights('YEAR_WEIGHTS').items():
         print(f"{year}: {weight:.3f}")
     
     print("\nAy Ağırlıkları:")
-    for month, weight in MONTH_WEIGHTS.items():
+    for month, weight in _lazy_weights('MONTH_WEIGHTS').items():
         print(f"{month}: {weight:.3f}")
     
     print("\nÖzel Gün Ağırlıkları:")
-    for day, weight in SPECIAL_DAY_WEIGHTS.items():
+    for day, weight in _lazy_weights('SPECIAL_DAY_WEIGHTS').items():
         print(f"{day}: {weight:.3f}")